@@ -48,3 +48,5 @@
   }
 })();
 
+
+
@@ -0,0 +1,243 @@
+// Docs search: queries the prebuilt index in /docs/search/ in the browser.
+// The index is generated by scripts/build-search-index.py; index.json is
+// fetched on first focus and each terms-<c>.json shard only when a query
+// needs it, so pages that never search download nothing.
+(function() {
+  const SEARCH_URL = '/docs/search/';
+  // Same tokenizing as scripts/docstools/search.py
+  const TOKEN_PATTERN = /[a-z0-9]+(?:[._-][a-z0-9]+)*/g;
+  const STOPWORDS = new Set((
+    'a an and are as at be but by can do for from has have how if in into is it ' +
+    'its of on or so than that the their then there these this to was we were ' +
+    'what when which will with you your').split(' '));
+  const MAX_RESULTS = 8;
+  const MAX_PREFIX_TERMS = 50;
+
+  let indexPromise = null;
+  const shardPromises = {};
+
+  function fetchJSON(url) {
+    return fetch(url).then(response => {
+      if (!response.ok) throw new Error(`${url}: ${response.status}`);
+      return response.json();
+    });
+  }
+
+  function loadIndex() {
+    if (!indexPromise) {
+      indexPromise = fetchJSON(SEARCH_URL + 'index.json');
+      indexPromise.catch(() => { indexPromise = null; });
+    }
+    return indexPromise;
+  }
+
+  function loadShard(index, key) {
+    const version = index.shards[key];
+    if (!version) return Promise.resolve(null);
+    if (!shardPromises[key]) {
+      shardPromises[key] = fetchJSON(`${SEARCH_URL}terms-${key}.json?v=${version}`);
+      shardPromises[key].catch(() => { delete shardPromises[key]; });
+    }
+    return shardPromises[key];
+  }
+
+  function tokenize(query) {
+    return (query.toLowerCase().match(TOKEN_PATTERN) || [])
+      .filter(token => token.length > 1 && !STOPWORDS.has(token));
+  }
+
+  function slugify(text) {
+    return text.toLowerCase().replace(/[^a-z0-9]+/g, '-').replace(/^-+|-+$/g, '');
+  }
+
+  // First index in the sorted term list that is >= term
+  function lowerBound(terms, term) {
+    let lo = 0, hi = terms.length;
+    while (lo < hi) {
+      const mid = (lo + hi) >> 1;
+      if (terms[mid] < term) lo = mid + 1; else hi = mid;
+    }
+    return lo;
+  }
+
+  // Postings are [delta section id, weight, ...]; add them into scores
+  function addPostings(scores, postings) {
+    let section = 0;
+    for (let i = 0; i < postings.length; i += 2) {
+      section += postings[i];
+      scores.set(section, (scores.get(section) || 0) + postings[i + 1]);
+    }
+  }
+
+  // {section id: score} for one query token; the last token also matches as a prefix
+  function lookup(shard, token, prefix) {
+    const scores = new Map();
+    if (!shard) return scores;
+    let i = lowerBound(shard.terms, token);
+    if (!prefix) {
+      if (shard.terms[i] === token) addPostings(scores, shard.postings[i]);
+      return scores;
+    }
+    for (let n = 0; i < shard.terms.length && n < MAX_PREFIX_TERMS; i++, n++) {
+      if (!shard.terms[i].startsWith(token)) break;
+      addPostings(scores, shard.postings[i]);
+    }
+    return scores;
+  }
+
+  function search(query) {
+    const tokens = tokenize(query);
+    if (!tokens.length) return Promise.resolve([]);
+    const prefixLast = !/\s$/.test(query);
+    return loadIndex().then(index =>
+      Promise.all(tokens.map(token => loadShard(index, token[0]))).then(shards => {
+        // Every token must match; a section's score is the sum over tokens
+        let scores = null;
+        tokens.forEach((token, i) => {
+          const matches = lookup(shards[i], token, prefixLast && i === tokens.length - 1);
+          if (scores === null) {
+            scores = matches;
+            return;
+          }
+          const merged = new Map();
+          matches.forEach((score, section) => {
+            if (scores.has(section)) merged.set(section, scores.get(section) + score);
+          });
+          scores = merged;
+        });
+        return Array.from(scores.entries())
+          .sort((a, b) => b[1] - a[1] || a[0] - b[0])
+          .slice(0, MAX_RESULTS)
+          .map(([section]) => {
+            const [page, heading, anchor, snippet] = index.sections[section];
+            const [href, title, group] = index.pages[page];
+            return {
+              href: anchor ? `${href}#${anchor}` : href,
+              title: heading && heading !== title ? `${title} › ${heading}` : title,
+              group: group,
+              snippet: snippet
+            };
+          });
+      }));
+  }
+
+  function renderResults(list, results, query) {
+    list.innerHTML = '';
+    if (!results.length) {
+      const empty = document.createElement('li');
+      empty.className = 'docs-search-empty';
+      empty.textContent = `No results for “${query.trim()}”`;
+      list.appendChild(empty);
+    }
+    results.forEach(result => {
+      const item = document.createElement('li');
+      const link = document.createElement('a');
+      link.href = result.href;
+      const title = document.createElement('span');
+      title.className = 'docs-search-title';
+      title.textContent = result.title;
+      const meta = document.createElement('span');
+      meta.className = 'docs-search-snippet';
+      meta.textContent = result.snippet || result.group;
+      link.appendChild(title);
+      link.appendChild(meta);
+      item.appendChild(link);
+      list.appendChild(item);
+    });
+    list.hidden = false;
+  }
+
+  function initSearch() {
+    const sidebar = document.getElementById('sidebar');
+    if (!sidebar || document.getElementById('docs-search-input')) return;
+
+    const container = document.createElement('div');
+    container.className = 'docs-search';
+    container.innerHTML =
+      '<input type="search" id="docs-search-input" placeholder="Search docs (/)" ' +
+      'aria-label="Search documentation" autocomplete="off" spellcheck="false">' +
+      '<ul class="docs-search-results" role="listbox" hidden></ul>';
+    const firstSection = sidebar.querySelector('.sidebar-section');
+    sidebar.insertBefore(container, firstSection);
+
+    const input = container.querySelector('input');
+    const list = container.querySelector('ul');
+    let latest = 0;
+    let active = -1;
+
+    function setActive(i) {
+      const links = list.querySelectorAll('a');
+      if (!links.length) return;
+      active = (i + links.length) % links.length;
+      links.forEach((link, n) => link.classList.toggle('active', n === active));
+      links[active].scrollIntoView({ block: 'nearest' });
+    }
+
+    input.addEventListener('focus', () => { loadIndex().catch(() => {}); });
+    input.addEventListener('input', () => {
+      const query = input.value;
+      const request = ++latest;
+      active = -1;
+      if (!query.trim()) {
+        list.hidden = true;
+        return;
+      }
+      search(query).then(results => {
+        // Drop answers to queries the user has already typed past
+        if (request === latest) renderResults(list, results, query);
+      }).catch(() => {
+        if (request === latest) list.hidden = true;
+      });
+    });
+    input.addEventListener('keydown', (e) => {
+      if (e.key === 'ArrowDown' || e.key === 'ArrowUp') {
+        e.preventDefault();
+        setActive(active + (e.key === 'ArrowDown' ? 1 : -1));
+      } else if (e.key === 'Enter') {
+        const link = list.querySelectorAll('a')[Math.max(active, 0)];
+        if (link && !list.hidden) window.location.href = link.href;
+      } else if (e.key === 'Escape') {
+        input.value = '';
+        list.hidden = true;
+        input.blur();
+      }
+    });
+    document.addEventListener('keydown', (e) => {
+      const target = e.target;
+      const editing = target.isContentEditable || /^(INPUT|TEXTAREA|SELECT)$/.test(target.tagName);
+      if (e.key === '/' && !editing) {
+        e.preventDefault();
+        input.focus();
+      }
+    });
+    document.addEventListener('click', (e) => {
+      if (!container.contains(e.target)) list.hidden = true;
+    });
+  }
+
+  // Result anchors are heading slugs; give the target heading its id and scroll to it
+  function resolveAnchor() {
+    const id = decodeURIComponent(window.location.hash.slice(1));
+    if (!id || document.getElementById(id)) return;
+    const headings = document.querySelectorAll('.docs-content h1, .docs-content h2, .docs-content h3');
+    for (const heading of headings) {
+      if (!heading.id && slugify(heading.textContent) === id) {
+        heading.id = id;
+        heading.scrollIntoView();
+        return;
+      }
+    }
+  }
+
+  function init() {
+    initSearch();
+    resolveAnchor();
+  }
+
+  if (document.readyState === 'loading') {
+    document.addEventListener('DOMContentLoaded', init);
+  } else {
+    init();
+  }
+  window.addEventListener('hashchange', resolveAnchor);
+})();
@@ -3,11 +3,32 @@
 Generate a new OpenGraph image for KubeGraf.
 Size: 1200x630 (standard OG image size)
 Design: Dark background with logo and minimal text
+
+The SVG logo is rasterized in process (see ogtools/raster.py); cairosvg and
+ImageMagick are only used as fallbacks for SVG features it does not cover.
+
+With --pages, renders a distinct card per docs page listed in sitemap.xml
+into client/public/og/ (see ogtools/cards.py). Cards whose inputs are
+unchanged since the last run are skipped. Blog and app routes keep the
+site-wide image, since their head is not rendered per route.
+
+Examples:
+    python3 script/generate-og-image.py
+    python3 script/generate-og-image.py --pages --jobs 8
+    python3 script/generate-og-image.py --pages --force
 """
 
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
+import argparse
 import os
-import subprocess
+import sys
+from pathlib import Path
+
+from ogtools import RasterizeError, rasterize
+from ogtools.cards import OUTPUT_DIR, SITEMAP, discover_cards, generate_cards
+from ogtools.fonts import font_path, get_font, text_bbox
+
+LOGO_BOX = (180, 180)
 
 def create_opengraph_image(logo_svg_path):
     # Dimensions
@@ -18,64 +39,28 @@ def create_opengraph_image(logo_svg_path):
     img = Image.new('RGB', (width, height), color=(10, 22, 40))  # #0a1628
     draw = ImageDraw.Draw(img)
 
-    # Convert SVG logo to PNG temporarily
-    logo_img = None
-    logo_png_path = logo_svg_path.replace('.svg', '_temp_og.png')
-    try:
-        # Try to convert SVG to PNG with ImageMagick/magick
-        try:
-            subprocess.run(['magick', 'convert', '-background', 'none', '-resize', '180x180',
-                           logo_svg_path, logo_png_path], check=True, capture_output=True)
-        except:
-            subprocess.run(['convert', '-background', 'none', '-resize', '180x180',
-                           logo_svg_path, logo_png_path], check=True, capture_output=True)
-        logo_img = Image.open(logo_png_path).convert('RGBA')
-        print('✓ Logo converted successfully')
-    except Exception as e:
-        print(f'⚠ Could not convert SVG logo: {e}')
-
-    # If we have logo, paste it centered above text
+    # Rasterize the SVG logo in memory (ImageMagick is only a fallback)
+    logo_img, backend = rasterize(logo_svg_path, LOGO_BOX)
+    print(f'✓ Logo rasterized ({backend}, {logo_img.width}x{logo_img.height})')
+
+    # Paste the logo centered above the text
     logo_y_position = 140
-    if logo_img:
-        logo_x = (width - logo_img.width) // 2
-        logo_y = logo_y_position
-        # Composite the logo
-        img.paste(logo_img, (logo_x, logo_y), logo_img)
-        print(f'✓ Logo placed at ({logo_x}, {logo_y})')
-
-        # Clean up temp file
-        if os.path.exists(logo_png_path):
-            os.remove(logo_png_path)
-
-    # Load font - try multiple options
+    logo_x = (width - logo_img.width) // 2
+    logo_y = logo_y_position
+    # Composite the logo
+    img.paste(logo_img, (logo_x, logo_y), logo_img)
+    print(f'✓ Logo placed at ({logo_x}, {logo_y})')
+
+    # Fonts are resolved once per process by the shared registry
     title_size = 76
     tagline_size = 38
 
-    title_font = None
-    tagline_font = None
-
-    font_paths = [
-        '/System/Library/Fonts/Helvetica.ttc',
-        '/System/Library/Fonts/Supplemental/Arial.ttf',
-        '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf',
-        '/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf',
-    ]
-
-    for font_path in font_paths:
-        if os.path.exists(font_path):
-            try:
-                title_font = ImageFont.truetype(font_path, title_size)
-                tagline_font = ImageFont.truetype(font_path, tagline_size)
-                print(f'✓ Using font: {font_path}')
-                break
-            except Exception as e:
-                continue
-
-    if not title_font:
+    if font_path():
+        print(f'✓ Using font: {font_path()}')
+    else:
         print('⚠ Could not load system fonts, using basic rendering')
-        # PIL's default font is too small, so we'll draw bigger
-        title_font = ImageFont.load_default()
-        tagline_font = ImageFont.load_default()
+    title_font = get_font(title_size)
+    tagline_font = get_font(tagline_size)
 
     # Text content
     title = "KubeGraf"  # Using regular e for compatibility
@@ -85,16 +70,11 @@ def create_opengraph_image(logo_svg_path):
     title_y = 360
     tagline_y = 450
 
-    # For better centering, use textbbox if available
-    try:
-        title_bbox = draw.textbbox((0, 0), title, font=title_font)
-        title_width = title_bbox[2] - title_bbox[0]
-        tagline_bbox = draw.textbbox((0, 0), tagline, font=tagline_font)
-        tagline_width = tagline_bbox[2] - tagline_bbox[0]
-    except:
-        # Fallback for older PIL
-        title_width = draw.textlength(title, font=title_font)
-        tagline_width = draw.textlength(tagline, font=tagline_font)
+    # Center on the ink bounding box (measurements are memoized)
+    title_bbox = text_bbox(title, title_size)
+    title_width = title_bbox[2] - title_bbox[0]
+    tagline_bbox = text_bbox(tagline, tagline_size)
+    tagline_width = tagline_bbox[2] - tagline_bbox[0]
 
     title_x = (width - title_width) // 2
     tagline_x = (width - tagline_width) // 2
@@ -123,11 +103,7 @@ def create_opengraph_image(logo_svg_path):
 
     return img
 
-if __name__ == '__main__':
-    # Get project root
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root = os.path.dirname(script_dir)
-
+def generate_site_image(project_root):
     # Logo path
     logo_svg_path = os.path.join(project_root, 'client', 'public', 'kubegraf.svg')
 
@@ -135,7 +111,11 @@ if __name__ == '__main__':
     print(f'Logo: {logo_svg_path}')
 
     # Generate image
-    img = create_opengraph_image(logo_svg_path)
+    try:
+        img = create_opengraph_image(logo_svg_path)
+    except RasterizeError as e:
+        print(f'✗ {e}')
+        return 1
 
     # Save to multiple locations
     output_paths = [
@@ -148,3 +128,59 @@ if __name__ == '__main__':
         print(f'✓ Saved: {path}')
 
     print(f'\n✅ New OpenGraph image generated (1200x630)')
+    return 0
+
+
+def generate_page_cards(args):
+    cards, unmatched = discover_cards(args.sitemap)
+    print(f'Generating {len(cards)} per-page OpenGraph cards into {args.out}/')
+    try:
+        results = generate_cards(cards, args.out, jobs=args.jobs or os.cpu_count() or 1, force=args.force)
+    except RasterizeError as e:
+        print(f'✗ {e}')
+        return 1
+
+    counts = {'rendered': 0, 'skipped': 0, 'error': 0}
+    for card, status, error in results:
+        counts[status] += 1
+        if status == 'rendered':
+            print(f'✓ Rendered: {card.output} ({card.title})')
+        elif status == 'error':
+            print(f'✗ Error rendering {card.output}: {error}')
+    for url in unmatched:
+        print(f'⏭️  No card for {url} (keeps the site-wide image)')
+
+    print(f"\n{'='*60}")
+    print(f"Cards rendered: {counts['rendered']}")
+    print(f"Cards skipped (unchanged inputs): {counts['skipped']}")
+    if counts['error']:
+        print(f"Errors: {counts['error']}")
+    print(f"{'='*60}")
+    return 1 if counts['error'] else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate the KubeGraf OpenGraph image(s).')
+    parser.add_argument('--pages', action='store_true',
+                        help='render a card per docs page in sitemap.xml instead of the site-wide image')
+    parser.add_argument('--sitemap', type=Path, default=SITEMAP, help='sitemap listing the pages (default: sitemap.xml)')
+    parser.add_argument('--out', type=Path, default=OUTPUT_DIR, help='output directory for --pages (default: client/public/og)')
+    parser.add_argument('-j', '--jobs', type=int, default=None, metavar='N',
+                        help='worker processes for --pages (default: CPU count, 1 = serial)')
+    parser.add_argument('--force', action='store_true', help='re-render every card, ignoring the input hashes')
+    args = parser.parse_args()
+
+    if args.jobs is not None and args.jobs < 1:
+        parser.error('--jobs must be at least 1')
+
+    if args.pages:
+        return generate_page_cards(args)
+
+    # Get project root
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    project_root = os.path.dirname(script_dir)
+    return generate_site_image(project_root)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,11 @@
+"""
+Shared tooling for the OpenGraph image generator (script/generate-og-image.py).
+"""
+
+from .raster import RasterizeError, UnsupportedSVG, rasterize
+
+__all__ = [
+    'RasterizeError',
+    'UnsupportedSVG',
+    'rasterize',
+]
@@ -0,0 +1,263 @@
+"""
+Per-page OpenGraph cards for every docs page in sitemap.xml.
+
+Titles come from each page's <title> (falling back to its <h1>), and the
+docs 'og-image' transform points the page's og:image at its card. Blog and
+app routes keep the site-wide image: they are rendered client-side, and
+share crawlers only read the static client/index.html head. The logo
+raster is rendered once per process, and fonts and text measurements come
+from the shared registry in fonts.py.
+Cards are rendered across a process pool, and a card is skipped when the
+hash of its inputs (title, section, logo, font, layout version) matches
+the manifest in .docs-cache/.
+"""
+
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from html import unescape
+from pathlib import Path
+
+from PIL import Image, ImageDraw
+
+from .fonts import font_path, get_font, text_length, wrap
+from .raster import rasterize
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+SITEMAP = PROJECT_ROOT / 'sitemap.xml'
+DOCS_DIR = PROJECT_ROOT / 'docs'
+LOGO_SVG = PROJECT_ROOT / 'client' / 'public' / 'kubegraf.svg'
+OUTPUT_DIR = PROJECT_ROOT / 'client' / 'public' / 'og'
+MANIFEST_PATH = PROJECT_ROOT / '.docs-cache' / 'og-cards.json'
+
+BASE_URL = 'https://kubegraf.io'
+# Bump whenever the card layout changes so every card is re-rendered
+LAYOUT_VERSION = 1
+
+WIDTH, HEIGHT = 1200, 630
+MARGIN = 80
+BACKGROUND = (10, 22, 40)     # #0a1628
+ACCENT = (6, 182, 212)        # #06b6d4
+TEXT = (255, 255, 255)
+MUTED = (148, 163, 184)
+SHADOW = (0, 0, 0)
+LOGO_BOX = (96, 96)
+LABEL_SIZE = 34
+FOOTER_SIZE = 28
+TITLE_SIZES = (68, 60, 52, 46)
+TITLE_MAX_LINES = 3
+TAGLINE = 'Local-first Kubernetes incident intelligence'
+JPEG_OPTIONS = {'quality': 95, 'optimize': True}
+
+LOC_PATTERN = re.compile(r'<loc>\s*([^<]+?)\s*</loc>')
+TITLE_PATTERN = re.compile(r'<title>(.*?)</title>', re.DOTALL | re.IGNORECASE)
+H1_PATTERN = re.compile(r'<h1\b[^>]*>(.*?)</h1>', re.DOTALL | re.IGNORECASE)
+TAG_PATTERN = re.compile(r'<[^>]+>')
+
+
+@dataclass(frozen=True)
+class Card:
+    """One page's card: where it is published and what it says."""
+    url: str
+    output: str   # path relative to the output directory
+    section: str
+    title: str
+
+
+def _text(html):
+    return ' '.join(unescape(TAG_PATTERN.sub('', html)).split())
+
+
+def page_title(html):
+    """Title for a docs page: its <title> without the site suffix, else its <h1>."""
+    match = TITLE_PATTERN.search(html)
+    if match:
+        parts = [part for part in re.split(r'\s+[-–|]\s+', _text(match.group(1)))
+                 if 'KubeGraf' not in part]
+        if parts:
+            return ' - '.join(parts)
+    match = H1_PATTERN.search(html)
+    return _text(match.group(1)) if match else None
+
+
+def discover_cards(sitemap=SITEMAP, docs_dir=DOCS_DIR):
+    """Cards for the docs URLs in the sitemap; returns (cards, URLs that keep the site-wide image)."""
+    cards, unmatched = [], []
+    for url in LOC_PATTERN.findall(Path(sitemap).read_text(encoding='utf-8')):
+        route = url[len(BASE_URL):] if url.startswith(BASE_URL) else url
+        card = None
+        if route.startswith('/docs/'):
+            rel = route[len('/docs/'):] or 'index.html'
+            if rel.endswith('/'):
+                rel += 'index.html'
+            page = Path(docs_dir) / rel
+            title = page_title(page.read_text(encoding='utf-8')) if page.is_file() else None
+            if title:
+                card = Card(url, f"docs/{Path(rel).with_suffix('.jpg').as_posix()}", 'Documentation', title)
+        if card:
+            cards.append(card)
+        else:
+            unmatched.append(url)
+    return cards, unmatched
+
+
+def font_identity():
+    """Path of the font in use, or 'default' for Pillow's built-in font."""
+    return font_path() or 'default'
+
+
+@lru_cache(maxsize=None)
+def load_logo(path=LOGO_SVG, box=LOGO_BOX):
+    """Logo raster, rendered once per process and reused for every card."""
+    return rasterize(path, box)[0]
+
+
+def fit_title(title, max_width):
+    """Largest title size that fits in TITLE_MAX_LINES; returns (size, lines)."""
+    for size in TITLE_SIZES:
+        lines = wrap(title, size, max_width)
+        if len(lines) <= TITLE_MAX_LINES:
+            return size, lines
+    # Still too long at the smallest size: truncate the last line
+    lines = lines[:TITLE_MAX_LINES]
+    last = lines[-1]
+    while last and text_length(last + '…', size) > max_width:
+        last = last.rsplit(' ', 1)[0] if ' ' in last else last[:-1]
+    lines[-1] = last + '…'
+    return size, lines
+
+
+def render_card(card, logo_path=LOGO_SVG):
+    """Render one 1200x630 card."""
+    img = Image.new('RGB', (WIDTH, HEIGHT), color=BACKGROUND)
+    draw = ImageDraw.Draw(img)
+
+    logo = load_logo(logo_path)
+    img.paste(logo, (MARGIN, MARGIN), logo)
+    draw.text((MARGIN + logo.width + 24, MARGIN + logo.height // 2), f"KubeGraf {card.section}",
+              fill=ACCENT, font=get_font(LABEL_SIZE), anchor='lm')
+
+    # Title block, vertically centred between the header and the footer
+    size, lines = fit_title(card.title, WIDTH - 2 * MARGIN)
+    font = get_font(size)
+    line_height = round(size * 1.2)
+    top = MARGIN + LOGO_BOX[1]
+    y = top + (HEIGHT - MARGIN - 60 - top - line_height * len(lines)) // 2
+    for line in lines:
+        draw.text((MARGIN + 3, y + 3), line, fill=SHADOW, font=font)
+        draw.text((MARGIN, y), line, fill=TEXT, font=font)
+        y += line_height
+
+    footer_y = HEIGHT - MARGIN
+    draw.line([(MARGIN, footer_y - 36), (MARGIN + 120, footer_y - 36)], fill=ACCENT, width=4)
+    footer_font = get_font(FOOTER_SIZE)
+    draw.text((MARGIN, footer_y), 'kubegraf.io', fill=MUTED, font=footer_font, anchor='ls')
+    draw.text((WIDTH - MARGIN, footer_y), TAGLINE, fill=MUTED, font=footer_font, anchor='rs')
+    return img
+
+
+def save_jpeg(img, path):
+    """Save via a temp file and rename so a half-written card is never published."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        img.save(tmp, 'JPEG', **JPEG_OPTIONS)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+def shared_inputs_hash(logo_path=LOGO_SVG):
+    """Hash of everything every card depends on besides its own text."""
+    digest = hashlib.sha256(f"layout={LAYOUT_VERSION}".encode())
+    digest.update(Path(logo_path).read_bytes())
+    font = font_identity()
+    digest.update(font.encode())
+    if font != 'default':
+        digest.update(Path(font).read_bytes())
+    return digest.hexdigest()
+
+
+def card_hash(card, shared):
+    return hashlib.sha256(f"{shared}\0{card.section}\0{card.title}".encode()).hexdigest()
+
+
+def manifest_key(path):
+    """Key cards by project-relative output path so the manifest is portable."""
+    path = Path(path).resolve()
+    try:
+        return path.relative_to(PROJECT_ROOT).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+def load_manifest(path=MANIFEST_PATH):
+    try:
+        return json.loads(Path(path).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix('.tmp')
+    tmp.write_text(json.dumps(manifest, indent=1, sort_keys=True), encoding='utf-8')
+    tmp.replace(path)
+
+
+def _warm_caches(logo_path):
+    # Runs once per worker so every card reuses the same logo raster and fonts
+    load_logo(logo_path)
+    for size in (LABEL_SIZE, FOOTER_SIZE) + TITLE_SIZES:
+        get_font(size)
+
+
+def _render_job(job):
+    card, path, logo_path = job
+    try:
+        save_jpeg(render_card(card, logo_path), path)
+        return None
+    except Exception as e:
+        return f"{type(e).__name__}: {e}"
+
+
+def generate_cards(cards, output_dir=OUTPUT_DIR, jobs=1, force=False,
+                   logo_path=LOGO_SVG, manifest_path=MANIFEST_PATH):
+    """Render every stale card; returns [(card, 'rendered' | 'skipped' | 'error', error)]."""
+    output_dir = Path(output_dir)
+    _warm_caches(logo_path)
+    shared = shared_inputs_hash(logo_path)
+    manifest = {} if force else load_manifest(manifest_path)
+
+    pending, outcomes = [], {}
+    for card in cards:
+        path = output_dir / card.output
+        key = manifest_key(path)
+        if manifest.get(key) == card_hash(card, shared) and path.exists():
+            outcomes[card] = ('skipped', None)
+        else:
+            pending.append((card, path, logo_path))
+
+    if jobs > 1 and len(pending) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(pending)),
+                                 initializer=_warm_caches, initargs=(logo_path,)) as pool:
+            errors = list(pool.map(_render_job, pending, chunksize=max(1, len(pending) // (jobs * 4))))
+    else:
+        errors = [_render_job(job) for job in pending]
+
+    for (card, path, _), error in zip(pending, errors):
+        key = manifest_key(path)
+        if error:
+            outcomes[card] = ('error', error)
+            manifest.pop(key, None)
+        else:
+            outcomes[card] = ('rendered', None)
+            manifest[key] = card_hash(card, shared)
+    save_manifest(manifest, manifest_path)
+    return [(card,) + outcomes[card] for card in cards]
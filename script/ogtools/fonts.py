@@ -0,0 +1,80 @@
+"""
+Font registry and memoized text measurement for the OG renderers.
+
+The font file is resolved once per process, each size is loaded once, and
+text widths are memoized by (text, font path, size), so rendering a batch
+of cards pays for font discovery and layout measurement once rather than
+per image.
+"""
+
+import os
+from functools import lru_cache
+
+from PIL import ImageFont
+
+FONT_PATHS = [
+    '/System/Library/Fonts/Helvetica.ttc',
+    '/System/Library/Fonts/Supplemental/Arial.ttf',
+    '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf',
+    '/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf',
+]
+
+
+@lru_cache(maxsize=None)
+def font_path():
+    """First usable font in FONT_PATHS, or None to use Pillow's built-in font."""
+    for path in FONT_PATHS:
+        if os.path.exists(path):
+            try:
+                ImageFont.truetype(path, 12)
+            except OSError:
+                continue
+            return path
+    return None
+
+
+@lru_cache(maxsize=None)
+def get_font(size):
+    """The registry font at size, loaded once per process."""
+    path = font_path()
+    return ImageFont.truetype(path, size) if path else ImageFont.load_default(size)
+
+
+@lru_cache(maxsize=65536)
+def _text_length(text, path, size):
+    return get_font(size).getlength(text)
+
+
+def text_length(text, size):
+    """Advance width of text at size, memoized."""
+    return _text_length(text, font_path(), size)
+
+
+@lru_cache(maxsize=4096)
+def _text_bbox(text, path, size):
+    return get_font(size).getbbox(text)
+
+
+def text_bbox(text, size):
+    """Ink bounding box (left, top, right, bottom) of text at size, memoized."""
+    return _text_bbox(text, font_path(), size)
+
+
+def wrap(text, size, max_width):
+    """Greedy word wrap of text to lines no wider than max_width.
+
+    Lines are measured as word widths plus space widths, so every word is
+    measured once and shared across candidate lines, sizes and cards.
+    """
+    space = text_length(' ', size)
+    lines, line, width = [], [], 0.0
+    for word in text.split():
+        word_width = text_length(word, size)
+        if line and width + space + word_width > max_width:
+            lines.append(' '.join(line))
+            line, width = [], 0.0
+        width += (space if line else 0.0) + word_width
+        line.append(word)
+    if line:
+        lines.append(' '.join(line))
+    return lines
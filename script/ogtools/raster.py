@@ -0,0 +1,757 @@
+"""
+Rasterize SVG logos to RGBA Pillow images in memory.
+
+The brand logos in client/public/ are exported as SVG wrappers around
+embedded PNGs (data: URIs), composited through transforms, clip paths,
+luminance masks and feColorMatrix filters; the traced and hand-drawn ones
+are plain vector shapes. Both are rendered here with Pillow alone, so no
+helper process or temp file is needed:
+
+- <image> with an embedded base64 raster
+- <path> (every command, arcs included), <rect> (rounded too), <circle>,
+  <ellipse>, <line>, <polyline> and <polygon>, filled with solid colours
+  by the nonzero or evenodd rule and stroked, optionally dashed
+- <text> in the font registry's face (see fonts.py), unrotated
+- fill and stroke inherited from groups, as attributes or style
+
+Shapes are drawn at SUPERSAMPLE times the resolution and scaled down, so
+edges are antialiased. Anything outside the subset (gradients, patterns,
+other filters) falls back to cairosvg when installed, then to ImageMagick
+writing PNG to stdout.
+"""
+
+import base64
+import io
+import math
+import re
+import shutil
+import subprocess
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+from PIL import Image, ImageChops, ImageColor, ImageDraw
+
+from .fonts import get_font
+
+SVG_NS = '{http://www.w3.org/2000/svg}'
+XLINK_HREF = '{http://www.w3.org/1999/xlink}href'
+
+IDENTITY = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+TRANSFORM_PATTERN = re.compile(r'(matrix|translate|scale)\s*\(([^)]*)\)')
+NUMBER_PATTERN = re.compile(r'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+URL_PATTERN = re.compile(r'url\(\s*#([^)\s]+)\s*\)')
+
+IGNORED_TAGS = {'defs', 'metadata', 'title', 'desc'}
+SHAPE_TAGS = {'path', 'rect', 'circle', 'ellipse', 'line', 'polyline', 'polygon'}
+# Presentation properties that children inherit from their ancestors
+INHERITED = ('fill', 'fill-opacity', 'fill-rule', 'stroke', 'stroke-width', 'stroke-opacity',
+             'stroke-dasharray', 'font-size', 'text-anchor')
+TEXT_ANCHORS = {'start': 'ls', 'middle': 'ms', 'end': 'rs'}
+LUMINANCE = (0.2126, 0.7152, 0.0722)
+SUPERSAMPLE = 4
+PATH_TOKEN = re.compile(r'[MmLlHhVvCcSsQqTtAaZz]|[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+PATH_ARITY = {'M': 2, 'L': 2, 'H': 1, 'V': 1, 'C': 6, 'S': 4, 'Q': 4, 'T': 2, 'A': 7, 'Z': 0}
+
+
+class UnsupportedSVG(ValueError):
+    """The SVG uses features outside what the built-in renderer handles."""
+
+
+class RasterizeError(RuntimeError):
+    """No rasterizer backend could render the SVG."""
+
+
+def _numbers(text):
+    return [float(n) for n in NUMBER_PATTERN.findall(text or '')]
+
+
+def _length(value, default=None):
+    if value is None:
+        return default
+    value = value.strip()
+    if value.endswith('%'):
+        raise UnsupportedSVG(f"percentage length: {value}")
+    numbers = _numbers(value)
+    if len(numbers) != 1:
+        raise UnsupportedSVG(f"unsupported length: {value}")
+    return numbers[0]
+
+
+def multiply(m, n):
+    """Compose affine matrices (a, b, c, d, e, f): apply n first, then m."""
+    a, b, c, d, e, f = m
+    a2, b2, c2, d2, e2, f2 = n
+    return (
+        a * a2 + c * b2, b * a2 + d * b2,
+        a * c2 + c * d2, b * c2 + d * d2,
+        a * e2 + c * f2 + e, b * e2 + d * f2 + f,
+    )
+
+
+def apply(m, x, y):
+    a, b, c, d, e, f = m
+    return a * x + c * y + e, b * x + d * y + f
+
+
+def parse_transform(text):
+    """Parse a transform attribute into one matrix."""
+    m = IDENTITY
+    for kind, args in TRANSFORM_PATTERN.findall(text or ''):
+        values = _numbers(args)
+        if kind == 'matrix' and len(values) == 6:
+            step = tuple(values)
+        elif kind == 'translate' and len(values) in (1, 2):
+            step = (1.0, 0.0, 0.0, 1.0, values[0], values[1] if len(values) == 2 else 0.0)
+        elif kind == 'scale' and len(values) in (1, 2):
+            step = (values[0], 0.0, 0.0, values[-1], 0.0, 0.0)
+        else:
+            raise UnsupportedSVG(f"unsupported transform: {kind}({args})")
+        m = multiply(m, step)
+    leftover = TRANSFORM_PATTERN.sub('', text or '').replace(',', '').strip()
+    if leftover:
+        raise UnsupportedSVG(f"unsupported transform: {text}")
+    return m
+
+
+def _path_tokens(d):
+    tokens = PATH_TOKEN.findall(d or '')
+    if ''.join(tokens) != re.sub(r'[\s,]+', '', d or ''):
+        raise UnsupportedSVG(f"malformed path data: {d[:40]}")
+    return tokens
+
+
+def _arc_to_cubics(x1, y1, rx, ry, angle, large, sweep, x2, y2):
+    """Cubic Bézier control points approximating an SVG elliptical arc (spec F.6.5)."""
+    if (x1, y1) == (x2, y2):
+        return []
+    rx, ry = abs(rx), abs(ry)
+    if not rx or not ry:
+        return [(_third((x1, y1), (x2, y2), 1), _third((x1, y1), (x2, y2), 2), (x2, y2))]
+    phi = math.radians(angle)
+    cos_phi, sin_phi = math.cos(phi), math.sin(phi)
+    dx, dy = (x1 - x2) / 2, (y1 - y2) / 2
+    x1p, y1p = cos_phi * dx + sin_phi * dy, -sin_phi * dx + cos_phi * dy
+    scale = (x1p / rx) ** 2 + (y1p / ry) ** 2
+    if scale > 1:
+        rx, ry = rx * math.sqrt(scale), ry * math.sqrt(scale)
+    numerator = rx * rx * ry * ry - rx * rx * y1p * y1p - ry * ry * x1p * x1p
+    factor = math.sqrt(max(0.0, numerator / (rx * rx * y1p * y1p + ry * ry * x1p * x1p)))
+    if large == sweep:
+        factor = -factor
+    cxp, cyp = factor * rx * y1p / ry, -factor * ry * x1p / rx
+    cx = cos_phi * cxp - sin_phi * cyp + (x1 + x2) / 2
+    cy = sin_phi * cxp + cos_phi * cyp + (y1 + y2) / 2
+    start = math.atan2((y1p - cyp) / ry, (x1p - cxp) / rx)
+    delta = math.atan2((-y1p - cyp) / ry, (-x1p - cxp) / rx) - start
+    if sweep and delta < 0:
+        delta += 2 * math.pi
+    elif not sweep and delta > 0:
+        delta -= 2 * math.pi
+
+    def point(t):
+        x, y = rx * math.cos(t), ry * math.sin(t)
+        return cos_phi * x - sin_phi * y + cx, sin_phi * x + cos_phi * y + cy
+
+    def tangent(t):
+        x, y = -rx * math.sin(t), ry * math.cos(t)
+        return cos_phi * x - sin_phi * y, sin_phi * x + cos_phi * y
+
+    segments = max(1, math.ceil(abs(delta) / (math.pi / 2)))
+    step = delta / segments
+    k = 4 / 3 * math.tan(step / 4)
+    cubics = []
+    for i in range(segments):
+        t1, t2 = start + i * step, start + (i + 1) * step
+        (px1, py1), (px2, py2) = point(t1), point(t2)
+        (tx1, ty1), (tx2, ty2) = tangent(t1), tangent(t2)
+        cubics.append(((px1 + k * tx1, py1 + k * ty1), (px2 - k * tx2, py2 - k * ty2), (px2, py2)))
+    cubics[-1] = cubics[-1][:2] + ((x2, y2),)
+    return cubics
+
+
+def parse_path(d):
+    """Subpaths of path data as (start point, [(c1, c2, end), ...], closed), in user space.
+
+    Lines and quadratics are raised to cubics and arcs are split into
+    cubics, so every segment has the same shape.
+    """
+    tokens = _path_tokens(d)
+    subpaths = []
+    segments = None
+    x = y = start_x = start_y = 0.0
+    last_control = None  # reflected by S/s (cubic) and T/t (quadratic)
+    i, command = 0, None
+
+    def line(x2, y2):
+        return ((x + (x2 - x) / 3, y + (y2 - y) / 3), (x + 2 * (x2 - x) / 3, y + 2 * (y2 - y) / 3), (x2, y2))
+
+    def take(count, flags=()):
+        nonlocal i
+        values = []
+        for index in range(count):
+            if i >= len(tokens) or tokens[i].isalpha():
+                raise UnsupportedSVG(f"path command {command} is missing arguments")
+            token = tokens[i]
+            if index in flags and len(token) > 1 and token[0] in '01':
+                # Arc flags may be written without separators ("a1 1 0 011 1")
+                tokens[i:i + 1] = [token[0], token[1:]]
+                token = token[0]
+            values.append(float(token))
+            i += 1
+        return values
+
+    while i < len(tokens):
+        if tokens[i].isalpha():
+            command = tokens[i]
+            i += 1
+        elif command is None:
+            raise UnsupportedSVG("path data does not start with a command")
+        upper = command.upper()
+        relative = command != upper and upper != 'Z'
+        ox, oy = (x, y) if relative else (0.0, 0.0)
+        if upper == 'Z':
+            if segments is not None:
+                if (x, y) != (start_x, start_y):
+                    segments[1].append(line(start_x, start_y))
+                segments[2] = True
+                x, y = start_x, start_y
+                segments = None
+            last_control = None
+            continue
+        values = take(PATH_ARITY[upper], flags=(3, 4) if upper == 'A' else ())
+        if upper == 'M':
+            x, y = ox + values[0], oy + values[1]
+            start_x, start_y = x, y
+            segments = [(x, y), [], False]
+            subpaths.append(segments)
+            command = 'l' if relative else 'L'  # further pairs are implicit lineto
+            last_control = None
+            continue
+        if segments is None:
+            segments = [(x, y), [], False]
+            subpaths.append(segments)
+        if upper in 'LHV':
+            if upper == 'H':
+                x2, y2 = ox + values[0], y
+            elif upper == 'V':
+                x2, y2 = x, oy + values[0]
+            else:
+                x2, y2 = ox + values[0], oy + values[1]
+            segments[1].append(line(x2, y2))
+            last_control = None
+        elif upper in 'CS':
+            if upper == 'C':
+                c1 = (ox + values[0], oy + values[1])
+                rest = values[2:]
+            else:
+                c1 = (2 * x - last_control[0], 2 * y - last_control[1]) \
+                    if last_control and last_control[2] == 'C' else (x, y)
+                rest = values
+            c2, end = (ox + rest[0], oy + rest[1]), (ox + rest[2], oy + rest[3])
+            segments[1].append((c1, c2, end))
+            last_control = (c2[0], c2[1], 'C')
+            x2, y2 = end
+        elif upper in 'QT':
+            if upper == 'Q':
+                q = (ox + values[0], oy + values[1])
+                end = (ox + values[2], oy + values[3])
+            else:
+                q = (2 * x - last_control[0], 2 * y - last_control[1]) \
+                    if last_control and last_control[2] == 'Q' else (x, y)
+                end = (ox + values[0], oy + values[1])
+            segments[1].append(((x + 2 * (q[0] - x) / 3, y + 2 * (q[1] - y) / 3),
+                                (end[0] + 2 * (q[0] - end[0]) / 3, end[1] + 2 * (q[1] - end[1]) / 3), end))
+            last_control = (q[0], q[1], 'Q')
+            x2, y2 = end
+        else:  # A
+            rx, ry, angle, large, sweep = values[:5]
+            x2, y2 = ox + values[5], oy + values[6]
+            segments[1].extend(_arc_to_cubics(x, y, rx, ry, angle, bool(large), bool(sweep), x2, y2))
+            last_control = None
+        x, y = x2, y2
+    return [tuple(subpath) for subpath in subpaths]
+
+
+def shape_path(elem):
+    """Path data equivalent to a basic shape element."""
+    tag = _tag(elem)
+    if tag == 'path':
+        return elem.get('d', '')
+    if tag == 'rect':
+        x, y = _length(elem.get('x'), 0.0), _length(elem.get('y'), 0.0)
+        width, height = _length(elem.get('width'), 0.0), _length(elem.get('height'), 0.0)
+        if width <= 0 or height <= 0:
+            return ''
+        rx, ry = _length(elem.get('rx')), _length(elem.get('ry'))
+        rx, ry = (rx if rx is not None else ry) or 0.0, (ry if ry is not None else rx) or 0.0
+        rx, ry = min(abs(rx), width / 2), min(abs(ry), height / 2)
+        if not rx or not ry:
+            return f"M{x},{y}H{x + width}V{y + height}H{x}Z"
+        return (f"M{x + rx},{y}H{x + width - rx}A{rx},{ry} 0 0 1 {x + width},{y + ry}"
+                f"V{y + height - ry}A{rx},{ry} 0 0 1 {x + width - rx},{y + height}"
+                f"H{x + rx}A{rx},{ry} 0 0 1 {x},{y + height - ry}"
+                f"V{y + ry}A{rx},{ry} 0 0 1 {x + rx},{y}Z")
+    if tag in ('circle', 'ellipse'):
+        cx, cy = _length(elem.get('cx'), 0.0), _length(elem.get('cy'), 0.0)
+        if tag == 'circle':
+            rx = ry = _length(elem.get('r'), 0.0)
+        else:
+            rx, ry = _length(elem.get('rx'), 0.0), _length(elem.get('ry'), 0.0)
+        if rx <= 0 or ry <= 0:
+            return ''
+        return (f"M{cx - rx},{cy}A{rx},{ry} 0 1 0 {cx + rx},{cy}"
+                f"A{rx},{ry} 0 1 0 {cx - rx},{cy}Z")
+    if tag == 'line':
+        return (f"M{_length(elem.get('x1'), 0.0)},{_length(elem.get('y1'), 0.0)}"
+                f"L{_length(elem.get('x2'), 0.0)},{_length(elem.get('y2'), 0.0)}")
+    if tag in ('polyline', 'polygon'):
+        points = _numbers(elem.get('points'))
+        if len(points) < 4:
+            return ''
+        pairs = ' '.join(f"{points[i]},{points[i + 1]}" for i in range(0, len(points) - 1, 2))
+        return f"M{pairs}{'Z' if tag == 'polygon' else ''}"
+    raise UnsupportedSVG(f"<{tag}> element")
+
+
+def flatten(subpaths, ctm):
+    """Device-space polylines [(points, closed), ...] for parsed subpaths under ctm.
+
+    Transforming the control points first is exact for affine matrices, and
+    lets each curve be split into as many lines as its device size needs.
+    """
+    polylines = []
+    for start, segments, closed in subpaths:
+        current = apply(ctm, *start)
+        points = [current]
+        for c1, c2, end in segments:
+            p1, p2, p3 = apply(ctm, *c1), apply(ctm, *c2), apply(ctm, *end)
+            net = math.dist(current, p1) + math.dist(p1, p2) + math.dist(p2, p3)
+            steps = max(1, min(64, math.ceil(net / 2)))
+            if (p1, p2) == (_third(current, p3, 1), _third(current, p3, 2)):
+                steps = 1  # a straight line raised to a cubic
+            for step in range(1, steps + 1):
+                t = step / steps
+                u = 1 - t
+                w0, w1, w2, w3 = u * u * u, 3 * u * u * t, 3 * u * t * t, t * t * t
+                points.append((w0 * current[0] + w1 * p1[0] + w2 * p2[0] + w3 * p3[0],
+                               w0 * current[1] + w1 * p1[1] + w2 * p2[1] + w3 * p3[1]))
+            current = p3
+        polylines.append((points, closed))
+    return polylines
+
+
+def _third(p, q, n):
+    return p[0] + n * (q[0] - p[0]) / 3, p[1] + n * (q[1] - p[1]) / 3
+
+
+def _signed_area(points):
+    return sum(x1 * y2 - x2 * y1 for (x1, y1), (x2, y2) in zip(points, points[1:] + points[:1])) / 2
+
+
+def dash(points, pattern, offset=0.0):
+    """Split a polyline into the dashes of a (device-space) dash pattern."""
+    if len(pattern) % 2:
+        pattern = pattern * 2
+    if not pattern or sum(pattern) <= 0 or any(v < 0 for v in pattern):
+        return [points]
+    dashes, current = [], [points[0]]
+    index, left, on = 0, pattern[0] - offset, True
+    for (x1, y1), (x2, y2) in zip(points, points[1:]):
+        length = math.dist((x1, y1), (x2, y2))
+        done = 0.0
+        while length - done > left:
+            done += left
+            t = done / length
+            point = (x1 + (x2 - x1) * t, y1 + (y2 - y1) * t)
+            if on:
+                current.append(point)
+                dashes.append(current)
+            current = [point]
+            index = (index + 1) % len(pattern)
+            left, on = pattern[index], not on
+        left -= length - done
+        if on:
+            current.append((x2, y2))
+    if on and len(current) > 1:
+        dashes.append(current)
+    return dashes
+
+
+def parse_style(elem, inherited):
+    """Inherited presentation properties plus elem's own, from attributes or style=."""
+    style = dict(inherited)
+    for name in INHERITED:
+        if elem.get(name) is not None:
+            style[name] = elem.get(name).strip()
+    for declaration in (elem.get('style') or '').split(';'):
+        name, _, value = declaration.partition(':')
+        if name.strip() in INHERITED and value.strip():
+            style[name.strip()] = value.strip()
+    return style
+
+
+def _paint(value):
+    """RGB tuple for a solid paint, or None for 'none'."""
+    if value is None or value == 'none':
+        return None
+    try:
+        return ImageColor.getrgb(value)[:3]
+    except ValueError:
+        raise UnsupportedSVG(f"paint: {value}")
+
+
+def fit(viewport_w, viewport_h, content_w, content_h, preserve='xMidYMid meet'):
+    """Map content onto a viewport per preserveAspectRatio; returns (sx, sy, tx, ty)."""
+    parts = (preserve or 'xMidYMid meet').split()
+    align = parts[0]
+    if align == 'none':
+        return viewport_w / content_w, viewport_h / content_h, 0.0, 0.0
+    if len(parts) > 1 and parts[1] == 'slice':
+        raise UnsupportedSVG("preserveAspectRatio slice")
+    scale = min(viewport_w / content_w, viewport_h / content_h)
+    free_x, free_y = viewport_w - content_w * scale, viewport_h - content_h * scale
+    tx = {'xMin': 0.0, 'xMid': free_x / 2, 'xMax': free_x}[align[:4]]
+    ty = {'YMin': 0.0, 'YMid': free_y / 2, 'YMax': free_y}[align[4:]]
+    return scale, scale, tx, ty
+
+
+def fit_within(width, height, box):
+    """Largest size with the same aspect ratio that fits in box (like -resize WxH)."""
+    if box is None:
+        return max(1, round(width)), max(1, round(height))
+    scale = min(box[0] / width, box[1] / height)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def _tag(elem):
+    return elem.tag.rsplit('}', 1)[-1]
+
+
+class Renderer:
+    """Render the embedded-raster subset of SVG onto a fixed-size RGBA canvas."""
+
+    def __init__(self, root, size):
+        self.root = root
+        self.size = size
+        self.ids = {elem.get('id'): elem for elem in root.iter() if elem.get('id')}
+
+    def blank(self, mode='RGBA'):
+        return Image.new(mode, self.size, 0)
+
+    def reference(self, elem, attribute, tag):
+        value = elem.get(attribute)
+        if not value or value == 'none':
+            return None
+        match = URL_PATTERN.fullmatch(value.strip())
+        target = self.ids.get(match.group(1)) if match else None
+        if target is None or _tag(target) != tag:
+            raise UnsupportedSVG(f"unresolved {attribute}: {value}")
+        return target
+
+    def render_root(self):
+        root = self.root
+        width = _length(root.get('width'))
+        height = _length(root.get('height'))
+        view_box = _numbers(root.get('viewBox'))
+        if len(view_box) != 4:
+            if width is None or height is None:
+                raise UnsupportedSVG("no viewBox or size")
+            view_box = [0.0, 0.0, width, height]
+        min_x, min_y, view_w, view_h = view_box
+        sx, sy, tx, ty = fit(self.size[0], self.size[1], view_w, view_h, root.get('preserveAspectRatio'))
+        ctm = (sx, 0.0, 0.0, sy, tx - min_x * sx, ty - min_y * sy)
+        canvas = self.blank()
+        self.render_children(root, ctm, canvas, parse_style(root, {}))
+        return canvas
+
+    def render_children(self, elem, ctm, target, style=None):
+        for child in elem:
+            if not isinstance(child.tag, str):
+                continue  # comments and processing instructions
+            tag = _tag(child)
+            if tag in IGNORED_TAGS:
+                continue
+            target.alpha_composite(self.render_element(child, ctm, style or {}))
+
+    def render_element(self, elem, ctm, style=None):
+        """Render one element and its effects (filter, clip, mask, opacity) to a layer."""
+        ctm = multiply(ctm, parse_transform(elem.get('transform')))
+        style = parse_style(elem, style or {})
+        tag = _tag(elem)
+        layer = self.blank()
+        if tag == 'g':
+            self.render_children(elem, ctm, layer, style)
+        elif tag == 'image':
+            self.draw_image(elem, ctm, layer)
+        elif tag in SHAPE_TAGS:
+            self.draw_shape(elem, ctm, layer, style)
+        elif tag == 'text':
+            self.draw_text(elem, ctm, layer, style)
+        else:
+            raise UnsupportedSVG(f"<{tag}> element")
+
+        filter_elem = self.reference(elem, 'filter', 'filter')
+        if filter_elem is not None:
+            layer = self.apply_filter(filter_elem, layer)
+        clip = self.reference(elem, 'clip-path', 'clipPath')
+        if clip is not None:
+            self.multiply_alpha(layer, self.clip_mask(clip, ctm))
+        mask = self.reference(elem, 'mask', 'mask')
+        if mask is not None:
+            self.multiply_alpha(layer, self.luminance_mask(mask, ctm))
+        opacity = float(elem.get('opacity', 1))
+        if opacity < 1:
+            self.multiply_alpha(layer, Image.new('L', self.size, round(255 * opacity)))
+        return layer
+
+    def draw_image(self, elem, ctm, layer):
+        href = elem.get(XLINK_HREF) or elem.get('href') or ''
+        if not href.startswith('data:image/') or ';base64,' not in href:
+            raise UnsupportedSVG("<image> without an embedded base64 raster")
+        image = Image.open(io.BytesIO(base64.b64decode(href.split(',', 1)[1])))
+        image = image.convert('RGBA')
+
+        x, y = _length(elem.get('x'), 0.0), _length(elem.get('y'), 0.0)
+        width = _length(elem.get('width'), float(image.width))
+        height = _length(elem.get('height'), float(image.height))
+        sx, sy, tx, ty = fit(width, height, image.width, image.height, elem.get('preserveAspectRatio'))
+        a, b, c, d, e, f = multiply(ctm, (sx, 0.0, 0.0, sy, x + tx, y + ty))
+        if b or c or a <= 0 or d <= 0:
+            raise UnsupportedSVG("rotated, skewed or flipped <image>")
+
+        left, top = round(e), round(f)
+        size = (max(1, round(e + a * image.width) - left), max(1, round(f + d * image.height) - top))
+        layer.paste(image.resize(size, Image.LANCZOS), (left, top))
+
+    def draw_shape(self, elem, ctm, layer, style):
+        polylines = flatten(parse_path(shape_path(elem)), ctm)
+        if not polylines:
+            return
+        fill = _paint(style.get('fill', 'black'))
+        if fill is not None:
+            mask = self.fill_mask([points for points, _ in polylines], style.get('fill-rule', 'nonzero'))
+            self.paint(layer, mask, fill, float(style.get('fill-opacity', 1)))
+        stroke = _paint(style.get('stroke'))
+        width = _length(style.get('stroke-width'), 1.0)
+        if stroke is not None and width > 0:
+            a, b, c, d, _, _ = ctm
+            scale = math.sqrt(abs(a * d - b * c))
+            pattern = [v * scale for v in _numbers(style.get('stroke-dasharray'))]
+            lines = []
+            for points, closed in polylines:
+                points = points + points[:1] if closed else points
+                lines.extend(dash(points, pattern) if pattern else [points])
+            mask = self.stroke_mask(lines, width * scale)
+            self.paint(layer, mask, stroke, float(style.get('stroke-opacity', 1)))
+
+    def draw_text(self, elem, ctm, layer, style):
+        text = ' '.join(''.join(elem.itertext()).split())
+        fill = _paint(style.get('fill', 'black'))
+        if not text or fill is None:
+            return
+        a, b, c, d, _, _ = ctm
+        if b or c or a <= 0 or abs(a - d) > 1e-6 * a:
+            raise UnsupportedSVG("rotated, skewed or stretched <text>")
+        anchor = TEXT_ANCHORS.get(style.get('text-anchor', 'start'))
+        if anchor is None:
+            raise UnsupportedSVG(f"text-anchor: {style['text-anchor']}")
+        x, y = apply(ctm, _length(elem.get('x'), 0.0), _length(elem.get('y'), 0.0))
+        size = _length(style.get('font-size'), 16.0) * a
+        mask = self.blank('L')
+        ImageDraw.Draw(mask).text((x, y), text, fill=255, font=get_font(max(1, round(size))), anchor=anchor)
+        self.paint(layer, mask, fill, float(style.get('fill-opacity', 1)))
+
+    def paint(self, layer, mask, rgb, opacity=1.0):
+        if mask is None:
+            return
+        if opacity < 1:
+            mask = mask.point(lambda v: round(v * opacity))
+        color = Image.new('RGBA', self.size, rgb + (0,))
+        color.putalpha(mask)
+        layer.alpha_composite(color)
+
+    def _coverage(self, polylines, pad, draw):
+        # Draw at SUPERSAMPLE times the resolution, only over the shape's bounding box
+        points = [p for polyline in polylines for p in polyline]
+        if not points:
+            return None
+        left = max(0, math.floor(min(x for x, _ in points) - pad))
+        top = max(0, math.floor(min(y for _, y in points) - pad))
+        right = min(self.size[0], math.ceil(max(x for x, _ in points) + pad))
+        bottom = min(self.size[1], math.ceil(max(y for _, y in points) + pad))
+        if right <= left or bottom <= top:
+            return None
+        local = [[((x - left) * SUPERSAMPLE, (y - top) * SUPERSAMPLE) for x, y in polyline]
+                 for polyline in polylines]
+        coverage = draw(((right - left) * SUPERSAMPLE, (bottom - top) * SUPERSAMPLE), local)
+        mask = self.blank('L')
+        mask.paste(coverage.resize((right - left, bottom - top), Image.BOX), (left, top))
+        return mask
+
+    def fill_mask(self, polygons, rule='nonzero'):
+        """Antialiased coverage of device-space polygons under the nonzero or evenodd rule."""
+        if rule not in ('nonzero', 'evenodd'):
+            raise UnsupportedSVG(f"fill-rule: {rule}")
+
+        def draw(size, polygons):
+            # Winding numbers are counted around 128, so they can go either way
+            result = Image.new('L', size, 0 if rule == 'evenodd' else 128)
+            for polygon in polygons:
+                if len(polygon) < 3:
+                    continue
+                single = Image.new('L', size, 0)
+                ImageDraw.Draw(single).polygon(polygon, fill=255 if rule == 'evenodd' else 1)
+                if rule == 'evenodd':
+                    result = ImageChops.difference(result, single)
+                elif _signed_area(polygon) > 0:
+                    result = ImageChops.add(result, single)
+                else:
+                    result = ImageChops.subtract(result, single)
+            return result if rule == 'evenodd' else result.point(lambda v: 0 if v == 128 else 255)
+
+        return self._coverage(polygons, 1, draw)
+
+    def stroke_mask(self, lines, width):
+        """Antialiased coverage of device-space polylines stroked at width."""
+        def draw(size, lines):
+            result = Image.new('L', size, 0)
+            canvas = ImageDraw.Draw(result)
+            for line in lines:
+                if len(line) > 1:
+                    canvas.line(line, fill=255, width=max(1, round(width * SUPERSAMPLE)), joint='curve')
+            return result
+
+        return self._coverage(lines, width / 2 + 1, draw)
+
+    def clip_mask(self, clip, ctm):
+        if clip.get('clipPathUnits', 'userSpaceOnUse') != 'userSpaceOnUse':
+            raise UnsupportedSVG("clipPathUnits other than userSpaceOnUse")
+        mask = self.blank('L')
+        for child in clip:
+            if not isinstance(child.tag, str):
+                continue
+            if _tag(child) not in SHAPE_TAGS:
+                raise UnsupportedSVG(f"<{_tag(child)}> in clipPath")
+            child_ctm = multiply(ctm, parse_transform(child.get('transform')))
+            polylines = flatten(parse_path(shape_path(child)), child_ctm)
+            coverage = self.fill_mask([points for points, _ in polylines], child.get('clip-rule', 'nonzero'))
+            if coverage is not None:
+                mask = ImageChops.lighter(mask, coverage)
+        return mask
+
+    def luminance_mask(self, mask, ctm):
+        if mask.get('maskContentUnits', 'userSpaceOnUse') != 'userSpaceOnUse':
+            raise UnsupportedSVG("maskContentUnits other than userSpaceOnUse")
+        content = self.blank()
+        self.render_children(mask, ctm, content)
+        luminance = content.convert('RGB').convert('L', LUMINANCE + (0,))
+        return ImageChops.multiply(luminance, content.getchannel('A'))
+
+    @staticmethod
+    def multiply_alpha(layer, mask):
+        layer.putalpha(ImageChops.multiply(layer.getchannel('A'), mask))
+
+    def apply_filter(self, filter_elem, layer):
+        for primitive in filter_elem:
+            if not isinstance(primitive.tag, str):
+                continue
+            if _tag(primitive) != 'feColorMatrix' or primitive.get('in') or primitive.get('result'):
+                raise UnsupportedSVG(f"<{_tag(primitive)}> filter primitive")
+            kind = primitive.get('type', 'matrix')
+            if kind == 'luminanceToAlpha':
+                values = [0] * 15 + [0.2125, 0.7154, 0.0721, 0, 0]
+            elif kind == 'matrix':
+                values = _numbers(primitive.get('values'))
+            else:
+                raise UnsupportedSVG(f"feColorMatrix type {kind}")
+            if len(values) != 20:
+                raise UnsupportedSVG("feColorMatrix without 20 values")
+            layer = color_matrix(layer, values)
+        return layer
+
+
+def color_matrix(layer, values):
+    """Apply a 4x5 feColorMatrix to unpremultiplied RGBA; coefficients must be non-negative."""
+    if any(v < 0 for v in values):
+        raise UnsupportedSVG("negative feColorMatrix coefficients")
+    rgb, alpha = layer.convert('RGB'), layer.getchannel('A')
+    channels = []
+    for row in range(4):
+        r, g, b, a, offset = values[row * 5:row * 5 + 5]
+        channel = rgb.convert('L', (r, g, b, offset * 255))
+        if a:
+            channel = ImageChops.add(channel, alpha.point(lambda v, a=a: v * a))
+        channels.append(channel)
+    return Image.merge('RGBA', channels)
+
+
+def svg_size(root):
+    """Intrinsic (width, height) of an SVG root element in user units."""
+    view_box = _numbers(root.get('viewBox'))
+    width = _length(root.get('width'), view_box[2] if len(view_box) == 4 else None)
+    height = _length(root.get('height'), view_box[3] if len(view_box) == 4 else None)
+    if not width or not height:
+        raise UnsupportedSVG("cannot determine the SVG size")
+    return width, height
+
+
+def render_builtin(data, box=None):
+    """Render SVG bytes with the built-in renderer, scaled to fit within box."""
+    try:
+        root = ET.fromstring(data)
+    except ET.ParseError as e:
+        raise UnsupportedSVG(f"invalid XML: {e}")
+    if root.tag != SVG_NS + 'svg':
+        raise UnsupportedSVG("root element is not <svg>")
+    size = fit_within(*svg_size(root), box)
+    return Renderer(root, size).render_root()
+
+
+def render_cairosvg(data, box=None):
+    import cairosvg
+
+    root = ET.fromstring(data)
+    width, height = fit_within(*svg_size(root), box)
+    png = cairosvg.svg2png(bytestring=data, output_width=width, output_height=height)
+    return Image.open(io.BytesIO(png)).convert('RGBA')
+
+
+def render_imagemagick(path, box=None):
+    binary = shutil.which('magick') or shutil.which('convert')
+    if binary is None:
+        raise FileNotFoundError("ImageMagick (magick or convert) not found on PATH")
+    command = [binary, '-background', 'none', str(path)]
+    if box is not None:
+        command += ['-resize', f"{box[0]}x{box[1]}"]
+    command.append('png:-')
+    result = subprocess.run(command, check=True, capture_output=True)
+    return Image.open(io.BytesIO(result.stdout)).convert('RGBA')
+
+
+def rasterize(path, box=None, backends=('builtin', 'cairosvg', 'imagemagick')):
+    """Rasterize an SVG file to an RGBA image that fits within box.
+
+    Backends are tried in order; returns (image, backend name). Raises
+    RasterizeError listing why each backend failed.
+    """
+    path = Path(path)
+    data = path.read_bytes()
+    failures = []
+    for backend in backends:
+        try:
+            if backend == 'builtin':
+                image = render_builtin(data, box)
+            elif backend == 'cairosvg':
+                image = render_cairosvg(data, box)
+            elif backend == 'imagemagick':
+                image = render_imagemagick(path, box)
+            else:
+                raise ValueError(f"Unknown rasterizer backend: {backend}")
+            return image, backend
+        except ImportError:
+            failures.append(f"{backend}: not installed")
+        except subprocess.CalledProcessError as e:
+            failures.append(f"{backend}: {e.stderr.decode(errors='replace').strip() or e}")
+        except Exception as e:
+            failures.append(f"{backend}: {e}")
+    raise RasterizeError(f"Could not rasterize {path}: " + '; '.join(failures))
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Benchmark the docs transforms on synthetic doc trees of increasing size.
+
+Trees of 50, 1,000 and 10,000 pages are generated from the real docs pages.
+Every transform is timed end to end and per phase (walk, read, match,
+substitute, write), with throughput and peak RSS. Results are saved as JSON
+under .docs-cache/bench/ so runs on different commits can be compared.
+
+Examples:
+    python3 scripts/bench-docs.py
+    python3 scripts/bench-docs.py --pages 1000 -t theme-toggle -t sidebar
+    python3 scripts/bench-docs.py --pages 10000 --jobs 4 -o before.json
+    python3 scripts/bench-docs.py --compare before.json
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from docstools.bench import DEFAULT_SIZES, load_results, print_results, run_benchmarks, save_results
+from docstools.engine import display_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('-p', '--pages', type=int, action='append', metavar='N',
+                        help='synthetic tree size (repeatable, default: 50, 1000 and 10000)')
+    parser.add_argument('-t', '--transform', action='append', dest='transforms', metavar='NAME',
+                        help='transform to benchmark (repeatable, default: every registered transform)')
+    parser.add_argument('-j', '--jobs', type=int, default=1, metavar='N',
+                        help='worker processes for the end-to-end runs (default: 1)')
+    parser.add_argument('-o', '--output', type=Path, metavar='PATH',
+                        help='results file (default: .docs-cache/bench/<time>-<commit>.json)')
+    parser.add_argument('--compare', type=Path, metavar='PATH',
+                        help='earlier results file to compare end-to-end times against')
+    parser.add_argument('--workdir', type=Path, metavar='DIR',
+                        help='where to build the synthetic trees (default: a temp dir, removed afterwards)')
+    args = parser.parse_args()
+
+    if args.jobs < 1:
+        parser.error('--jobs must be at least 1')
+    if args.pages and min(args.pages) < 1:
+        parser.error('--pages must be at least 1')
+
+    try:
+        baseline = load_results(args.compare) if args.compare else None
+        results = run_benchmarks(args.pages or DEFAULT_SIZES, args.transforms, args.jobs, args.workdir)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    print_results(results, baseline)
+    path = save_results(results, args.output)
+    print(f"\nResults written to {display_path(path)}")
+    return 1 if any(case['errors'] for case in results['cases']) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Build the docs full-text search index and wire up the search box.
+
+The pages in docs/sidebar.json are split into heading sections and merged
+into a sharded inverted index under docs/search/, which docs/search.js
+queries in the browser. Only pages changed since the last build are
+re-read (.docs-cache/search.json). The 'search' transform then adds the
+search.js script tag to every page, and the mirrors are synced. --check
+writes nothing and exits 1 when the committed index (or, without
+--index-only, a page's script tag) is out of date.
+
+Examples:
+    python3 scripts/build-search-index.py
+    python3 scripts/build-search-index.py --no-cache
+    python3 scripts/build-search-index.py --index-only
+    python3 scripts/build-search-index.py --check
+"""
+
+import argparse
+import sys
+
+from docstools import run_transforms
+from docstools.search import build_search_index, print_index_report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--no-cache', action='store_true',
+                        help='ignore .docs-cache/search.json and re-extract every page')
+    parser.add_argument('--index-only', action='store_true',
+                        help='only rebuild docs/search/; do not run the search transform or sync mirrors')
+    parser.add_argument('--check', action='store_true',
+                        help='report whether the index and pages are up to date without writing (exit 1 if not)')
+    parser.add_argument('-j', '--jobs', type=int, default=None, metavar='N',
+                        help='worker processes for the search transform (default: CPU count, 1 = serial)')
+    args = parser.parse_args()
+
+    if args.jobs is not None and args.jobs < 1:
+        parser.error('--jobs must be at least 1')
+
+    report = build_search_index(use_cache=not args.no_cache, check=args.check)
+    print_index_report(report, check=args.check)
+    stale = args.check and bool(report.written)
+    if stale:
+        print("\n✗ docs/search/ is out of date; re-run without --check to update it")
+    if args.index_only:
+        return 1 if stale else 0
+    print()
+    status = run_transforms(['search'], jobs=args.jobs, mode='check' if args.check else 'write')
+    return 1 if stale else status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Move repeated inline SVG icons into a shared, fingerprinted sprite.
+
+Icons that appear at least twice across docs/ and scripts/partials/ become
+<symbol>s in docs/icons.<hash>.svg and each copy is replaced with a
+<use href> reference, so the browser downloads and caches the markup once.
+Re-runs only read files changed since the last run (.docs-cache/svg-sprite.json)
+and change nothing when the sprite is current. Mirrors are synced afterwards.
+
+Examples:
+    python3 scripts/build-svg-sprite.py
+    python3 scripts/build-svg-sprite.py --check
+    python3 scripts/build-svg-sprite.py --min-repeats 3 --no-sync
+"""
+
+import argparse
+import sys
+
+from docstools.sprite import MIN_REPEATS, build_sprite, print_sprite_report
+from docstools.sync import print_sync_report, sync_mirrors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--min-repeats', type=int, default=MIN_REPEATS, metavar='N',
+                        help=f'occurrences before an icon moves into the sprite (default: {MIN_REPEATS})')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='ignore .docs-cache/svg-sprite.json and rescan every file')
+    parser.add_argument('--no-sync', action='store_true',
+                        help='do not refresh client/public/docs/ from docs/ afterwards')
+    parser.add_argument('--check', action='store_true',
+                        help='exit 1 if the sprite or any reference is out of date; writes nothing')
+    args = parser.parse_args()
+
+    if args.min_repeats < 1:
+        parser.error('--min-repeats must be at least 1')
+
+    report = build_sprite(min_repeats=args.min_repeats, use_cache=not args.no_cache, check=args.check)
+    print_sprite_report(report, check=args.check)
+
+    if args.check:
+        if report.pages or report.removed:
+            print("\n✗ Icons are out of date; run scripts/build-svg-sprite.py")
+            return 1
+        print("\n✅ Sprite is up to date")
+        return 0
+    if not args.no_sync:
+        for sync_report in sync_mirrors():
+            print_sync_report(sync_report)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Check that internal links and asset references across the docs resolve.
+
+Every page in docs/ and client/public/docs/, both sidebar.json files, the
+shared partials in scripts/partials/ and sitemap.xml are checked: each
+href/src/srcset must name a file the site serves, a client-side route, or
+(for #fragments on docs pages) an existing id. Pages unchanged since the
+last run are not re-parsed (.docs-cache/links.json). Exits 1 when any
+reference is broken, so it can gate a build.
+
+Examples:
+    python3 scripts/check-links.py
+    python3 scripts/check-links.py --canonical-only
+    python3 scripts/check-links.py --no-cache --jobs 4
+"""
+
+import argparse
+import sys
+import time
+
+from docstools import CANONICAL_DOCS_DIR
+from docstools.engine import default_jobs
+from docstools.links import check_links, print_link_report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--canonical-only', action='store_true',
+                        help='only check docs/, not the client/public/docs/ mirror')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='ignore .docs-cache/links.json and re-parse every page')
+    parser.add_argument('-j', '--jobs', type=int, default=None, metavar='N',
+                        help='worker processes for parsing pages (default: CPU count, 1 = serial)')
+    args = parser.parse_args()
+
+    if args.jobs is not None and args.jobs < 1:
+        parser.error('--jobs must be at least 1')
+
+    start = time.perf_counter()
+    report = check_links([CANONICAL_DOCS_DIR] if args.canonical_only else None,
+                         jobs=args.jobs or default_jobs(), use_cache=not args.no_cache)
+    print_link_report(report, time.perf_counter() - start)
+    return 1 if report.broken else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
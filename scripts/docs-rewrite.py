@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Apply docs transforms to every HTML page in a single pass.
+
+Each page is read once, run through the ordered transform pipeline in memory,
+and written back at most once. Without --transform the default pipeline runs;
+footer replacements are opt-in. Pages already processed by the same transform
+versions are skipped using the manifest in .docs-cache/. Writes go through a
+temp file and rename, so an interrupted run never leaves a truncated page.
+
+Examples:
+    python3 scripts/docs-rewrite.py --list
+    python3 scripts/docs-rewrite.py -t bg-color -t footer-layout -t theme-toggle
+    python3 scripts/docs-rewrite.py -t footer-columns --jobs 8 docs
+    python3 scripts/docs-rewrite.py -t footer-layout --dry-run
+    python3 scripts/docs-rewrite.py --check
+    python3 scripts/docs-rewrite.py --no-cache --trace trace.json --trace-format chrome
+    python3 scripts/docs-rewrite.py -t sidebar --no-cache --profile sample
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from docstools import TRANSFORMS, run_transforms
+from docstools.engine import add_run_arguments
+from docstools.trace import PROFILERS, TRACE_FORMATS
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('dirs', nargs='*', type=Path,
+                        help='docs directories to process (default: docs/, then sync client/public/docs/)')
+    parser.add_argument('-t', '--transform', action='append', dest='transforms', metavar='NAME',
+                        help='transform to apply (repeatable, default: the default pipeline)')
+    add_run_arguments(parser)
+    parser.add_argument('--trace', type=Path, metavar='PATH',
+                        help='write per-page and per-transform timings, sizes and skip reasons to PATH')
+    parser.add_argument('--trace-format', choices=TRACE_FORMATS, default='jsonl',
+                        help='JSON Lines, or a Chrome trace for chrome://tracing and Perfetto (default: jsonl)')
+    parser.add_argument('--profile', choices=PROFILERS,
+                        help='profile the run (serially) with cProfile or a stack sampler')
+    parser.add_argument('--profile-out', type=Path, metavar='PATH',
+                        help='where to save the profile (default: .docs-cache/profile.prof or .folded)')
+    parser.add_argument('--list', action='store_true', help='list registered transforms and exit')
+    args = parser.parse_args()
+
+    if args.list:
+        for t in sorted(TRANSFORMS.values(), key=lambda t: (t.order, t.name)):
+            marker = '*' if t.default else ' '
+            print(f"{marker} {t.name:<18} {t.description}")
+        print("\n* = part of the default pipeline")
+        return 0
+
+    if args.jobs is not None and args.jobs < 1:
+        parser.error('--jobs must be at least 1')
+
+    try:
+        return run_transforms(args.transforms, args.dirs or None, use_cache=not args.no_cache,
+                              jobs=args.jobs, sync=not args.no_sync,
+                              mode=args.mode or 'write', trace=args.trace,
+                              trace_format=args.trace_format, profile=args.profile,
+                              profile_path=args.profile_out)
+    except ValueError as e:
+        parser.error(str(e))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
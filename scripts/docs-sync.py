@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Regenerate client/public/docs/ from the canonical docs/ tree.
+
+Only files that differ are replaced. --mode link hardlinks pages so both trees
+share one copy on disk, --mode reflink clones them copy-on-write where the
+filesystem supports it, and --check reports drift without touching anything
+(exit code 1 when the mirror is stale).
+
+Examples:
+    python3 scripts/docs-sync.py
+    python3 scripts/docs-sync.py --check
+    python3 scripts/docs-sync.py --mode link --prune
+"""
+
+import argparse
+import sys
+
+from docstools.sync import SYNC_MODES, print_sync_report, sync_mirrors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--mode', choices=SYNC_MODES, default='copy',
+                        help='how mirror files are materialized (default: copy)')
+    parser.add_argument('--prune', action='store_true',
+                        help='delete files that only exist in the mirror')
+    parser.add_argument('--check', action='store_true',
+                        help='report drift and exit non-zero instead of syncing')
+    args = parser.parse_args()
+
+    reports = sync_mirrors(mode=args.mode, prune=args.prune, check=args.check)
+    for report in reports:
+        print_sync_report(report, check=args.check, verbose=True)
+
+    if any(report.errors for report in reports):
+        return 1
+    if args.check and any(report.drift for report in reports):
+        print("\n✗ Mirror is out of date; run scripts/docs-sync.py")
+        return 1
+    print("\n✅ Mirrors checked" if args.check else "\n✅ Mirrors synced")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Watch docs/ and re-apply transforms to what changed, until interrupted.
+
+The pipeline stays loaded between edits. Saving a page re-transforms just
+that page; saving a shared input (a partial in scripts/partials/, sidebar.json,
+an image the picture transform reads) re-transforms only the pages that
+depend on it. Changed files are copied to client/public/docs/ as they are
+written. Uses inotify on Linux and falls back to polling elsewhere.
+
+Examples:
+    python3 scripts/docs-watch.py
+    python3 scripts/docs-watch.py -t sidebar -t footer-layout
+    python3 scripts/docs-watch.py --poll --interval 1
+"""
+
+import argparse
+import sys
+
+from docstools import watch
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('-t', '--transform', action='append', dest='transforms', metavar='NAME',
+                        help='transform to apply (repeatable, default: the default pipeline)')
+    parser.add_argument('--no-sync', action='store_true',
+                        help='do not copy changed files to client/public/docs/')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='do not update the .docs-cache manifest')
+    parser.add_argument('--poll', action='store_true',
+                        help='poll file mtimes instead of using inotify')
+    parser.add_argument('--interval', type=float, default=watch.POLL_INTERVAL, metavar='SECONDS',
+                        help=f'polling interval (default: {watch.POLL_INTERVAL})')
+    args = parser.parse_args()
+
+    if args.interval <= 0:
+        parser.error('--interval must be positive')
+
+    try:
+        return watch.watch(args.transforms, poll=args.poll, interval=args.interval,
+                           sync=not args.no_sync, use_cache=not args.no_cache)
+    except ValueError as e:
+        parser.error(str(e))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
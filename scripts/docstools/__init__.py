@@ -0,0 +1,34 @@
+"""
+Shared tooling for the static documentation trees (docs/ and client/public/docs/).
+
+Importing the package registers the built-in transforms with the engine.
+"""
+
+from . import transforms
+from .engine import (
+    ALL_DOCS_DIRS,
+    CANONICAL_DOCS_DIR,
+    DOCS_DIRS,
+    MIRROR_DOCS_DIRS,
+    REPO_ROOT,
+    TRANSFORMS,
+    get_pipeline,
+    iter_results,
+    run,
+    run_transforms,
+    transform_main,
+)
+
+__all__ = [
+    'ALL_DOCS_DIRS',
+    'CANONICAL_DOCS_DIR',
+    'DOCS_DIRS',
+    'MIRROR_DOCS_DIRS',
+    'REPO_ROOT',
+    'TRANSFORMS',
+    'get_pipeline',
+    'iter_results',
+    'run',
+    'run_transforms',
+    'transform_main',
+]
@@ -0,0 +1,285 @@
+"""
+Benchmark harness for the docs transforms on synthetic doc trees.
+
+Synthetic trees are cloned from the real docs pages and rolled back to the
+markup the transforms rewrite (a #ffffff light background rule and the
+emoji theme buttons), so the transforms have real work to do. Each (tree size, transform) case runs in a freshly spawned process,
+which keeps its peak RSS independent of the cases before it.
+
+A case records:
+  end_to_end  run() over the tree, as docs-rewrite.py would (cold, no cache)
+  cached      the same run again against a populated manifest
+  phases      walk, read, match (region index), substitute (transform) and
+              write (atomic rename), timed separately in a serial loop
+"""
+
+import json
+import multiprocessing
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+from .cache import CACHE_DIR, Manifest
+from .engine import CANONICAL_DOCS_DIR, REPO_ROOT, TRANSFORMS, atomic_write, get_pipeline, iter_html_files, run
+from .partials import render_partial
+from .regions import build_index, index_regions, splice
+
+DEFAULT_SIZES = (50, 1000, 10000)
+PHASES = ('walk', 'read', 'match', 'substitute', 'write')
+PAGES_PER_SECTION = 100
+RESULTS_DIR = CACHE_DIR / 'bench'
+RESULTS_FORMAT = 1
+
+LIGHT_BG_RULE = '''
+        :root[data-theme="light"] {
+            --bg: #ffffff;
+        }
+'''
+EMOJI_BUTTONS = (
+    '<button id="theme-light-btn" onclick="setTheme(\'light\')" aria-label="Light theme">☀️</button>\n'
+    '                        <button id="theme-dark-btn" onclick="setTheme(\'dark\')" aria-label="Dark theme">🌙</button>'
+)
+
+
+def age_page(content, toggle=EMOJI_BUTTONS):
+    """Roll a current docs page back to the markup the transforms expect to find."""
+    index = build_index(content)
+    edits = [(region.start, region.end, toggle) for region in index['theme-toggle']]
+    edits += [(region.inner_start, region.inner_start, LIGHT_BG_RULE) for region in index['style'][:1]]
+    return splice(content, edits)
+
+
+def load_seeds(docs_dir=None):
+    """Aged copies of every real docs page with a footer and main content, in path order.
+
+    Each page yields two seeds: one with the light/dark emoji buttons (for
+    theme-toggle) and one with the single emoji toggle (for theme-toggle-svg).
+    """
+    single_toggle = render_partial('theme-toggle', 'emoji')
+    seeds = []
+    for path in iter_html_files([docs_dir or CANONICAL_DOCS_DIR]):
+        content = path.read_text(encoding='utf-8')
+        if build_index(content)['footer'] and '</main>' in content:
+            seeds.append(age_page(content))
+            seeds.append(age_page(content, single_toggle))
+    if not seeds:
+        raise ValueError("No docs pages with a footer to seed the synthetic tree from")
+    return seeds
+
+
+def build_tree(root, pages, seeds):
+    """Write a synthetic docs tree of the given size under root; returns its total bytes."""
+    root = Path(root)
+    total = 0
+    for i in range(pages):
+        seed = seeds[i % len(seeds)]
+        # A unique paragraph per page keeps contents (and content hashes) distinct
+        marker = seed.rfind('</main>')
+        content = f'{seed[:marker]}<p>Synthetic page {i}</p>\n        {seed[marker:]}'
+        path = root / f"section-{i // PAGES_PER_SECTION:03d}" / f"page-{i:05d}.html"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = content.encode('utf-8')
+        path.write_bytes(data)
+        total += len(data)
+    return total
+
+
+def peak_rss():
+    """Peak resident set size of this process and its reaped children, in bytes."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    scale = 1 if sys.platform == 'darwin' else 1024
+    return scale * max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+
+
+def time_phases(tree, pipeline):
+    """Serially time each phase of a pipeline run over tree; returns ({phase: seconds}, changed)."""
+    timings = dict.fromkeys(PHASES, 0.0)
+    clock = time.perf_counter
+
+    start = clock()
+    files = list(iter_html_files([tree]))
+    timings['walk'] = clock() - start
+
+    changed = 0
+    for path in files:
+        start = clock()
+        data = path.read_bytes()
+        content = data.decode('utf-8')
+        timings['read'] += clock() - start
+
+        updated = content
+        for t in pipeline:
+            start = clock()
+            index_regions(updated)
+            timings['match'] += clock() - start
+
+            # The index is memoized, so the transform only pays for its edits
+            start = clock()
+            updated = t.func(updated, path)
+            timings['substitute'] += clock() - start
+
+        if updated != content:
+            changed += 1
+            start = clock()
+            atomic_write(path, updated.encode('utf-8'))
+            timings['write'] += clock() - start
+    return timings, changed
+
+
+def run_case(base_tree, workdir, name, jobs=1):
+    """Benchmark one transform over a copy of base_tree; meant to run in its own process."""
+    pipeline = get_pipeline([name])
+    workdir = Path(workdir)
+    tree = workdir / 'docs'
+    shutil.copytree(base_tree, tree)
+
+    start = time.perf_counter()
+    results = run(pipeline, iter_html_files([tree]), jobs=jobs)
+    end_to_end = time.perf_counter() - start
+
+    manifest = Manifest(workdir / 'manifest.json')
+    run(pipeline, iter_html_files([tree]), manifest, jobs)
+    start = time.perf_counter()
+    run(pipeline, iter_html_files([tree]), manifest, jobs)
+    cached = time.perf_counter() - start
+
+    shutil.rmtree(tree)
+    shutil.copytree(base_tree, tree)
+    phases, changed = time_phases(tree, pipeline)
+
+    return {
+        'transform': name,
+        'end_to_end': end_to_end,
+        'cached': cached,
+        'phases': phases,
+        'changed': changed,
+        'errors': sum(result.status == 'error' for result in results),
+        'peak_rss': peak_rss(),
+    }
+
+
+def git_revision():
+    """(commit, dirty) for the working tree, or (None, None) outside git."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=REPO_ROOT, check=True,
+                                capture_output=True, text=True).stdout.strip()
+        status = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'],
+                                cwd=REPO_ROOT, check=True, capture_output=True, text=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return commit, bool(status.strip())
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, names=None, jobs=1, workdir=None, progress=print):
+    """Run every (size, transform) case and return the results document.
+
+    Trees are built in workdir and left there, or in a temp dir that is
+    removed afterwards.
+    """
+    names = names or [t.name for t in sorted(TRANSFORMS.values(), key=lambda t: (t.order, t.name))]
+    get_pipeline(names)  # fail fast on unknown names
+    seeds = load_seeds()
+    root = Path(workdir) if workdir else Path(tempfile.mkdtemp(prefix='docs-bench-'))
+    context = multiprocessing.get_context('spawn')
+    cases = []
+
+    try:
+        for size in sizes:
+            base_tree = root / f"tree-{size}" / 'docs'
+            if base_tree.exists():
+                shutil.rmtree(base_tree)
+            total_bytes = build_tree(base_tree, size, seeds)
+            for name in names:
+                progress(f"⏱  {size} pages: {name}")
+                case_dir = root / f"case-{size}-{name}"
+                if case_dir.exists():
+                    shutil.rmtree(case_dir)
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                    case = pool.submit(run_case, base_tree, case_dir, name, jobs).result()
+                shutil.rmtree(case_dir, ignore_errors=True)
+                case.update({
+                    'pages': size,
+                    'bytes': total_bytes,
+                    'pages_per_second': size / case['end_to_end'] if case['end_to_end'] else None,
+                    'mib_per_second': total_bytes / 2**20 / case['end_to_end'] if case['end_to_end'] else None,
+                })
+                cases.append(case)
+    finally:
+        if not workdir:
+            shutil.rmtree(root, ignore_errors=True)
+
+    commit, dirty = git_revision()
+    return {
+        'format': RESULTS_FORMAT,
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': commit,
+        'dirty': dirty,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': multiprocessing.cpu_count(),
+        'jobs': jobs,
+        'seed_pages': len(seeds) // 2,
+        'cases': cases,
+    }
+
+
+def default_results_path(results):
+    """Results file name under .docs-cache/bench/, keyed by time and commit."""
+    stamp = results['created'].replace(':', '').replace('-', '').replace('+0000', 'Z')
+    commit = (results['commit'] or 'nogit')[:10] + ('-dirty' if results['dirty'] else '')
+    return RESULTS_DIR / f"{stamp}-{commit}.json"
+
+
+def save_results(results, path=None):
+    path = Path(path or default_results_path(results))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=1) + '\n', encoding='utf-8')
+    return path
+
+
+def load_results(path):
+    results = json.loads(Path(path).read_text(encoding='utf-8'))
+    if results.get('format') != RESULTS_FORMAT:
+        raise ValueError(f"Unsupported benchmark results format in {path}")
+    return results
+
+
+def _format_bytes(size):
+    return '-' if size is None else f"{size / 2**20:.1f} MiB"
+
+
+def print_results(results, baseline=None):
+    """Print one row per case; with a baseline, compare end-to-end times."""
+    previous = {}
+    if baseline:
+        previous = {(case['pages'], case['transform']): case for case in baseline['cases']}
+        print(f"Baseline: {(baseline['commit'] or 'unknown')[:10]} ({baseline['created']})")
+
+    print(f"\n{'='*60}")
+    header = f"{'pages':>6}  {'transform':<17}{'total':>9}{'pages/s':>10}{'cached':>9}{'peak RSS':>11}"
+    print(header + ('  vs base' if baseline else ''))
+    for case in results['cases']:
+        row = (f"{case['pages']:>6}  {case['transform']:<17}{case['end_to_end']:>8.2f}s"
+               f"{case['pages_per_second']:>10,.0f}{case['cached']:>8.2f}s{_format_bytes(case['peak_rss']):>11}")
+        base = previous.get((case['pages'], case['transform']))
+        if base and base['end_to_end']:
+            row += f"  {case['end_to_end'] / base['end_to_end']:>6.2f}x"
+        print(row)
+        phases = '  '.join(f"{phase} {case['phases'][phase]:.3f}s" for phase in PHASES)
+        print(f"{'':>8}{phases}  ({case['changed']} changed)")
+        if case['errors']:
+            print(f"{'':>8}✗ {case['errors']} page(s) failed")
+    print(f"{'='*60}")
@@ -0,0 +1,110 @@
+"""
+Persistent content-hash manifest for incremental docs runs.
+
+For every page the manifest stores the hash, size and mtime of the content
+the last run left on disk, plus the stamp (version and input hashes) of
+each transform already applied to it. A page is skipped when its content
+is unchanged and every transform in the current pipeline was already
+applied with the same stamp.
+"""
+
+import json
+from pathlib import Path
+
+from .engine import REPO_ROOT, content_hash
+
+CACHE_DIR = REPO_ROOT / '.docs-cache'
+MANIFEST_PATH = CACHE_DIR / 'manifest.json'
+MANIFEST_FORMAT = 2
+
+
+def cache_key(path):
+    """Key pages by repository-relative path so the manifest is portable."""
+    path = Path(path).resolve()
+    try:
+        return path.relative_to(REPO_ROOT).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+class Manifest:
+    """On-disk record of page hashes and the transform stamps applied to them."""
+
+    def __init__(self, path=MANIFEST_PATH):
+        self.path = Path(path)
+        self.entries = {}
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        """Load the manifest, starting empty if it is missing or unreadable."""
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return
+        if data.get('format') == MANIFEST_FORMAT:
+            self.entries = data.get('pages', {})
+
+    def save(self):
+        """Write the manifest back if anything changed."""
+        if not self.dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {'format': MANIFEST_FORMAT, 'pages': self.entries}
+        tmp_path = self.path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps(data, indent=1, sort_keys=True), encoding='utf-8')
+        tmp_path.replace(self.path)
+        self.dirty = False
+
+    def get(self, path):
+        """Return the stored entry for a page, or None."""
+        return self.entries.get(cache_key(path))
+
+    def put(self, path, entry):
+        """Store a page entry produced by a (possibly remote) worker."""
+        key = cache_key(path)
+        if entry is not None and self.entries.get(key) != entry:
+            self.entries[key] = entry
+            self.dirty = True
+
+    def forget(self, path):
+        """Drop a page from the manifest."""
+        if self.entries.pop(cache_key(path), None) is not None:
+            self.dirty = True
+
+
+def _covers(entry, pipeline):
+    applied = entry.get('transforms', {})
+    return all(applied.get(t.name) == t.stamp for t in pipeline)
+
+
+def is_fresh_stat(entry, stat, pipeline):
+    """True when size and mtime match a page the pipeline has already processed."""
+    return (
+        entry is not None
+        and entry.get('size') == stat.st_size
+        and entry.get('mtime_ns') == stat.st_mtime_ns
+        and _covers(entry, pipeline)
+    )
+
+
+def is_fresh_hash(entry, digest, pipeline):
+    """True when the content hash matches a page the pipeline has already processed."""
+    return entry is not None and entry.get('hash') == digest and _covers(entry, pipeline)
+
+
+def make_entry(entry, digest, stat, pipeline, changed):
+    """Build the manifest entry describing a page after a run.
+
+    When the content changed, earlier transforms are forgotten: they may
+    no longer be no-ops on the new content.
+    """
+    entry = entry or {}
+    applied = {} if changed or entry.get('hash') != digest else dict(entry.get('transforms', {}))
+    applied.update({t.name: t.stamp for t in pipeline})
+    return {
+        'hash': digest,
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'transforms': applied,
+    }
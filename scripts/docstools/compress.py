@@ -0,0 +1,167 @@
+"""
+Write precompressed .gz and .br siblings for the text assets of a built site.
+
+Every HTML, CSS, JS, JSON, SVG (and similar text) file gets <name>.gz at
+gzip level 9 and, when the brotli module is installed, <name>.br at quality
+11, so a server fronting the site can send pre-compressed bytes without
+compressing per request. Output is deterministic (no gzip mtime or file
+name), and files whose content hash matches .docs-cache/precompress.json
+and whose siblings still exist are skipped.
+"""
+
+import gzip
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .cache import CACHE_DIR, cache_key
+from .engine import REPO_ROOT, atomic_write, bounded_map, content_hash
+
+try:
+    import brotli
+except ImportError:  # optional: .br siblings are skipped without it
+    brotli = None
+
+SITE_DIR = REPO_ROOT / '_site'
+COMPRESS_MANIFEST = CACHE_DIR / 'precompress.json'
+COMPRESS_FORMAT = 1
+COMPRESSIBLE_SUFFIXES = {
+    '.html', '.htm', '.css', '.js', '.mjs', '.json', '.webmanifest',
+    '.svg', '.xml', '.txt', '.map',
+}
+# Below this size the compressed framing outweighs the savings
+MIN_SIZE = 256
+
+
+@dataclass
+class CompressResult:
+    """Outcome of precompressing one file."""
+    path: Path
+    status: str  # 'compressed', 'skipped', 'small' or 'error'
+    size: int = 0
+    encoded: dict = field(default_factory=dict)  # suffix -> compressed size
+    error: str = None
+    digest: str = None
+
+
+def encoders():
+    """Sibling suffix -> compress function for every available encoding."""
+    codecs = {'.gz': lambda data: gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        codecs['.br'] = lambda data: brotli.compress(data, quality=11, mode=brotli.MODE_TEXT)
+    return codecs
+
+
+def iter_compressible(root):
+    """Yield every file under root that should get compressed siblings."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            path = Path(dirpath) / filename
+            if path.suffix.lower() in COMPRESSIBLE_SUFFIXES:
+                yield path
+
+
+def sibling(path, suffix):
+    return path.with_name(path.name + suffix)
+
+
+def compress_file(path, digest=None):
+    """Write the compressed siblings of one file unless its stored digest still matches."""
+    codecs = encoders()
+    try:
+        data = path.read_bytes()
+        current = content_hash(data)
+        if len(data) < MIN_SIZE:
+            for suffix in codecs:
+                # A sibling left from when the file was larger would now be stale
+                if sibling(path, suffix).exists():
+                    sibling(path, suffix).unlink()
+            return CompressResult(path, 'small', len(data), digest=current)
+        if digest == current and all(sibling(path, suffix).exists() for suffix in codecs):
+            encoded = {suffix: sibling(path, suffix).stat().st_size for suffix in codecs}
+            return CompressResult(path, 'skipped', len(data), encoded, digest=current)
+
+        encoded = {}
+        for suffix, compress in codecs.items():
+            compressed = compress(data)
+            atomic_write(sibling(path, suffix), compressed)
+            encoded[suffix] = len(compressed)
+        return CompressResult(path, 'compressed', len(data), encoded, digest=current)
+    except Exception as e:
+        return CompressResult(path, 'error', error=f"{type(e).__name__}: {e}")
+
+
+def _compress_job(job):
+    return compress_file(*job)
+
+
+def load_manifest(path=COMPRESS_MANIFEST):
+    try:
+        data = json.loads(Path(path).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    if data.get('format') != COMPRESS_FORMAT or data.get('encodings') != sorted(encoders()):
+        return {}
+    return data.get('files', {})
+
+
+def save_manifest(entries, path=COMPRESS_MANIFEST):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {'format': COMPRESS_FORMAT, 'encodings': sorted(encoders()), 'files': entries}
+    atomic_write(path, json.dumps(data, indent=1, sort_keys=True).encode('utf-8'))
+
+
+def precompress(root=SITE_DIR, jobs=1, use_cache=True):
+    """Precompress every text asset under root, yielding CompressResults in path order
+    as files finish (see bounded_map); the manifest is saved after the last one."""
+    entries = load_manifest() if use_cache else {}
+    stored = load_manifest()
+    jobs_iter = ((path, entries.get(cache_key(path))) for path in iter_compressible(root))
+    for result in bounded_map(_compress_job, jobs_iter, jobs):
+        if result.digest is not None:
+            stored[cache_key(result.path)] = result.digest
+        yield result
+    save_manifest(stored)
+
+
+def _ratio(size, encoded):
+    return f"{encoded / size:6.1%}" if size else '     -'
+
+
+def report_compression(results, root, verbose=False):
+    """Print the per-file ratios and totals; returns the status counts."""
+    counts = {'compressed': 0, 'skipped': 0, 'small': 0, 'error': 0}
+    totals = {}
+    original = 0
+
+    for result in results:
+        counts[result.status] += 1
+        if result.status == 'error':
+            print(f"✗ Error compressing {result.path}: {result.error}")
+            continue
+        if result.status == 'small':
+            continue
+        original += result.size
+        for suffix, size in result.encoded.items():
+            totals[suffix] = totals.get(suffix, 0) + size
+        if result.status == 'compressed' or verbose:
+            ratios = '  '.join(f"{suffix} {_ratio(result.size, result.encoded[suffix])}"
+                               for suffix in sorted(result.encoded))
+            print(f"{'✓' if result.status == 'compressed' else ' '} "
+                  f"{result.path.relative_to(root)} ({result.size:,} bytes)  {ratios}")
+
+    print(f"\n{'='*60}")
+    print(f"Files compressed: {counts['compressed']}")
+    if counts['skipped']:
+        print(f"Files skipped (unchanged): {counts['skipped']}")
+    if counts['small']:
+        print(f"Files below {MIN_SIZE} bytes: {counts['small']}")
+    for suffix in sorted(totals):
+        print(f"Total {suffix}: {original:,} → {totals[suffix]:,} bytes ({_ratio(original, totals[suffix]).strip()})")
+    if counts['error']:
+        print(f"Errors: {counts['error']}")
+    print(f"{'='*60}")
+    return counts
@@ -0,0 +1,162 @@
+"""
+Small CSS helpers for the docs tooling.
+
+Just enough parsing to split a stylesheet into top-level rules (keeping
+nested at-rules such as @media intact) and to compare rules textually.
+"""
+
+import re
+
+COMMENT_PATTERN = re.compile(r'/\*.*?\*/', re.DOTALL)
+PROPERTY_PATTERN = re.compile(r'(?:^|[;{])\s*(--[\w-]+|-?[a-zA-Z][\w-]*)\s*:')
+PSEUDO_ELEMENT_PATTERN = re.compile(r'::([\w-]+)|:(before|after|first-line|first-letter)\b')
+VENDOR_PREFIX_PATTERN = re.compile(r'^-(?:webkit|moz|ms|o)-')
+# Longhands whose shorthand is not named by their first segment
+# (margin-top and border-left-color already share theirs: margin, border)
+SHORTHAND_FAMILIES = {
+    'top': 'inset', 'right': 'inset', 'bottom': 'inset', 'left': 'inset',
+    'row-gap': 'gap', 'column-gap': 'gap', 'grid-gap': 'gap',
+    'align-content': 'place', 'align-items': 'place', 'align-self': 'place',
+    'justify-content': 'place', 'justify-items': 'place', 'justify-self': 'place',
+    'columns': 'column',
+    'line-height': 'font',
+}
+
+
+def _skip_string(css, i):
+    quote = css[i]
+    i += 1
+    while i < len(css) and css[i] != quote:
+        i += 2 if css[i] == '\\' else 1
+    return i + 1
+
+
+def split_rules(css):
+    """Split CSS into top-level rules; returns (rules, trailing text).
+
+    Each rule keeps the whitespace and comments that precede it, so
+    ''.join(rules) + tail reproduces the input exactly.
+    """
+    rules = []
+    start = depth = i = 0
+    n = len(css)
+    while i < n:
+        if css.startswith('/*', i):
+            end = css.find('*/', i + 2)
+            i = n if end < 0 else end + 2
+            continue
+        c = css[i]
+        if c in '"\'':
+            i = _skip_string(css, i)
+            continue
+        if c == '{':
+            depth += 1
+        elif c == '}':
+            depth -= 1
+            if depth == 0:
+                rules.append(css[start:i + 1])
+                start = i + 1
+        elif c == ';' and depth == 0:
+            rules.append(css[start:i + 1])
+            start = i + 1
+        i += 1
+    return rules, css[start:]
+
+
+def normalize_rule(rule):
+    """Comment- and whitespace-insensitive form of a rule, for comparisons."""
+    return ' '.join(COMMENT_PATTERN.sub('', rule).split())
+
+
+def specificity(selector):
+    """Approximate (ids, classes/attributes/pseudo-classes, types) specificity."""
+    selector = re.sub(r'\[[^\]]*\]', '.attr', selector.strip())
+    ids = len(re.findall(r'#[\w-]+', selector))
+    pseudo_elements = len(PSEUDO_ELEMENT_PATTERN.findall(selector))
+    classes = len(re.findall(r'\.[\w-]+|:(?!:)[\w-]+', selector)) - pseudo_elements
+    types = len(re.findall(r'(?:^|[\s>+~])([a-zA-Z][\w-]*)', selector)) + pseudo_elements
+    return (ids, classes, types)
+
+
+def _compound_key(selector):
+    """Reduce the subject (rightmost compound) of a selector to (tag, id, pseudo-element)."""
+    subject = re.split(r'\s*[>+~]\s*|\s+', selector.strip())[-1]
+    pseudo = PSEUDO_ELEMENT_PATTERN.search(subject)
+    pseudo_element = (pseudo.group(1) or pseudo.group(2)) if pseudo else ''
+    subject = subject.replace(':root', 'html')
+    tag = re.match(r'[a-zA-Z][\w-]*', subject)
+    element_id = re.search(r'#([\w-]+)', subject)
+    return (
+        tag.group(0).lower() if tag else '',
+        element_id.group(1) if element_id else '',
+        pseudo_element,
+    )
+
+
+def may_match_same_element(a, b):
+    """Conservatively decide whether two subject compounds can select the same box."""
+    (tag_a, id_a, pseudo_a), (tag_b, id_b, pseudo_b) = a, b
+    if tag_a and tag_b and tag_a != tag_b:
+        return False
+    if id_a and id_b and id_a != id_b:
+        return False
+    return pseudo_a == pseudo_b
+
+
+def rule_targets(rule):
+    """List (subject compound, specificity, property families) triples for a rule.
+
+    Nested @media/@supports blocks contribute their inner rules; other
+    at-rules (@keyframes, @font-face, ...) are keyed by their prelude.
+    """
+    text = COMMENT_PATTERN.sub('', rule).strip()
+    if '{' not in text:
+        return [(('@', text, ''), None, {text})]
+    prelude, body = text.split('{', 1)
+    prelude = ' '.join(prelude.split())
+    if prelude.startswith(('@media', '@supports')):
+        targets = []
+        for inner in split_rules(body.rsplit('}', 1)[0])[0]:
+            targets.extend(rule_targets(inner))
+        return targets
+    if prelude.startswith('@'):
+        return [(('@', prelude, ''), None, {prelude})]
+    props = {property_family(name) for name in declared_properties(text)}
+    return [(_compound_key(selector), specificity(selector), props) for selector in prelude.split(',')]
+
+
+def property_family(name):
+    """Name shared by a property, its shorthand and the shorthand's other longhands.
+
+    Deliberately coarse (text-align and text-decoration share 'text'): two
+    properties of one family are always treated as overlapping, which only
+    ever makes conflict detection more cautious. 'all' resets everything.
+    """
+    if name.startswith('--'):
+        return name
+    name = VENDOR_PREFIX_PATTERN.sub('', name.lower())
+    if name == 'all':
+        return '*'
+    return SHORTHAND_FAMILIES.get(name, name.split('-', 1)[0])
+
+
+def rules_conflict(a_targets, b_targets):
+    """True if swapping the two rules could change the computed style of any element."""
+    for key_a, spec_a, props_a in a_targets:
+        for key_b, spec_b, props_b in b_targets:
+            if not props_a & props_b and '*' not in props_a | props_b:
+                continue
+            if '@' in (key_a[0], key_b[0]):
+                if key_a == key_b:
+                    return True
+            elif spec_a == spec_b and may_match_same_element(key_a, key_b):
+                # With different specificity the winner does not depend on order
+                return True
+    return False
+
+
+def declared_properties(rule):
+    """Property names (including custom properties) declared anywhere in a rule."""
+    text = COMMENT_PATTERN.sub('', rule)
+    body = text[text.find('{'):] if '{' in text else ''
+    return set(PROPERTY_PATTERN.findall(body))
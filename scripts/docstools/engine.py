@@ -0,0 +1,514 @@
+"""
+Single-pass rewrite engine for the static documentation trees.
+
+Transforms register themselves with @transform and run as an ordered
+pipeline over each page's content in memory, so every page is read once
+and written at most once no matter how many transforms are selected.
+
+Runs stream: pages are discovered lazily, each one is read, transformed
+and written by whichever worker picks it up, and results are reported as
+they arrive. Only a bounded number of pages is in flight at any time, so
+memory stays flat however large the tree is.
+"""
+
+import argparse
+import difflib
+import hashlib
+import itertools
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from functools import partial
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+# docs/ is deployed and is the single source of truth; the copy bundled with
+# the Vite client is a generated mirror (see sync.py)
+CANONICAL_DOCS_DIR = REPO_ROOT / 'docs'
+MIRROR_DOCS_DIRS = [REPO_ROOT / 'client' / 'public' / 'docs']
+ALL_DOCS_DIRS = [CANONICAL_DOCS_DIR] + MIRROR_DOCS_DIRS
+
+# Transforms only run on the canonical tree; mirrors are synced afterwards
+DOCS_DIRS = [CANONICAL_DOCS_DIR]
+
+TRANSFORMS = {}
+
+# How run() treats pages the pipeline would change
+WRITE_MODES = ('write', 'dry-run', 'check')
+
+# Work handed to a process pool goes in batches of BATCH_SIZE items, with at
+# most QUEUE_DEPTH batches per worker queued or running at once
+BATCH_SIZE = 8
+QUEUE_DEPTH = 2
+
+
+@dataclass(frozen=True)
+class Transform:
+    """A named content rewrite: func(content, path) -> new content."""
+    name: str
+    func: object
+    order: int
+    description: str = ''
+    default: bool = True
+    version: int = 1
+    inputs: tuple = ()  # shared files the output depends on (e.g. sidebar.json)
+    stamp: str = ''     # version plus input hashes, filled in by get_pipeline()
+
+
+@dataclass
+class FileResult:
+    """Outcome of running a pipeline over one page."""
+    path: Path
+    status: str  # 'updated', 'unchanged', 'skipped' or 'error'
+    applied: list = field(default_factory=list)
+    error: str = None
+    entry: dict = None  # manifest entry to store, when caching
+    delta: int = 0      # size change in bytes
+    diff: str = ''      # unified diff, in dry-run mode
+    trace: dict = None  # timings, sizes and skip reason, when tracing (see trace.py)
+
+
+def transform(name, order, default=True, version=1, inputs=()):
+    """Register a function as a named transform in the global pipeline.
+
+    Bump version whenever the transform's output changes so cached pages
+    are reprocessed. Files listed in inputs are hashed into the cache stamp,
+    so editing one reprocesses every page the transform touches.
+    """
+    def register(func):
+        if name in TRANSFORMS:
+            raise ValueError(f"Transform already registered: {name}")
+        doc = (func.__doc__ or '').strip()
+        TRANSFORMS[name] = Transform(
+            name=name,
+            func=func,
+            order=order,
+            description=doc.splitlines()[0] if doc else '',
+            default=default,
+            version=version,
+            inputs=tuple(Path(p) for p in inputs),
+        )
+        return func
+    return register
+
+
+def get_pipeline(names=None):
+    """Resolve transform names to an ordered pipeline (defaults when None)."""
+    if names is None:
+        selected = [t for t in TRANSFORMS.values() if t.default]
+    else:
+        unknown = [name for name in names if name not in TRANSFORMS]
+        if unknown:
+            raise ValueError(f"Unknown transform(s): {', '.join(unknown)}")
+        selected = [TRANSFORMS[name] for name in dict.fromkeys(names)]
+    return sorted((stamped(t) for t in selected), key=lambda t: (t.order, t.name))
+
+
+def stamped(t):
+    """Copy of a transform with its cache stamp computed from version and inputs."""
+    stamp = str(t.version)
+    for path in t.inputs:
+        try:
+            stamp += '+' + content_hash(path.read_bytes())[:12]
+        except OSError:
+            stamp += '+missing'
+    return replace(t, stamp=stamp)
+
+
+def iter_html_files(docs_dirs=None):
+    """Yield every HTML page under the given docs directories as it is found.
+
+    Each directory is listed only when the walk reaches it (files first,
+    then subdirectories, both sorted), so processing can start on the first
+    page while the rest of the tree is still unread.
+    """
+    for docs_dir in docs_dirs or DOCS_DIRS:
+        docs_dir = Path(docs_dir)
+        if not docs_dir.exists():
+            print(f"⚠ Directory not found: {docs_dir}")
+            continue
+        for dirpath, dirnames, filenames in os.walk(docs_dir):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                if filename.endswith('.html'):
+                    yield Path(dirpath) / filename
+
+
+def content_hash(data):
+    """Hash raw page bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def atomic_write(path, data):
+    """Replace path with data via a temp file and rename, so an interrupted
+    run never leaves a truncated page behind. data is bytes or an iterable
+    of byte chunks, which are streamed to disk as they are produced."""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, 'wb') as f:
+            if isinstance(data, (bytes, bytearray)):
+                f.write(data)
+            else:
+                for chunk in data:
+                    f.write(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            os.chmod(tmp, path.stat().st_mode & 0o7777)
+        except FileNotFoundError:
+            pass
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+def unified_diff(path, before, after):
+    """Unified diff between two versions of a page."""
+    name = display_path(path).as_posix().lstrip('/')
+    return ''.join(difflib.unified_diff(
+        before.splitlines(keepends=True),
+        after.splitlines(keepends=True),
+        fromfile=f"a/{name}",
+        tofile=f"b/{name}",
+    ))
+
+
+# Shared inputs read while transforming the current page; a set only while
+# a caller (watch mode) is tracking dependencies
+_inputs_read = None
+
+
+def record_input(path):
+    """Note that the page being transformed depends on a shared input file."""
+    if _inputs_read is not None:
+        _inputs_read.add(Path(path).resolve())
+
+
+@contextmanager
+def track_inputs():
+    """Collect every shared input recorded inside the block into a set."""
+    global _inputs_read
+    previous, _inputs_read = _inputs_read, set()
+    try:
+        yield _inputs_read
+    finally:
+        _inputs_read = previous
+
+
+# Edits spliced by the running transform; a list only while tracing
+_matches = None
+
+
+def record_matches(count):
+    """Note that the running transform made count edits."""
+    if _matches is not None:
+        _matches.append(count)
+
+
+def apply_pipeline(content, path, pipeline, spans=None):
+    """Run every transform over content in memory; return (content, applied names).
+
+    When spans is a list, one timing record per transform is appended to it.
+    """
+    global _matches
+    applied = []
+    for t in pipeline:
+        if spans is None:
+            updated = t.func(content, path)
+        else:
+            _matches, start = [], time.perf_counter()
+            try:
+                updated = t.func(content, path)
+            finally:
+                matches, _matches = sum(_matches), None
+            spans.append({
+                'transform': t.name,
+                'start': start,
+                'seconds': time.perf_counter() - start,
+                'bytes_in': len(content.encode('utf-8')),
+                'bytes_out': len(updated.encode('utf-8')),
+                'matches': matches,
+                'changed': updated != content,
+            })
+        if updated != content:
+            applied.append(t.name)
+            content = updated
+    return content, applied
+
+
+def process_file(path, pipeline, use_cache=False, entry=None, mode='write', trace=False):
+    """Read a page once, run the pipeline, and write it back only if it changed.
+
+    With use_cache, pages whose content and applied transform stamps match
+    their manifest entry are skipped without running any transform, and the
+    result carries the entry to store for the next run. In 'dry-run' and
+    'check' modes nothing is written; dry-run also records a unified diff.
+    With trace, the result also carries timings, sizes and the reason a
+    page was skipped (see trace.py).
+    """
+    from .cache import is_fresh_hash, is_fresh_stat, make_entry
+
+    started = time.perf_counter()
+    spans = [] if trace else None
+
+    def done(result, **details):
+        if trace:
+            result.trace = dict(details, pid=os.getpid(), start=started,
+                                seconds=time.perf_counter() - started, transforms=spans)
+        return result
+
+    try:
+        if use_cache:
+            stat = path.stat()
+            if is_fresh_stat(entry, stat, pipeline):
+                return done(FileResult(path, 'skipped', entry=entry), reason='stat')
+
+        data = path.read_bytes()
+        if use_cache:
+            digest = content_hash(data)
+            if is_fresh_hash(entry, digest, pipeline):
+                return done(FileResult(path, 'skipped',
+                                       entry=make_entry(entry, digest, stat, pipeline, changed=False)),
+                            reason='hash', bytes_in=len(data))
+
+        content = data.decode('utf-8')
+        updated, applied = apply_pipeline(content, path, pipeline, spans)
+        if updated == content:
+            result = FileResult(path, 'unchanged')
+            if use_cache:
+                result.entry = make_entry(entry, content_hash(data), stat, pipeline, changed=False)
+            return done(result, bytes_in=len(data), bytes_out=len(data))
+
+        new_data = updated.encode('utf-8')
+        result = FileResult(path, 'updated', applied, delta=len(new_data) - len(data))
+        if mode == 'dry-run':
+            result.diff = unified_diff(path, content, updated)
+        elif mode == 'write':
+            atomic_write(path, new_data)
+            if use_cache:
+                result.entry = make_entry(entry, content_hash(new_data), path.stat(), pipeline, changed=True)
+        return done(result, bytes_in=len(data), bytes_out=len(new_data))
+    except Exception as e:
+        return done(FileResult(path, 'error', error=f"{type(e).__name__}: {e}"))
+
+
+def _process_job(job):
+    return process_file(*job)
+
+
+def default_jobs():
+    """Number of worker processes to use when --jobs is not given."""
+    return os.cpu_count() or 1
+
+
+def _batches(items, size):
+    items = iter(items)
+    while batch := list(itertools.islice(items, size)):
+        yield batch
+
+
+def _run_batch(func, batch):
+    return [func(item) for item in batch]
+
+
+def bounded_map(func, items, jobs=1, batch_size=BATCH_SIZE, depth=QUEUE_DEPTH):
+    """Yield func(item) for every item, in input order, consuming items lazily.
+
+    With jobs > 1, items go to a process pool in batches and at most
+    jobs * depth batches are queued or running at once. The next batch is
+    only pulled from items when the oldest one is collected for the
+    consumer, so a slow consumer holds back discovery instead of letting
+    finished work pile up. Unlike Executor.map, which submits its whole
+    input up front, memory does not grow with the number of items. func
+    must be picklable (a module-level function).
+    """
+    if jobs <= 1:
+        for item in items:
+            yield func(item)
+        return
+    batches = _batches(items, batch_size)
+    run_batch = partial(_run_batch, func)
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        pending = deque(pool.submit(run_batch, batch) for batch in itertools.islice(batches, jobs * depth))
+        while pending:
+            done = pending.popleft().result()
+            for batch in itertools.islice(batches, 1):
+                pending.append(pool.submit(run_batch, batch))
+            yield from done
+
+
+def iter_results(pipeline, files, manifest=None, jobs=1, mode='write', trace=False):
+    """Stream files through the pipeline, yielding FileResults in input order as pages finish.
+
+    files may be any iterable (typically iter_html_files()); it is consumed
+    as work is scheduled, never materialized. With jobs > 1 pages are spread
+    over a process pool through bounded_map(); results still come back in
+    input order so reports are deterministic. In 'write' mode manifest
+    entries are stored as results arrive and the manifest is saved once the
+    last page is done; 'check' and 'dry-run' only read it.
+    With trace, every result carries its timing record.
+    """
+    if mode not in WRITE_MODES:
+        raise ValueError(f"Unknown mode: {mode}")
+    use_cache = manifest is not None
+    record = use_cache and mode == 'write'
+    jobs_iter = (
+        (path, pipeline, use_cache, manifest.get(path) if use_cache else None, mode, trace)
+        for path in map(Path, files)
+    )
+
+    def stream():
+        for result in bounded_map(_process_job, jobs_iter, jobs):
+            if record and result.status != 'error':
+                manifest.put(result.path, result.entry)
+            yield result
+        if record:
+            manifest.save()
+    return stream()
+
+
+def run(pipeline, files, manifest=None, jobs=1, mode='write', trace=False):
+    """Process files through the pipeline and return their FileResults in input order.
+
+    The list form of iter_results(), for callers that need every result at once.
+    """
+    return list(iter_results(pipeline, files, manifest, jobs, mode, trace))
+
+
+def display_path(path):
+    """Show paths relative to the repository root when possible."""
+    try:
+        return path.resolve().relative_to(REPO_ROOT)
+    except ValueError:
+        return path
+
+
+def format_delta(delta):
+    return f"{delta:+,} bytes"
+
+
+def report(results, mode='write'):
+    """Print per-file status lines and a summary; return the status counts.
+
+    results may be a stream: each line is printed as its result arrives and
+    only counts and failures are kept.
+    """
+    counts = {'updated': 0, 'unchanged': 0, 'skipped': 0, 'error': 0, 'total': 0}
+    errors = []
+    delta = 0
+    for result in results:
+        counts[result.status] += 1
+        counts['total'] += 1
+        delta += result.delta
+        if result.status == 'updated':
+            name = display_path(result.path)
+            if mode == 'write':
+                print(f"✓ Updated: {name} ({', '.join(result.applied)}, {format_delta(result.delta)})")
+            else:
+                if result.diff:
+                    print(result.diff, end='' if result.diff.endswith('\n') else '\n')
+                marker = '✗ Out of date' if mode == 'check' else '~ Would update'
+                print(f"{marker}: {name} ({', '.join(result.applied)}, {format_delta(result.delta)})")
+        elif result.status == 'error':
+            errors.append(result)
+
+    if errors:
+        print(f"\n✗ {len(errors)} file(s) failed:")
+        for result in errors:
+            print(f"  {display_path(result.path)}: {result.error}")
+    print(f"\n{'='*60}")
+    print(f"Total files processed: {counts['total']}")
+    if mode == 'write':
+        print(f"Files updated: {counts['updated']}")
+    else:
+        print(f"Files out of date: {counts['updated']}")
+        print(f"Total size change: {format_delta(delta)}")
+    if counts['skipped']:
+        print(f"Files skipped (cached): {counts['skipped']}")
+    if counts['error']:
+        print(f"Errors: {counts['error']}")
+    print(f"{'='*60}")
+    return counts
+
+
+def _keep(results, kept):
+    # Pass a stream through while keeping its results (traces need them afterwards)
+    for result in results:
+        kept.append(result)
+        yield result
+
+
+def add_run_arguments(parser):
+    """Add the options every transform script shares: caching, mirror sync, write mode and jobs."""
+    parser.add_argument('--no-cache', action='store_true',
+                        help='ignore the .docs-cache manifest and process every page')
+    parser.add_argument('--no-sync', action='store_true',
+                        help='do not refresh client/public/docs/ from docs/ afterwards')
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--dry-run', action='store_const', const='dry-run', dest='mode',
+                      help='print a unified diff and byte deltas without writing anything')
+    mode.add_argument('--check', action='store_const', const='check', dest='mode',
+                      help='exit 1 if any page (or the mirror) is out of date; writes nothing')
+    parser.add_argument('-j', '--jobs', type=int, default=None, metavar='N',
+                        help='worker processes (default: CPU count, 1 = serial)')
+
+
+def transform_main(names, doc):
+    """Entry point of the scripts that run fixed transforms; returns an exit code."""
+    parser = argparse.ArgumentParser(description=doc.strip().splitlines()[0])
+    add_run_arguments(parser)
+    args = parser.parse_args()
+    if args.jobs is not None and args.jobs < 1:
+        parser.error('--jobs must be at least 1')
+    return run_transforms(names, use_cache=not args.no_cache, jobs=args.jobs,
+                          sync=not args.no_sync, mode=args.mode or 'write')
+
+
+def run_transforms(names=None, docs_dirs=None, use_cache=True, jobs=None, sync=True, mode='write',
+                   trace=None, trace_format='jsonl', profile=None, profile_path=None):
+    """Run the named transforms over the docs trees and report; returns an exit code.
+
+    Without explicit docs_dirs the canonical tree is transformed and the
+    mirrors are then synced from it, unless sync is False. In 'dry-run' and
+    'check' modes nothing is written and mirror drift is only reported;
+    'check' returns 1 when any page or mirror is out of date.
+
+    trace names a file to write per-page and per-transform timings to, as
+    JSON Lines or a Chrome trace (trace_format); profile runs the pages
+    under 'cprofile' or the 'sample' profiler (see trace.py).
+    """
+    from .cache import Manifest
+    from .sync import print_sync_report, sync_mirrors
+    from .trace import print_trace_summary, profile_jobs, profiling, write_trace
+
+    pipeline = get_pipeline(names)
+    print(f"Pipeline: {' → '.join(t.name for t in pipeline) or '(empty)'}")
+    manifest = Manifest() if use_cache else None
+    jobs = profile_jobs(profile, jobs or default_jobs())
+    traced = []
+    with profiling(profile, profile_path):
+        results = iter_results(pipeline, iter_html_files(docs_dirs), manifest, jobs, mode,
+                               trace=trace is not None)
+        if trace is not None:
+            results = _keep(results, traced)
+        counts = report(results, mode)
+    if trace is not None:
+        print_trace_summary(traced)
+        write_trace(traced, trace, trace_format)
+        print(f"  written to {trace} ({trace_format})")
+
+    sync_failed = False
+    stale = mode == 'check' and counts['updated'] > 0
+    if sync and docs_dirs is None:
+        for sync_report in sync_mirrors(check=mode != 'write'):
+            print_sync_report(sync_report, check=mode != 'write')
+            sync_failed = sync_failed or bool(sync_report.errors)
+            stale = stale or (mode == 'check' and sync_report.drift)
+    if stale:
+        print("\n✗ Docs are out of date; re-run without --check to update them")
+    return 1 if counts['error'] or sync_failed or stale else 0
@@ -0,0 +1,213 @@
+"""
+Give static assets content-hashed copies so they can be cached forever.
+
+Runs on the staged site (after staging and minifying, before
+precompressing). Every file matched by the "fingerprint" globs of
+scripts/site-manifest.json gets a copy named name.<hash>.ext, where hash
+is the first ten hex digits of the SHA-256 of its final content, and every
+reference to it in the site's HTML, CSS, JS and JSON files is rewritten,
+whether absolute (/docs/theme-styles.css) or relative to the referencing
+file (logo-transparent-dark.svg). Assets that reference other assets are
+rewritten before they are hashed, so a changed logo also re-hashes the
+stylesheet that points at it.
+
+The original file stays where it was, untouched, so anything still asking
+for the plain name (a page cached before the deploy, a URL built at run
+time) keeps working.
+
+The mapping is written to asset-manifest.json at the site root:
+
+    {"format": 1, "assets": {"/docs/theme-styles.css": "/docs/theme-styles.3f9a0c12de.css", ...}}
+
+Anything whose name matches name.<hash>.ext can be served with
+Cache-Control: public, max-age=31536000, immutable. Files that already
+carry a hash (the icon sprite) are left alone, and a second run over the
+same site finds every copy already in place and writes nothing.
+"""
+
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from graphlib import CycleError, TopologicalSorter
+from pathlib import Path
+from urllib.parse import urljoin
+
+from .compress import SITE_DIR
+from .engine import atomic_write, content_hash
+
+ASSET_MANIFEST = 'asset-manifest.json'
+ASSET_MANIFEST_FORMAT = 1
+HASH_LENGTH = 10
+HASHED_NAME = re.compile(r'\.[0-9a-f]{%d}\.[^.]+$' % HASH_LENGTH)
+REFERRING_SUFFIXES = {'.html', '.css', '.js', '.json', '.webmanifest'}
+COMPRESSED_SUFFIXES = ('.gz', '.br')
+
+
+@dataclass
+class FingerprintReport:
+    root: Path
+    assets: dict = field(default_factory=dict)     # original URL -> fingerprinted URL
+    copied: list = field(default_factory=list)     # (original URL, fingerprinted URL) written this run
+    rewritten: list = field(default_factory=list)  # files whose references changed
+    references: int = 0
+    unmatched: list = field(default_factory=list)  # globs that matched nothing
+
+
+def site_url(root, path):
+    return '/' + path.relative_to(root).as_posix()
+
+
+def fingerprinted_name(path, data):
+    return f"{path.stem}.{content_hash(data)[:HASH_LENGTH]}{path.suffix}"
+
+
+def load_asset_manifest(root):
+    try:
+        data = json.loads((Path(root) / ASSET_MANIFEST).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    return data.get('assets', {}) if data.get('format') == ASSET_MANIFEST_FORMAT else {}
+
+
+def find_assets(root, patterns):
+    """{site URL: path} for files matching the globs that are not fingerprinted yet;
+    also returns the globs that matched nothing at all."""
+    assets, unmatched = {}, []
+    for pattern in patterns:
+        matches = sorted(path for path in root.glob(pattern) if path.is_file())
+        if not matches:
+            unmatched.append(pattern)
+        for path in matches:
+            if not HASHED_NAME.search(path.name):
+                assets[site_url(root, path)] = path
+    return assets, unmatched
+
+
+def reference_pattern(urls):
+    """Quoted or url()-wrapped values that end in one of the assets' file names."""
+    names = sorted({url.rsplit('/', 1)[1] for url in urls}, key=len, reverse=True)
+    alternatives = '|'.join(re.escape(name) for name in names)
+    return re.compile(r'''(?<=["'(=])((?:[^"'()\s<>=]*/)?(?:%s))(?=[?#"')\s>])''' % alternatives)
+
+
+def rewrite_references(text, base_url, mapping, pattern):
+    """Point every reference in text that resolves to a key of mapping at its value;
+    returns (text, number of references rewritten)."""
+    count = 0
+
+    def replace(match):
+        nonlocal count
+        ref = match.group(1)
+        target = mapping.get(urljoin(base_url, ref))
+        if target is None:
+            return ref
+        count += 1
+        if ref.startswith('/'):
+            return target
+        # Keep relative references relative: only the file name changes
+        return ref[:len(ref) - len(ref.rsplit('/', 1)[-1])] + target.rsplit('/', 1)[1]
+
+    return pattern.sub(replace, text), count
+
+
+def _same_bytes(path, data):
+    try:
+        return path.read_bytes() == data
+    except FileNotFoundError:
+        return False
+
+
+def _remove_compressed(path):
+    for suffix in COMPRESSED_SUFFIXES:
+        try:
+            path.with_name(path.name + suffix).unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _asset_order(assets, pattern):
+    # Assets that reference other assets are hashed after them
+    graph = {}
+    for url, path in assets.items():
+        deps = set()
+        if path.suffix.lower() in REFERRING_SUFFIXES:
+            text = path.read_text(encoding='utf-8')
+            deps = {urljoin(url, ref) for ref in pattern.findall(text)} & set(assets) - {url}
+        graph[url] = deps
+    try:
+        return list(TopologicalSorter(graph).static_order())
+    except CycleError as e:
+        raise ValueError(f"Assets reference each other in a cycle: {' -> '.join(e.args[1])}") from None
+
+
+def fingerprint_site(root=SITE_DIR, patterns=(), dry_run=False):
+    """Copy the matching assets under root to hashed names and rewrite references; returns a FingerprintReport."""
+    root = Path(root)
+    report = FingerprintReport(root)
+    report.assets = {url: target for url, target in load_asset_manifest(root).items()
+                     if (root / target.lstrip('/')).exists()}
+    assets, report.unmatched = find_assets(root, patterns)
+    if not assets:
+        return report
+
+    pattern = reference_pattern(assets)
+    mapping = {}
+    for url in _asset_order(assets, pattern):
+        path = assets[url]
+        data = path.read_bytes()
+        if path.suffix.lower() in REFERRING_SUFFIXES:
+            text, count = rewrite_references(data.decode('utf-8'), url, mapping, pattern)
+            data = text.encode('utf-8')
+            report.references += count
+        target = path.with_name(fingerprinted_name(path, data))
+        mapping[url] = site_url(root, target)
+        if _same_bytes(target, data):
+            continue
+        report.copied.append((url, mapping[url]))
+        if not dry_run:
+            # A new file, so a hardlink into the source tree is never modified
+            atomic_write(target, data)
+    report.assets.update(mapping)
+
+    # Originals keep their content; only the hashed copies point at hashed names
+    skipped = set(mapping.values()) | set(assets)
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            path = Path(dirpath) / filename
+            if (path.suffix.lower() not in REFERRING_SUFFIXES or filename == ASSET_MANIFEST
+                    or site_url(root, path) in skipped):
+                continue
+            text = path.read_text(encoding='utf-8', errors='surrogateescape')
+            updated, count = rewrite_references(text, site_url(root, path), mapping, pattern)
+            if not count:
+                continue
+            report.references += count
+            report.rewritten.append(path)
+            if not dry_run:
+                atomic_write(path, updated.encode('utf-8', errors='surrogateescape'))
+                _remove_compressed(path)
+
+    data = {'format': ASSET_MANIFEST_FORMAT, 'assets': dict(sorted(report.assets.items()))}
+    data = json.dumps(data, indent=1).encode('utf-8')
+    if not dry_run and not _same_bytes(root / ASSET_MANIFEST, data):
+        atomic_write(root / ASSET_MANIFEST, data)
+    return report
+
+
+def print_fingerprint_report(report, verbose=False, dry_run=False):
+    prefix = 'would copy' if dry_run else 'Copied'
+    for original, target in report.copied:
+        print(f"✓ {prefix}: {original} → {target.rsplit('/', 1)[1]}")
+    if verbose:
+        for path in report.rewritten:
+            print(f"  ✓ {'would rewrite' if dry_run else 'Rewrote'}: {path.relative_to(report.root)}")
+    for pattern in report.unmatched:
+        print(f"⚠ {pattern} matched no files")
+    print(f"\n{'='*60}")
+    print(f"Assets fingerprinted: {len(report.assets)} ({len(report.copied)} written this run)")
+    print(f"References rewritten: {report.references} in {len(report.rewritten)} file(s)")
+    if not dry_run and report.assets:
+        print(f"Manifest: {report.root / ASSET_MANIFEST}")
+    print(f"{'='*60}")
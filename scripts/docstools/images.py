@@ -0,0 +1,329 @@
+"""
+Optimize the PNGs served with the site and build responsive variants.
+
+Every PNG under docs/ and client/public/ (the generated docs mirror
+excluded) is recompressed losslessly and kept only when smaller and
+pixel-identical. Screenshots (any assets/screenshots/ directory) also get
+WebP and AVIF variants at several widths, named <stem>-<width>w.<ext>
+next to the source, which the 'picture' transform turns into <picture>
+markup. Results are cached by content hash in .docs-cache/images.json,
+so unchanged images cost one stat on the next run.
+
+Pillow is only needed here, not by the rest of docstools.
+"""
+
+import io
+import json
+import re
+import struct
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+
+from .cache import CACHE_DIR, cache_key
+from .engine import (
+    CANONICAL_DOCS_DIR,
+    MIRROR_DOCS_DIRS,
+    REPO_ROOT,
+    atomic_write,
+    bounded_map,
+    content_hash,
+    display_path,
+    record_input,
+)
+
+PUBLIC_DIR = REPO_ROOT / 'client' / 'public'
+IMAGE_ROOTS = [CANONICAL_DOCS_DIR, PUBLIC_DIR]
+IMAGES_MANIFEST = CACHE_DIR / 'images.json'
+IMAGES_FORMAT = 1
+
+RESPONSIVE_DIR = 'screenshots'
+RESPONSIVE_WIDTHS = (640, 1280, 1920, 2560)
+VARIANT_FORMATS = {
+    # extension: (Pillow format, encoder options)
+    'avif': ('AVIF', {'quality': 60, 'speed': 6}),
+    'webp': ('WEBP', {'quality': 82, 'method': 6}),
+}
+VARIANT_PATTERN = re.compile(r'-(\d+)w$')
+# Docs content is at most ~960px wide
+PICTURE_SIZES = '(max-width: 960px) 100vw, 960px'
+
+# Bump when encoder settings change so every image is reprocessed
+IMAGES_VERSION = 1
+
+
+@dataclass
+class ImageResult:
+    """Outcome of optimizing one PNG."""
+    path: Path
+    status: str  # 'optimized', 'unchanged', 'skipped' or 'error'
+    before: int = 0
+    after: int = 0
+    variants: list = field(default_factory=list)  # (path, bytes) pairs written
+    error: str = None
+    entry: dict = None
+
+
+def iter_pngs(roots=None):
+    """Yield every source PNG under the image roots, skipping mirrors and variants."""
+    mirrors = [mirror.resolve() for mirror in MIRROR_DOCS_DIRS]
+    for root in roots or IMAGE_ROOTS:
+        for path in sorted(Path(root).rglob('*.png')):
+            resolved = path.resolve()
+            if any(resolved.is_relative_to(mirror) for mirror in mirrors):
+                continue
+            if VARIANT_PATTERN.search(path.stem):
+                continue
+            yield path
+
+
+def is_responsive(path):
+    return path.parent.name == RESPONSIVE_DIR
+
+
+def available_formats():
+    """Variant extensions the installed Pillow can encode."""
+    from PIL import features
+    return [ext for ext, (fmt, _) in VARIANT_FORMATS.items() if features.check(fmt.lower())]
+
+
+def variant_widths(width):
+    """Responsive widths for an image: the standard ones below its own width, then its width."""
+    return [w for w in RESPONSIVE_WIDTHS if w < width] + [width]
+
+
+def variant_path(path, width, ext):
+    return path.with_name(f"{path.stem}-{width}w.{ext}")
+
+
+def find_variants(path):
+    """{ext: [(width, variant path), ...]} for variants of path that exist on disk."""
+    record_input(path)
+    try:
+        mtime_ns = path.parent.stat().st_mtime_ns
+    except FileNotFoundError:
+        return {}
+    return _find_variants(path, mtime_ns)
+
+
+@lru_cache(maxsize=256)
+def _find_variants(path, dir_mtime_ns):
+    variants = {}
+    for ext in VARIANT_FORMATS:
+        found = []
+        for candidate in path.parent.glob(f"{path.stem}-*w.{ext}"):
+            match = VARIANT_PATTERN.search(candidate.stem)
+            if match and candidate.stem[:match.start()] == path.stem:
+                found.append((int(match.group(1)), candidate))
+        if found:
+            variants[ext] = sorted(found)
+    return variants
+
+
+def png_size(path):
+    """(width, height) from a PNG's IHDR chunk, without decoding it."""
+    with open(path, 'rb') as f:
+        header = f.read(24)
+    if header[:8] != b'\x89PNG\r\n\x1a\n' or header[12:16] != b'IHDR':
+        raise ValueError(f"Not a PNG: {path}")
+    return struct.unpack('>II', header[16:24])
+
+
+def recompress_png(data):
+    """Losslessly re-encode PNG bytes; returns the smaller of the two encodings."""
+    from PIL import Image, ImageChops
+
+    with Image.open(io.BytesIO(data)) as image:
+        image.load()
+        options = {'optimize': True}
+        for key in ('icc_profile', 'transparency', 'dpi'):
+            if key in image.info:
+                options[key] = image.info[key]
+        buffer = io.BytesIO()
+        image.save(buffer, 'PNG', **options)
+        candidate = buffer.getvalue()
+        if len(candidate) >= len(data):
+            return data
+        # Only accept the new encoding when it decodes to exactly the same pixels
+        with Image.open(io.BytesIO(candidate)) as check:
+            check.load()
+            same = (check.mode == image.mode and check.size == image.size
+                    and ImageChops.difference(check.convert('RGBA'), image.convert('RGBA')).getbbox() is None)
+        return candidate if same else data
+
+
+def encode_variants(path, data, formats):
+    """Write resized WebP/AVIF variants of a screenshot; returns [(path, bytes)]."""
+    from PIL import Image
+
+    written = []
+    with Image.open(io.BytesIO(data)) as image:
+        image.load()
+        icc_profile = image.info.get('icc_profile')
+        for width in variant_widths(image.width):
+            height = round(image.height * width / image.width)
+            resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+            for ext in formats:
+                fmt, options = VARIANT_FORMATS[ext]
+                buffer = io.BytesIO()
+                extra = {'icc_profile': icc_profile} if icc_profile else {}
+                resized.save(buffer, fmt, **options, **extra)
+                target = variant_path(path, width, ext)
+                atomic_write(target, buffer.getvalue())
+                written.append((target, len(buffer.getvalue())))
+    return written
+
+
+def stamp(formats):
+    return f"{IMAGES_VERSION}:{','.join(formats)}:{','.join(map(str, RESPONSIVE_WIDTHS))}"
+
+
+def _current(entry, current_stamp):
+    return (
+        entry is not None
+        and entry.get('stamp') == current_stamp
+        and all((REPO_ROOT / output).exists() for output in entry.get('outputs', []))
+    )
+
+
+def optimize_image(path, formats, entry=None):
+    """Recompress one PNG and, for screenshots, (re)build its variants."""
+    current_stamp = stamp(formats)
+    try:
+        stat = path.stat()
+        if (_current(entry, current_stamp) and entry.get('size') == stat.st_size
+                and entry.get('mtime_ns') == stat.st_mtime_ns):
+            return ImageResult(path, 'skipped', stat.st_size, stat.st_size, entry=entry)
+
+        data = path.read_bytes()
+        digest = content_hash(data)
+        if _current(entry, current_stamp) and entry.get('hash') == digest:
+            # Touched but not modified: refresh the stat fields only
+            return ImageResult(path, 'skipped', len(data), len(data),
+                               entry=dict(entry, size=stat.st_size, mtime_ns=stat.st_mtime_ns))
+
+        optimized = recompress_png(data)
+        if optimized != data:
+            atomic_write(path, optimized)
+        variants = encode_variants(path, optimized, formats) if is_responsive(path) else []
+
+        stat = path.stat()
+        result = ImageResult(path, 'optimized' if optimized != data or variants else 'unchanged',
+                             len(data), len(optimized), variants)
+        result.entry = {
+            'hash': content_hash(optimized),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'stamp': current_stamp,
+            'outputs': [cache_key(variant) for variant, _ in variants],
+        }
+        return result
+    except Exception as e:
+        return ImageResult(path, 'error', error=f"{type(e).__name__}: {e}")
+
+
+def _optimize_job(job):
+    return optimize_image(*job)
+
+
+def load_manifest(path=IMAGES_MANIFEST):
+    try:
+        data = json.loads(Path(path).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    return data.get('images', {}) if data.get('format') == IMAGES_FORMAT else {}
+
+
+def save_manifest(entries, path=IMAGES_MANIFEST):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {'format': IMAGES_FORMAT, 'images': entries}
+    atomic_write(path, json.dumps(data, indent=1, sort_keys=True).encode('utf-8'))
+
+
+def optimize_images(paths=None, jobs=1, use_cache=True, formats=None):
+    """Optimize every PNG (or the given ones), yielding ImageResults in path order
+    as images finish (see bounded_map); the manifest is saved after the last one."""
+    formats = available_formats() if formats is None else formats
+    entries = load_manifest() if use_cache else {}
+    stored = load_manifest()
+    jobs_iter = ((path, formats, entries.get(cache_key(path))) for path in paths or iter_pngs())
+    # One image per task: each is seconds of encoding, so batching would only idle workers
+    for result in bounded_map(_optimize_job, jobs_iter, jobs, batch_size=1):
+        if result.entry is not None:
+            stored[cache_key(result.path)] = result.entry
+        yield result
+    save_manifest(stored)
+
+
+def report_images(results):
+    """Print per-image savings and a summary; returns the status counts."""
+    counts = {'optimized': 0, 'unchanged': 0, 'skipped': 0, 'error': 0}
+    before = after = variant_bytes = 0
+    for result in results:
+        counts[result.status] += 1
+        if result.status == 'error':
+            print(f"✗ Error optimizing {display_path(result.path)}: {result.error}")
+            continue
+        before += result.before
+        after += result.after
+        if result.status == 'optimized':
+            saved = result.before - result.after
+            print(f"✓ {display_path(result.path)}: {result.before:,} → {result.after:,} bytes"
+                  f" (-{saved:,}){f', {len(result.variants)} variants' if result.variants else ''}")
+        for variant, size in result.variants:
+            variant_bytes += size
+            print(f"    {display_path(variant)} ({size:,} bytes)")
+
+    print(f"\n{'='*60}")
+    print(f"Images processed: {sum(counts.values())}")
+    print(f"Images optimized: {counts['optimized']}")
+    if counts['skipped']:
+        print(f"Images skipped (cached): {counts['skipped']}")
+    print(f"PNG bytes: {before:,} → {after:,} (-{before - after:,})")
+    if variant_bytes:
+        print(f"Variant bytes written: {variant_bytes:,}")
+    if counts['error']:
+        print(f"Errors: {counts['error']}")
+    print(f"{'='*60}")
+    return counts
+
+
+def resolve_src(src, page):
+    """Map an <img> src to the file that serves it, or None for external URLs."""
+    src = src.split('?', 1)[0].split('#', 1)[0]
+    if re.match(r'^[a-z][a-z0-9+.-]*:|^//', src, re.IGNORECASE):
+        return None
+    if src.startswith('/docs/'):
+        return CANONICAL_DOCS_DIR / src[len('/docs/'):]
+    if src.startswith('/'):
+        return PUBLIC_DIR / src.lstrip('/')
+    return Path(page).parent / src
+
+
+def _set_attr(tag, name, value):
+    """Add an attribute to an HTML start tag unless it is already present."""
+    if re.search(rf'\s{name}\s*=', tag):
+        return tag
+    end = len(tag) - (2 if tag.endswith('/>') else 1)
+    return f'{tag[:end].rstrip()} {name}="{value}"{tag[end:]}'
+
+
+def picture_markup(img_tag, src, source, indent):
+    """<picture> wrapping img_tag with a <source> per variant format, or None without variants."""
+    variants = find_variants(source)
+    if not variants:
+        return None
+    base = src.rsplit('/', 1)[0] + '/' if '/' in src else ''
+    width, height = png_size(source)
+    img_tag = _set_attr(_set_attr(img_tag, 'width', width), 'height', height)
+    img_tag = _set_attr(_set_attr(img_tag, 'loading', 'lazy'), 'decoding', 'async')
+
+    lines = ['<picture>']
+    for ext in VARIANT_FORMATS:
+        if ext in variants:
+            srcset = ', '.join(f"{base}{path.name} {w}w" for w, path in variants[ext])
+            lines.append(f'{indent}    <source type="image/{ext}" srcset="{srcset}" sizes="{PICTURE_SIZES}">')
+    lines.append(f'{indent}    {img_tag}')
+    lines.append(f'{indent}</picture>')
+    return '\n'.join(lines)
@@ -0,0 +1,366 @@
+"""
+Check that every internal link and asset reference on the site resolves.
+
+The site is modelled as mounts of URL prefixes onto directories: /docs/
+is the docs tree being checked (docs/ or a mirror), everything else is
+client/public/ plus the root files the deploy workflow copies, and
+client-side routes come from client/src/App.tsx and the blog post data.
+One walk of each mount builds the set of servable files; each page is then
+parsed once for its references (href, src, srcset) and anchor ids, and
+every reference from the pages, docs/sidebar.json, the shared partials
+and sitemap.xml is resolved against those sets in a single pass.
+
+Parsed pages are cached by content hash in .docs-cache/links.json, so a
+rerun only re-parses pages that changed.
+"""
+
+import json
+import os
+import posixpath
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+from .cache import CACHE_DIR, cache_key
+from .engine import ALL_DOCS_DIRS, REPO_ROOT, atomic_write, content_hash, display_path
+from .partials import PARTIALS_DIR
+from .regions import parse_attrs
+
+PUBLIC_DIR = REPO_ROOT / 'client' / 'public'
+# Root-level files the deploy workflow copies into the site
+ROOT_FILES = ['CNAME', 'install', 'install.sh', 'install.ps1', 'docs.html', 'sitemap.xml', 'robots.txt']
+APP_ROUTES = REPO_ROOT / 'client' / 'src' / 'App.tsx'
+BLOG_POSTS = REPO_ROOT / 'client' / 'src' / 'data' / 'blogPosts.ts'
+SITEMAPS = [REPO_ROOT / 'sitemap.xml', PUBLIC_DIR / 'sitemap.xml']
+SITE_HOSTS = ('kubegraf.io', 'www.kubegraf.io')
+LINKS_CACHE = CACHE_DIR / 'links.json'
+# Bump when reference extraction changes so every page is re-parsed
+LINKS_FORMAT = 1
+# Below this many pages to parse, starting worker processes costs more than it saves
+PARALLEL_MIN_PAGES = 64
+
+RAW_TEXT_PATTERN = re.compile(r'<(script|style)\b[^>]*>.*?</\1\s*>|<!--.*?-->', re.DOTALL | re.IGNORECASE)
+REF_TAG_PATTERN = re.compile(r'<(a|area|img|link|script|source|iframe|video|audio|use)\b([^>]*)>', re.IGNORECASE)
+ID_PATTERN = re.compile(r'\s(?:id|name)\s*=\s*["\']([^"\']+)["\']', re.IGNORECASE)
+SVG_ID_PATTERN = re.compile(r'<[\w:-]+\s[^>]*?\bid\s*=\s*["\']([^"\']+)["\']')
+SYMBOL_ID_PATTERN = re.compile(r'<symbol\s[^>]*?\bid\s*=\s*["\']([^"\']+)["\']')
+REF_ATTRS = ('href', 'src', 'srcset', 'xlink:href', 'poster')
+ROUTE_PATTERN = re.compile(r'<Route\s+path="([^"]+)"')
+SLUG_PATTERN = re.compile(r'slug:\s*"([^"]+)"')
+LOC_PATTERN = re.compile(r'<loc>\s*([^<]+?)\s*</loc>')
+IGNORED_SCHEMES = ('mailto:', 'tel:', 'javascript:', 'data:', 'blob:')
+
+
+@dataclass(frozen=True)
+class Reference:
+    """One link or asset reference: where it appears and what it points at."""
+    source: str   # display path of the file containing it
+    line: int
+    url: str
+    base: str     # URL the reference is relative to
+
+
+@dataclass(frozen=True)
+class Broken:
+    """A reference that does not resolve, and why."""
+    ref: Reference
+    reason: str
+
+
+@dataclass
+class LinkReport:
+    """Outcome of one check."""
+    pages: int = 0
+    parsed: int = 0           # pages re-parsed because they changed
+    references: int = 0
+    broken: list = None
+
+
+def _line_of(content, pos, newlines):
+    # newlines is the sorted list of newline offsets in content
+    lo, hi = 0, len(newlines)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if newlines[mid] < pos:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo + 1
+
+
+def parse_page(content):
+    """References and anchor ids of one page: ([(line, url)], [id])."""
+    # Blank out scripts, styles and comments but keep offsets for line numbers
+    markup = RAW_TEXT_PATTERN.sub(lambda m: re.sub(r'[^\n]', ' ', m.group(0)), content)
+    newlines = [m.start() for m in re.finditer('\n', markup)]
+    refs = []
+    for match in REF_TAG_PATTERN.finditer(markup):
+        attrs = parse_attrs(match.group(2))
+        line = _line_of(markup, match.start(), newlines)
+        for name in REF_ATTRS:
+            value = attrs.get(name)
+            if not value:
+                continue
+            if name == 'srcset':
+                refs.extend((line, candidate.split()[0]) for candidate in value.split(',') if candidate.strip())
+            elif not (match.group(1).lower() == 'link' and 'preconnect' in attrs.get('rel', '')):
+                refs.append((line, value.strip()))
+    ids = sorted(set(ID_PATTERN.findall(markup)))
+    return refs, ids
+
+
+def _parse_job(path):
+    try:
+        data = path.read_bytes()
+        refs, ids = parse_page(data.decode('utf-8'))
+        return {'hash': content_hash(data), 'refs': refs, 'ids': ids}
+    except (OSError, UnicodeDecodeError) as e:
+        return {'error': f"{type(e).__name__}: {e}"}
+
+
+def load_cache(path=LINKS_CACHE):
+    try:
+        data = json.loads(Path(path).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    return data.get('pages', {}) if data.get('format') == LINKS_FORMAT else {}
+
+
+def save_cache(pages, path=LINKS_CACHE):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {'format': LINKS_FORMAT, 'pages': pages}
+    atomic_write(path, json.dumps(data, separators=(',', ':'), sort_keys=True).encode('utf-8'))
+
+
+def parse_pages(paths, jobs=1, use_cache=True):
+    """{path: parsed page} for every page, re-parsing only pages whose hash changed."""
+    cached = load_cache() if use_cache else {}
+    parsed, pending = {}, []
+    for path in paths:
+        entry = cached.get(cache_key(path))
+        stat = path.stat()
+        if entry and entry.get('size') == stat.st_size and entry.get('mtime_ns') == stat.st_mtime_ns:
+            parsed[path] = entry
+            continue
+        if entry and entry.get('hash') == content_hash(path.read_bytes()):
+            parsed[path] = dict(entry, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+            continue
+        pending.append(path)
+
+    if jobs > 1 and len(pending) >= PARALLEL_MIN_PAGES:
+        workers = min(jobs, len(pending))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_parse_job, pending, chunksize=max(1, len(pending) // (workers * 4))))
+    else:
+        results = [_parse_job(path) for path in pending]
+    for path, result in zip(pending, results):
+        if 'error' not in result:
+            stat = path.stat()
+            result.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+        parsed[path] = result
+
+    stored = load_cache()
+    for path, entry in parsed.items():
+        if 'error' not in entry:
+            stored[cache_key(path)] = entry
+    save_cache(stored)
+    return parsed, len(pending)
+
+
+def site_files(root, skip=()):
+    """Set of every file under root as a posix path relative to it."""
+    files = set()
+    for dirpath, dirnames, filenames in os.walk(root):
+        rel_dir = Path(dirpath).relative_to(root).as_posix()
+        if rel_dir == '.':
+            dirnames[:] = [name for name in dirnames if name not in skip]
+            rel_dir = ''
+        files.update(f"{rel_dir}/{name}" if rel_dir else name for name in filenames)
+    return files
+
+
+def app_routes(app=APP_ROUTES, blog_posts=BLOG_POSTS):
+    """(exact routes, blog slugs) rendered client-side by the React app."""
+    try:
+        routes = set(ROUTE_PATTERN.findall(Path(app).read_text(encoding='utf-8')))
+    except OSError:
+        routes = set()
+    try:
+        slugs = set(SLUG_PATTERN.findall(Path(blog_posts).read_text(encoding='utf-8')))
+    except OSError:
+        slugs = set()
+    return routes, slugs
+
+
+class Site:
+    """Servable files, client routes and page anchors for one docs tree."""
+
+    def __init__(self, docs_dir, pages):
+        self.docs_dir = Path(docs_dir)
+        self.docs_files = site_files(docs_dir)
+        self.public_files = site_files(PUBLIC_DIR, skip={'docs'})
+        self.public_files.update(name for name in ROOT_FILES if (REPO_ROOT / name).is_file())
+        self.routes, self.slugs = app_routes()
+        self.ids = {}
+        for path, entry in pages.items():
+            try:
+                rel = path.relative_to(self.docs_dir).as_posix()
+            except ValueError:
+                continue
+            self.ids[rel] = set(entry.get('ids', ()))
+        self._svg_ids = {}
+
+    def svg_ids(self, path):
+        """Fragment targets of an SVG: a sprite's <symbol> ids, else every element id."""
+        if path not in self._svg_ids:
+            try:
+                text = path.read_text(encoding='utf-8')
+            except (OSError, UnicodeDecodeError):
+                text = ''
+            self._svg_ids[path] = set(SYMBOL_ID_PATTERN.findall(text) or SVG_ID_PATTERN.findall(text))
+        return self._svg_ids[path]
+
+    def page_url(self, path):
+        return '/docs/' + Path(path).relative_to(self.docs_dir).as_posix()
+
+    def _route_exists(self, path):
+        path = path.rstrip('/') or '/'
+        if path in self.routes:
+            return True
+        if path.startswith('/blog/') and '/blog/:slug' in self.routes:
+            return path[len('/blog/'):] in self.slugs
+        return False
+
+    def resolve(self, url, base):
+        """None when url resolves, else the reason it does not."""
+        if not url or url.lower().startswith(IGNORED_SCHEMES) or '{' in url or '$' in url:
+            return None
+        parts = urlsplit(url)
+        if parts.scheme or parts.netloc:
+            if parts.scheme not in ('', 'http', 'https') or parts.hostname not in SITE_HOSTS:
+                return None  # external
+        path = unquote(parts.path)
+        if not path:
+            path = urlsplit(base).path
+        elif not path.startswith('/'):
+            path = posixpath.normpath(posixpath.join(posixpath.dirname(urlsplit(base).path), path))
+            path += '/' if parts.path.endswith('/') else ''
+
+        if path == '/docs' or path.startswith('/docs/'):
+            files, rel = self.docs_files, path[len('/docs/'):]
+        else:
+            files, rel = self.public_files, path.lstrip('/')
+        target = None
+        for candidate in ([rel + 'index.html'] if rel.endswith('/') or not rel else [rel, rel + '/index.html']):
+            if candidate in files:
+                target = candidate
+                break
+        if target is None:
+            if files is self.public_files and self._route_exists(path):
+                return None
+            return 'missing file'
+        if parts.fragment and files is self.docs_files and target in self.ids:
+            if unquote(parts.fragment) not in self.ids[target]:
+                return f"missing anchor #{parts.fragment}"
+        if parts.fragment and target.lower().endswith('.svg'):
+            root = self.docs_dir if files is self.docs_files else PUBLIC_DIR
+            if unquote(parts.fragment) not in self.svg_ids(root / target):
+                return f"missing symbol #{parts.fragment}"
+        return None
+
+
+def sidebar_refs(docs_dir):
+    path = Path(docs_dir) / 'sidebar.json'
+    try:
+        text = path.read_text(encoding='utf-8')
+    except OSError:
+        return []
+    data = json.loads(text)
+    lines = text.splitlines()
+    refs = []
+    for section in data.get('sections', []):
+        for item in section.get('items', []):
+            href = item.get('href', '')
+            needle = f'"{href}"'
+            line = next((n for n, text in enumerate(lines, 1) if needle in text), 0)
+            refs.append(Reference(display_path(path).as_posix(), line, href, '/docs/'))
+    return refs
+
+
+def partial_refs():
+    """References in the shared partials, resolved as if on a top-level docs page."""
+    refs = []
+    for path in sorted(Path(PARTIALS_DIR).glob('*.html')):
+        page_refs, _ = parse_page(path.read_text(encoding='utf-8'))
+        refs.extend(Reference(display_path(path).as_posix(), line, url, '/docs/index.html')
+                    for line, url in page_refs)
+    return refs
+
+
+def sitemap_refs(sitemaps=None):
+    refs = []
+    for path in sitemaps or SITEMAPS:
+        try:
+            text = Path(path).read_text(encoding='utf-8')
+        except OSError:
+            continue
+        newlines = [m.start() for m in re.finditer('\n', text)]
+        refs.extend(Reference(display_path(path).as_posix(), _line_of(text, match.start(), newlines),
+                              match.group(1), '/')
+                    for match in LOC_PATTERN.finditer(text))
+    return refs
+
+
+def check_links(docs_dirs=None, jobs=1, use_cache=True):
+    """Resolve every reference in the docs trees, sidebars, partials and sitemaps; returns a LinkReport."""
+    docs_dirs = [Path(d) for d in (docs_dirs or ALL_DOCS_DIRS) if Path(d).is_dir()]
+    paths = [path for docs_dir in docs_dirs for path in sorted(docs_dir.rglob('*.html'))]
+    pages, parsed = parse_pages(paths, jobs, use_cache)
+    report = LinkReport(pages=len(paths), parsed=parsed, broken=[])
+
+    for index, docs_dir in enumerate(docs_dirs):
+        site = Site(docs_dir, pages)
+        refs = []
+        for path in paths:
+            if not path.is_relative_to(docs_dir):
+                continue
+            entry = pages[path]
+            source = display_path(path).as_posix()
+            if 'error' in entry:
+                report.broken.append(Broken(Reference(source, 0, '', ''), entry['error']))
+                continue
+            base = site.page_url(path)
+            refs.extend(Reference(source, line, url, base) for line, url in entry['refs'])
+        refs.extend(sidebar_refs(docs_dir))
+        if index == 0:
+            # Shared inputs only need checking against the canonical tree
+            refs.extend(partial_refs())
+            refs.extend(sitemap_refs())
+        report.references += len(refs)
+        for ref in refs:
+            reason = site.resolve(ref.url, ref.base)
+            if reason:
+                report.broken.append(Broken(ref, reason))
+    return report
+
+
+def print_link_report(report, elapsed=None):
+    """Print broken references grouped by file and a summary."""
+    current = None
+    for broken in report.broken:
+        if broken.ref.source != current:
+            current = broken.ref.source
+            print(f"\n{current}")
+        location = f"{broken.ref.line}: " if broken.ref.line else ''
+        print(f"  ✗ {location}{broken.ref.url} ({broken.reason})")
+
+    print(f"\n{'='*60}")
+    print(f"Pages checked: {report.pages} ({report.parsed} parsed, {report.pages - report.parsed} cached)")
+    print(f"References checked: {report.references:,}")
+    print(f"Broken references: {len(report.broken)}")
+    if elapsed is not None:
+        print(f"Time: {elapsed * 1000:.0f} ms")
+    print(f"{'='*60}")
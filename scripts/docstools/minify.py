@@ -0,0 +1,373 @@
+"""
+Minify the HTML, CSS and JS of a staged site in place.
+
+All three minifiers are conservative and only remove what cannot change
+rendering or behaviour:
+
+- HTML: comments go (except IE conditional comments), whitespace runs
+  between tags collapse to one space or newline, and the contents of
+  <pre>, <textarea> and <code> are left byte-for-byte alone. Inline <style>
+  and <script> blocks go through the CSS and JS minifiers; JSON blocks
+  (ld+json) are re-serialized compactly.
+- CSS: comments go, whitespace collapses, and the spaces around braces,
+  semicolons, commas and after colons are dropped. Strings are untouched.
+- JS: comments and indentation go, but line breaks stay, so automatic
+  semicolon insertion behaves exactly as before. Strings, template
+  literals and regular expression literals are untouched.
+
+Outputs are cached under .docs-cache/minify/ by the hash of their input,
+so a restaged but unchanged file costs one hash and one read.
+"""
+
+import json
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+from .cache import CACHE_DIR
+from .engine import REPO_ROOT, atomic_write, bounded_map, content_hash
+
+SITE_DOCS_DIR = REPO_ROOT / '_site' / 'docs'
+MINIFY_CACHE_DIR = CACHE_DIR / 'minify'
+# Bump when any minifier's output changes so cached results are discarded
+MINIFY_VERSION = 2
+
+# --- HTML ------------------------------------------------------------------
+
+HTML_TOKEN = re.compile(
+    r'(?P<comment><!--.*?-->)'
+    r'|(?P<raw><(?P<raw_tag>pre|textarea|code)\b[^>]*>.*?</(?P=raw_tag)\s*>)'
+    r'|(?P<block><(?P<block_tag>script|style)\b(?P<attrs>[^>]*)>(?P<body>.*?)</(?P=block_tag)\s*>)'
+    r'''|(?P<tag></?[a-zA-Z!][^>"']*(?:(?:"[^"]*"|'[^']*')[^>"']*)*>)'''
+    r'|(?P<text>[^<]+|<)',
+    re.DOTALL | re.IGNORECASE,
+)
+TAG_PART = re.compile(r'''("[^"]*"|'[^']*')''')
+WHITESPACE = re.compile(r'\s+')
+SCRIPT_TYPE = re.compile(r'''\btype\s*=\s*["']?([^"'\s>]+)''', re.IGNORECASE)
+JS_TYPES = {'', 'text/javascript', 'application/javascript', 'module'}
+JSON_TYPES = {'application/json', 'application/ld+json', 'importmap'}
+
+
+def _collapse(text):
+    # A run that contained a newline becomes one newline, anything else one space
+    return WHITESPACE.sub(lambda m: '\n' if '\n' in m.group() else ' ', text)
+
+
+def _minify_tag(tag):
+    # Collapse whitespace between attributes, never inside quoted values
+    parts = TAG_PART.split(tag)
+    parts[::2] = [WHITESPACE.sub(' ', part).replace(' >', '>').replace(' />', '/>') for part in parts[::2]]
+    return ''.join(parts)
+
+
+def _minify_block(match):
+    tag, attrs, body = match.group('block_tag').lower(), match.group('attrs'), match.group('body')
+    if tag == 'style':
+        body = minify_css(body)
+    else:
+        kind = SCRIPT_TYPE.search(attrs)
+        kind = kind.group(1).lower() if kind else ''
+        if kind in JSON_TYPES:
+            try:
+                body = json.dumps(json.loads(body), separators=(',', ':'), ensure_ascii=False)
+            except ValueError:
+                pass
+        elif kind in JS_TYPES and body.strip():
+            body = minify_js(body)
+    open_tag = _minify_tag(f"<{match.group('block_tag')}{attrs}>")
+    return f"{open_tag}{body}</{match.group('block_tag')}>"
+
+
+def minify_html(text):
+    """Minify a page; whitespace-sensitive elements are left as they are."""
+    out, pending = [], []
+    for match in HTML_TOKEN.finditer(text):
+        if match.group('comment') is not None:
+            comment = match.group('comment')
+            if not comment.startswith(('<!--[if', '<!--<![endif]')):
+                continue  # text on both sides of a dropped comment collapses as one run
+            token = comment
+        elif match.group('text') is not None:
+            pending.append(match.group('text'))
+            continue
+        elif match.group('raw') is not None:
+            token = match.group('raw')
+        elif match.group('block') is not None:
+            token = _minify_block(match)
+        else:
+            token = _minify_tag(match.group('tag'))
+        if pending:
+            out.append(_collapse(''.join(pending)))
+            pending = []
+        out.append(token)
+    out.append(_collapse(''.join(pending)))
+    return ''.join(out).strip() + '\n'
+
+
+# --- CSS -------------------------------------------------------------------
+
+CSS_TOKEN = re.compile(
+    r'(?P<string>"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')'
+    r'|(?P<comment>/\*.*?\*/)'
+    r'|(?P<space>\s+)'
+    r'|(?P<other>[^"\'/\s]+|/)',
+    re.DOTALL,
+)
+CSS_TIGHT = set('{};,')
+
+
+def minify_css(text):
+    """Minify a stylesheet; string contents are never touched."""
+    out = []
+    pending_space = False
+    for match in CSS_TOKEN.finditer(text):
+        kind = match.lastgroup
+        if kind == 'comment':
+            if match.group().startswith('/*!'):
+                out.append(match.group())  # license comments stay
+            continue
+        if kind == 'space':
+            pending_space = True
+            continue
+        token = match.group()
+        if kind == 'other':
+            token = re.sub(r';+}', '}', token)
+            if token[0] == '}' and out and out[-1][-1] == ';':
+                out[-1] = out[-1].rstrip(';')
+                if not out[-1]:
+                    out.pop()
+        if pending_space and out and out[-1][-1] not in CSS_TIGHT | {':'} and token[0] not in CSS_TIGHT:
+            out.append(' ')
+        pending_space = False
+        out.append(token)
+    return ''.join(out)
+
+
+# --- JS --------------------------------------------------------------------
+
+# After one of these (or at the start), a '/' opens a regular expression literal
+REGEX_PRECEDERS = set('(,=:[!&|?{};') | {''}
+REGEX_KEYWORDS = {'return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void', 'throw',
+                  'case', 'do', 'else', 'yield', 'await'}
+WORD_CHAR = re.compile(r'[\w$]')
+
+
+def _scan_string(text, i, quote):
+    """Index just past the string or template literal starting at text[i]."""
+    i += 1
+    depth = 0
+    while i < len(text):
+        c = text[i]
+        if c == '\\':
+            i += 2
+            continue
+        if quote == '`':
+            if c == '$' and text.startswith('${', i):
+                depth += 1
+                i += 2
+                continue
+            if c == '}' and depth:
+                depth -= 1
+            elif c == '`' and not depth:
+                return i + 1
+        elif c == quote:
+            return i + 1
+        elif c == '\n':
+            return i  # unterminated; leave the rest to the caller
+        i += 1
+    return i
+
+
+def _scan_regex(text, i):
+    """Index just past the regular expression literal starting at text[i]."""
+    i += 1
+    in_class = False
+    while i < len(text):
+        c = text[i]
+        if c == '\\':
+            i += 2
+            continue
+        if c == '\n':
+            return i
+        if c == '[':
+            in_class = True
+        elif c == ']':
+            in_class = False
+        elif c == '/' and not in_class:
+            i += 1
+            while i < len(text) and WORD_CHAR.match(text[i]):
+                i += 1  # flags
+            return i
+        i += 1
+    return i
+
+
+def _previous_token(out):
+    """The last significant character or word written, for regex detection."""
+    text = ''.join(out[-8:]).rstrip()
+    if not text:
+        return ''
+    word = re.search(r'[\w$]+$', text)
+    return word.group() if word else text[-1]
+
+
+def _space(out, newline):
+    # Merge with a preceding space so comments and indentation leave one separator
+    if not out:
+        return
+    if out[-1] in (' ', '\n'):
+        if newline:
+            out[-1] = '\n'
+    else:
+        out.append('\n' if newline else ' ')
+
+
+def minify_js(text):
+    """Strip comments and indentation from a script, keeping its line structure."""
+    out = []
+    i, n = 0, len(text)
+    while i < n:
+        c = text[i]
+        if c in '"\'`':
+            end = _scan_string(text, i, c)
+            out.append(text[i:end])
+            i = end
+        elif text.startswith('//', i):
+            end = text.find('\n', i)
+            i = n if end < 0 else end
+        elif text.startswith('/*', i):
+            end = text.find('*/', i + 2)
+            end = n if end < 0 else end + 2
+            # A comment spanning lines still ends a statement for semicolon insertion
+            _space(out, '\n' in text[i:end])
+            i = end
+        elif c == '/':
+            previous = _previous_token(out)
+            if previous in REGEX_PRECEDERS or previous in REGEX_KEYWORDS:
+                end = _scan_regex(text, i)
+                out.append(text[i:end])
+                i = end
+            else:
+                out.append(c)
+                i += 1
+        elif c.isspace():
+            end = i
+            while end < n and text[end].isspace():
+                end += 1
+            _space(out, '\n' in text[i:end])
+            i = end
+        else:
+            end = i + 1
+            while end < n and text[end] not in '"\'`/' and not text[end].isspace():
+                end += 1
+            out.append(text[i:end])
+            i = end
+    return ''.join(out).strip()
+
+
+# --- Files -----------------------------------------------------------------
+
+MINIFIERS = {
+    '.html': minify_html,
+    '.htm': minify_html,
+    '.css': minify_css,
+    '.js': minify_js,
+}
+
+
+@dataclass
+class MinifyResult:
+    """Outcome of minifying one file."""
+    path: Path
+    status: str  # 'minified', 'cached', 'unchanged' or 'error'
+    size: int = 0
+    minified_size: int = 0
+    error: str = None
+
+
+def iter_minifiable(root):
+    """Yield every file under root that has a minifier, skipping prebuilt .min files."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            path = Path(dirpath) / filename
+            if path.suffix.lower() in MINIFIERS and '.min.' not in filename:
+                yield path
+
+
+def _cache_path(digest):
+    return MINIFY_CACHE_DIR / digest[:2] / digest
+
+
+def minify_file(path, use_cache=True):
+    """Minify one file in place, reusing the cached output for the same input."""
+    try:
+        data = path.read_bytes()
+        key = content_hash(data + f"\0minify-{MINIFY_VERSION}".encode())
+        cached = _cache_path(key)
+        status = 'cached'
+        try:
+            if not use_cache:
+                raise FileNotFoundError
+            minified = cached.read_bytes()
+        except FileNotFoundError:
+            status = 'minified'
+            minified = MINIFIERS[path.suffix.lower()](data.decode('utf-8')).encode('utf-8')
+            if len(minified) >= len(data):
+                minified = data
+            cached.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write(cached, minified)
+            # Minified output maps to itself, so a second run over it is a cache hit
+            done = _cache_path(content_hash(minified + f"\0minify-{MINIFY_VERSION}".encode()))
+            if not done.exists():
+                done.parent.mkdir(parents=True, exist_ok=True)
+                atomic_write(done, minified)
+        if minified == data:
+            return MinifyResult(path, 'unchanged', len(data), len(data))
+        # A fresh file, not a write through a hardlink into the source tree
+        atomic_write(path, minified)
+        return MinifyResult(path, status, len(data), len(minified))
+    except Exception as e:
+        return MinifyResult(path, 'error', error=f"{type(e).__name__}: {e}")
+
+
+def _minify_job(job):
+    return minify_file(*job)
+
+
+def minify_tree(root=SITE_DOCS_DIR, jobs=1, use_cache=True):
+    """Minify every HTML, CSS and JS file under root, yielding MinifyResults in path order
+    as files finish (see bounded_map)."""
+    return bounded_map(_minify_job, ((path, use_cache) for path in iter_minifiable(root)), jobs)
+
+
+def report_minify(results, root, verbose=False):
+    """Print bytes saved per file and in total; returns the status counts."""
+    counts = {'minified': 0, 'cached': 0, 'unchanged': 0, 'error': 0}
+    before = after = 0
+    for result in results:
+        counts[result.status] += 1
+        if result.status == 'error':
+            print(f"✗ Error minifying {result.path}: {result.error}")
+            continue
+        before += result.size
+        after += result.minified_size
+        if result.status != 'unchanged' or verbose:
+            saved = result.size - result.minified_size
+            share = f"{saved / result.size:5.1%}" if result.size else '    -'
+            print(f"{'✓' if result.status != 'unchanged' else ' '} {result.path.relative_to(root)} "
+                  f"({result.size:,} → {result.minified_size:,} bytes, -{share})"
+                  f"{' [cached]' if result.status == 'cached' else ''}")
+
+    print(f"\n{'='*60}")
+    print(f"Files minified: {counts['minified'] + counts['cached']} ({counts['cached']} from cache)")
+    if counts['unchanged']:
+        print(f"Files already minimal: {counts['unchanged']}")
+    if before:
+        print(f"Total: {before:,} → {after:,} bytes (saved {before - after:,}, {(before - after) / before:.1%})")
+    if counts['error']:
+        print(f"Errors: {counts['error']}")
+    print(f"{'='*60}")
+    return counts
@@ -0,0 +1,47 @@
+"""
+Named HTML fragments shared by every docs page (footer, header, theme toggle).
+
+Partials live in scripts/partials/ as <name>.html, with alternative
+renderings as <name>.<variant>.html. Each is read once per change and
+cached, so transforms inject the same string into every page.
+"""
+
+from functools import lru_cache
+from pathlib import Path
+
+from .engine import record_input
+
+PARTIALS_DIR = Path(__file__).resolve().parent.parent / 'partials'
+
+
+def partial_path(name, variant=None):
+    """File holding a partial (or one of its variants)."""
+    filename = f"{name}.{variant}.html" if variant else f"{name}.html"
+    return PARTIALS_DIR / filename
+
+
+def render_partial(name, variant=None):
+    """Return a partial's markup, re-reading the file only when it changes."""
+    path = partial_path(name, variant)
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Unknown partial: {path.name} (expected in {PARTIALS_DIR})") from None
+    record_input(path)
+    return _read_partial(str(path), stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=32)
+def _read_partial(path, mtime_ns, size):
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+    return text[:-1] if text.endswith('\n') else text
+
+
+def list_partials():
+    """(name, variant) pairs for every partial on disk."""
+    partials = []
+    for path in sorted(PARTIALS_DIR.glob('*.html')):
+        name, _, variant = path.stem.partition('.')
+        partials.append((name, variant or None))
+    return sorted(partials, key=lambda p: (p[0], p[1] or ''))
@@ -0,0 +1,172 @@
+"""
+Offset index of the named regions the docs transforms edit.
+
+One forward scan over a page's tags records where each region (footer,
+theme toggle, navbar header, style block, sidebar, ...) starts and ends,
+so transforms can splice by range instead of running a DOTALL regex over
+the whole document for every edit. Several regions can be replaced in a
+single pass with replace_regions().
+"""
+
+import re
+from dataclasses import dataclass
+
+from .engine import record_matches
+
+TAG_PATTERN = re.compile(
+    r'<!--.*?-->'
+    r'|<(/?)([a-zA-Z][\w:-]*)((?:"[^"]*"|\'[^\']*\'|[^\'">])*)>',
+    re.DOTALL
+)
+ATTR_PATTERN = re.compile(r'([\w:-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+))')
+
+VOID_ELEMENTS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+    'link', 'meta', 'source', 'track', 'wbr',
+}
+RAW_TEXT_ELEMENTS = {'script', 'style'}
+
+# name -> (tag, attribute, token); attribute None matches any element of that tag
+REGION_SPECS = {
+    'header': ('nav', 'class', 'docs-navbar'),
+    'sidebar': ('aside', 'class', 'sidebar'),
+    'style': ('style', None, None),
+    'footer': ('footer', 'class', 'docs-footer'),
+    'theme-selector': ('div', 'class', 'theme-selector'),
+    'theme-toggle': ('button', 'id', 'theme-toggle-btn'),
+    'theme-light': ('button', 'id', 'theme-light-btn'),
+    'theme-dark': ('button', 'id', 'theme-dark-btn'),
+}
+
+
+@dataclass(frozen=True)
+class Region:
+    """Offsets of one element: [start, end) is the whole element,
+    [inner_start, inner_end) its content between the tags."""
+    name: str
+    start: int
+    inner_start: int
+    inner_end: int
+    end: int
+
+    def text(self, content):
+        return content[self.start:self.end]
+
+    def inner(self, content):
+        return content[self.inner_start:self.inner_end]
+
+
+def parse_attrs(attr_text):
+    """Parse a tag's attribute text into a dict (last value wins)."""
+    return {
+        match.group(1).lower(): next(v for v in match.group(2, 3, 4) if v is not None)
+        for match in ATTR_PATTERN.finditer(attr_text)
+    }
+
+
+def _region_names(tag, attr_text, specs):
+    names = []
+    attrs = None
+    for name, (spec_tag, attribute, token) in specs.items():
+        if spec_tag != tag:
+            continue
+        if attribute is None:
+            names.append(name)
+            continue
+        if attrs is None:
+            attrs = parse_attrs(attr_text)
+        value = attrs.get(attribute, '')
+        if token in (value.split() if attribute == 'class' else [value]):
+            names.append(name)
+    return names
+
+
+def build_index(content, specs=None):
+    """Scan content once and return {region name: [Region, ...]} in document order."""
+    specs = specs or REGION_SPECS
+    wanted_tags = {spec[0] for spec in specs.values()}
+    index = {name: [] for name in specs}
+    stack = []  # (tag, start, inner_start, region names)
+    pos = 0
+
+    while True:
+        match = TAG_PATTERN.search(content, pos)
+        if not match:
+            break
+        pos = match.end()
+        closing, tag, attr_text = match.group(1, 2, 3)
+        if tag is None:
+            continue  # comment
+        tag = tag.lower()
+
+        if closing:
+            # Pop to the matching open tag, tolerating implicitly closed elements
+            for depth in range(len(stack) - 1, -1, -1):
+                if stack[depth][0] == tag:
+                    _, start, inner_start, names = stack[depth]
+                    for name in names:
+                        index[name].append(Region(name, start, inner_start, match.start(), match.end()))
+                    del stack[depth:]
+                    break
+            continue
+
+        names = _region_names(tag, attr_text, specs) if tag in wanted_tags else []
+        if tag in RAW_TEXT_ELEMENTS:
+            close = re.compile(r'</' + tag + r'\s*>', re.IGNORECASE).search(content, pos)
+            end_inner = close.start() if close else len(content)
+            end = close.end() if close else len(content)
+            for name in names:
+                index[name].append(Region(name, match.start(), pos, end_inner, end))
+            pos = end
+            continue
+        if tag in VOID_ELEMENTS or attr_text.rstrip().endswith('/'):
+            for name in names:
+                index[name].append(Region(name, match.start(), pos, pos, pos))
+            continue
+        stack.append((tag, match.start(), pos, names))
+
+    for name in index:
+        index[name].sort(key=lambda region: region.start)
+    return index
+
+
+_last_index = (None, None)
+
+
+def index_regions(content):
+    """Region index for content, memoized for the page currently in the pipeline.
+
+    Transforms that leave content untouched hand the same string to the
+    next transform, so the page is only re-scanned after an edit.
+    """
+    global _last_index
+    cached_content, cached_index = _last_index
+    if content is not cached_content and content != cached_content:
+        _last_index = (content, build_index(content))
+    return _last_index[1]
+
+
+def splice(content, edits):
+    """Apply non-overlapping (start, end, replacement) edits in one pass."""
+    record_matches(len(edits))
+    pieces = []
+    pos = 0
+    for start, end, replacement in sorted(edits, key=lambda edit: edit[0]):
+        if start < pos:
+            raise ValueError(f"Overlapping edits at offset {start}")
+        pieces.append(content[pos:start])
+        pieces.append(replacement)
+        pos = end
+    pieces.append(content[pos:])
+    return ''.join(pieces)
+
+
+def replace_regions(content, replacements):
+    """Replace every occurrence of the named regions: {name: text or func(region_text)}."""
+    index = index_regions(content)
+    edits = []
+    for name, replacement in replacements.items():
+        for region in index[name]:
+            text = replacement(region.text(content)) if callable(replacement) else replacement
+            edits.append((region.start, region.end, text))
+    return splice(content, edits) if edits else content
@@ -0,0 +1,274 @@
+"""
+Build the prebuilt full-text search index served with the docs.
+
+The pages listed in docs/sidebar.json are split into sections at their
+h1-h3 headings, tokenized, and merged into an inverted index under
+docs/search/: index.json holds the page and section tables and one
+terms-<c>.json shard per leading character, each a sorted term dictionary
+with parallel postings lists (delta-encoded section ids interleaved with
+weights). docs/search.js fetches index.json on first use and then only
+the shards the query needs.
+
+Extracted sections are cached per page in .docs-cache/search.json, keyed
+by stat and content hash, so a rebuild only re-reads changed pages; shards
+whose bytes are unchanged are not rewritten. With check=True nothing is
+written (not even the cache) and the report lists the files that are out
+of date.
+"""
+
+import json
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from html import unescape
+from pathlib import Path
+
+from .cache import CACHE_DIR, cache_key
+from .engine import CANONICAL_DOCS_DIR, atomic_write, content_hash, display_path
+from .regions import build_index
+from .sidebar import load_sidebar
+
+SEARCH_CACHE = CACHE_DIR / 'search.json'
+# Bump when extraction, tokenizing or the output layout changes
+SEARCH_FORMAT = 1
+
+CONTENT_SPECS = {'content': ('main', 'class', 'docs-content')}
+HEADING_PATTERN = re.compile(r'<h([1-3])\b([^>]*)>(.*?)</h\1\s*>', re.DOTALL | re.IGNORECASE)
+ID_PATTERN = re.compile(r'\sid\s*=\s*"([^"]*)"')
+SKIP_PATTERN = re.compile(r'<(script|style|svg)\b.*?</\1\s*>', re.DOTALL | re.IGNORECASE)
+TAG_PATTERN = re.compile(r'<[^>]+>')
+TITLE_PATTERN = re.compile(r'<title>(.*?)</title>', re.DOTALL | re.IGNORECASE)
+# Keep dotted/hyphenated words (port-forward, v1.28, kubeconfig.yaml) whole;
+# search.js uses the same pattern
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+(?:[._-][a-z0-9]+)*')
+
+STOPWORDS = frozenset(
+    'a an and are as at be but by can do for from has have how if in into is it '
+    'its of on or so than that the their then there these this to was we were '
+    'what when which will with you your'.split()
+)
+HEADING_WEIGHT = 5
+TITLE_WEIGHT = 3
+SNIPPET_LENGTH = 120
+
+
+@dataclass
+class IndexReport:
+    """What a build did."""
+    pages: int = 0
+    extracted: int = 0        # pages re-read because they changed
+    sections: int = 0
+    terms: int = 0
+    written: list = None      # output files rewritten (or out of date, when checking)
+    missing: list = None      # sidebar hrefs without a page
+    bytes: int = 0            # total size of the index files
+
+
+def _text(html):
+    return ' '.join(unescape(TAG_PATTERN.sub(' ', SKIP_PATTERN.sub(' ', html))).split())
+
+
+def tokenize(text):
+    """Index terms of text: whole compound words plus their parts, minus stopwords."""
+    tokens = []
+    for word in TOKEN_PATTERN.findall(text.lower()):
+        parts = re.split(r'[._-]', word)
+        for token in ([word] + parts if len(parts) > 1 else parts):
+            if len(token) > 1 and token not in STOPWORDS:
+                tokens.append(token)
+    return tokens
+
+
+def slugify(text):
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')
+
+
+def sidebar_pages(docs_dir=CANONICAL_DOCS_DIR):
+    """(href, sidebar section label, path) for every docs page in the tree's sidebar.json."""
+    seen = set()
+    for label, _, items in load_sidebar(Path(docs_dir) / 'sidebar.json'):
+        for _, href in items:
+            if not href.startswith('/docs/') or href in seen:
+                continue
+            seen.add(href)
+            rel = href[len('/docs/'):].split('#', 1)[0] or 'index.html'
+            yield href, label, Path(docs_dir) / rel
+
+
+def extract_sections(html):
+    """Split a page's main content at its headings; returns (title, sections).
+
+    Each section is [heading, anchor, snippet, {term: weight}]. Headings
+    without an id get an anchor from their slug.
+    """
+    match = TITLE_PATTERN.search(html)
+    title = _text(match.group(1)).split(' - ')[0] if match else ''
+    regions = build_index(html, CONTENT_SPECS)['content']
+    body = regions[0].inner(html) if regions else html
+
+    sections = []
+    heading, anchor, pos = title, '', 0
+    for match in list(HEADING_PATTERN.finditer(body)) + [None]:
+        chunk = body[pos:match.start() if match else len(body)]
+        text = _text(chunk)
+        if text or (heading and heading != title):
+            weights = defaultdict(int)
+            for token in tokenize(text):
+                weights[token] += 1
+            for token in tokenize(heading):
+                weights[token] += HEADING_WEIGHT
+            snippet = text if len(text) <= SNIPPET_LENGTH else text[:SNIPPET_LENGTH].rsplit(' ', 1)[0] + '…'
+            sections.append([heading, anchor, snippet, dict(weights)])
+        if match is None:
+            break
+        heading = _text(match.group(3))
+        id_match = ID_PATTERN.search(match.group(2))
+        anchor = id_match.group(1) if id_match else slugify(heading)
+        pos = match.end()
+
+    # Title words rank the page's first section for queries that name the page
+    if sections:
+        for token in tokenize(title):
+            sections[0][3][token] = sections[0][3].get(token, 0) + TITLE_WEIGHT
+    return title, sections
+
+
+def load_cache(path=SEARCH_CACHE):
+    try:
+        data = json.loads(Path(path).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    return data.get('pages', {}) if data.get('format') == SEARCH_FORMAT else {}
+
+
+def save_cache(pages, path=SEARCH_CACHE):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {'format': SEARCH_FORMAT, 'pages': pages}
+    atomic_write(path, json.dumps(data, separators=(',', ':'), sort_keys=True).encode('utf-8'))
+
+
+def page_entry(path, entry=None):
+    """Cached extraction for a page, or a fresh one; returns (entry, extracted)."""
+    stat = path.stat()
+    if entry and entry.get('size') == stat.st_size and entry.get('mtime_ns') == stat.st_mtime_ns:
+        return entry, False
+    data = path.read_bytes()
+    digest = content_hash(data)
+    if entry and entry.get('hash') == digest:
+        return dict(entry, size=stat.st_size, mtime_ns=stat.st_mtime_ns), False
+    title, sections = extract_sections(data.decode('utf-8'))
+    return {
+        'hash': digest,
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'title': title,
+        'sections': sections,
+    }, True
+
+
+def build_shards(sections):
+    """{shard: {'terms': [...], 'postings': [...]}} from [(section id, {term: weight})]."""
+    postings = defaultdict(list)
+    for section_id, weights in sections:
+        for term, weight in weights.items():
+            postings[term].append((section_id, weight))
+
+    shards = defaultdict(lambda: {'terms': [], 'postings': []})
+    for term in sorted(postings):
+        shard = shards[term[0]]
+        encoded, previous = [], 0
+        for section_id, weight in sorted(postings[term]):
+            encoded += [section_id - previous, weight]
+            previous = section_id
+        shard['terms'].append(term)
+        shard['postings'].append(encoded)
+    return dict(shards)
+
+
+def _dumps(data):
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def _write_if_changed(path, data, check, written):
+    try:
+        if path.read_bytes() == data:
+            return
+    except FileNotFoundError:
+        pass
+    if not check:
+        atomic_write(path, data)
+    written.append(path)
+
+
+def build_search_index(docs_dir=CANONICAL_DOCS_DIR, out_dir=None, use_cache=True, cache_path=SEARCH_CACHE,
+                       check=False):
+    """Rebuild the search index from the sidebar pages; returns an IndexReport.
+
+    With check=True only report which index files would change.
+    """
+    out_dir = Path(out_dir or Path(docs_dir) / 'search')
+    cached = load_cache(cache_path) if use_cache else {}
+    report = IndexReport(written=[], missing=[])
+
+    pages, sections, entries = [], [], {}
+    for href, label, path in sidebar_pages(docs_dir):
+        if not path.is_file():
+            report.missing.append(href)
+            continue
+        key = cache_key(path)
+        entry, extracted = page_entry(path, cached.get(key))
+        entries[key] = entry
+        report.extracted += extracted
+        page_id = len(pages)
+        pages.append([href, entry['title'], label])
+        for heading, anchor, snippet, weights in entry['sections']:
+            sections.append((page_id, heading, anchor, snippet, weights))
+    if not check:
+        save_cache(entries, cache_path)
+
+    shards = build_shards((section_id, section[4]) for section_id, section in enumerate(sections))
+    if not check:
+        out_dir.mkdir(parents=True, exist_ok=True)
+    shard_versions = {}
+    for shard, data in sorted(shards.items()):
+        payload = _dumps(data)
+        shard_versions[shard] = content_hash(payload)[:10]
+        _write_if_changed(out_dir / f'terms-{shard}.json', payload, check, report.written)
+    index = {
+        'format': SEARCH_FORMAT,
+        'pages': pages,
+        'sections': [list(section[:4]) for section in sections],
+        'shards': shard_versions,
+    }
+    _write_if_changed(out_dir / 'index.json', _dumps(index), check, report.written)
+
+    # Shards for leading characters no term uses any more
+    for stale in out_dir.glob('terms-*.json'):
+        if stale.stem[len('terms-'):] not in shards:
+            report.written.append(stale)
+            if not check:
+                stale.unlink()
+
+    report.pages = len(pages)
+    report.sections = len(sections)
+    report.terms = sum(len(data['terms']) for data in shards.values())
+    report.bytes = sum(path.stat().st_size for path in out_dir.glob('*.json'))
+    return report
+
+
+def print_index_report(report, check=False):
+    for href in report.missing:
+        print(f"⚠ {href} is in sidebar.json but has no page")
+    for path in report.written:
+        if check:
+            print(f"⚠ Out of date: {display_path(path)}")
+        else:
+            print(f"{'✓' if path.exists() else '✗'} {display_path(path)}{'' if path.exists() else ' (removed)'}")
+    print(f"\n{'='*60}")
+    print(f"Pages indexed: {report.pages} ({report.extracted} re-extracted)")
+    print(f"Sections: {report.sections}")
+    print(f"Terms: {report.terms:,}")
+    print(f"Index size: {report.bytes:,} bytes")
+    print(f"Files {'out of date' if check else 'written'}: {len(report.written)}")
+    print(f"{'='*60}")
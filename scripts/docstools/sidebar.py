@@ -0,0 +1,109 @@
+"""
+Render the docs sidebar navigation from docs/sidebar.json.
+
+Sections are rendered once and memoized; only the section that holds the
+current page's active item is rendered per page, so regenerating every
+sidebar costs one template render per section plus one per page. Pages
+that are not in the navigation themselves can highlight another item
+through the "active" map (page href -> item href).
+"""
+
+import json
+from functools import lru_cache
+from html import escape
+
+from .engine import CANONICAL_DOCS_DIR, record_input
+
+SIDEBAR_JSON = CANONICAL_DOCS_DIR / 'sidebar.json'
+
+SIDEBAR_OPEN = '''<aside class="sidebar" id="sidebar">
+      <a href="/" class="sidebar-logo">
+        <img src="/kubegraf.svg" alt="KubeGraf logo" class="sidebar-logo-icon">
+        KubēGraf
+      </a>
+'''
+SIDEBAR_CLOSE = '    </aside>'
+
+
+def load_sidebar(path=SIDEBAR_JSON):
+    """Load the sections of sidebar.json, re-reading it only when the file changes."""
+    return _load(path)[0]
+
+
+def active_item(href, path=SIDEBAR_JSON):
+    """The sidebar item to mark active on the page at href."""
+    return _load(path)[1].get(href, href)
+
+
+def _load(path):
+    stat = path.stat()
+    record_input(path)
+    return _load_sidebar(str(path), stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=4)
+def _load_sidebar(path, mtime_ns, size):
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    # Freeze into hashable tuples so sections can key the render cache
+    sections = tuple(
+        (
+            section.get('label', ''),
+            bool(section.get('highlight')),
+            tuple((item['label'], item['href']) for item in section.get('items', [])),
+        )
+        for section in data.get('sections', [])
+    )
+    return sections, dict(data.get('active', {}))
+
+
+def page_href(path, docs_dir=None):
+    """Site URL of a docs page, as used in sidebar.json hrefs.
+
+    Without docs_dir the nearest ancestor named docs/ is the site's /docs/.
+    """
+    path = path.resolve()
+    if docs_dir is None:
+        docs_dir = next((parent for parent in path.parents if parent.name == 'docs'),
+                        CANONICAL_DOCS_DIR)
+    try:
+        rel = path.relative_to(docs_dir.resolve()).as_posix()
+    except ValueError:
+        rel = path.name
+    return '/docs/' if rel == 'index.html' else f'/docs/{rel}'
+
+
+def _render_link(label, href, active):
+    attrs = f' href="{escape(href)}"'
+    if active:
+        attrs += ' class="active"'
+    if href.startswith(('http://', 'https://')):
+        attrs += ' target="_blank" rel="noopener noreferrer"'
+    return f'          <li><a{attrs}>{escape(label)}</a></li>\n'
+
+
+@lru_cache(maxsize=None)
+def render_section(section, active_href=None):
+    """Render one sidebar section; memoized per (section, active item)."""
+    label, highlight, items = section
+    css_class = 'sidebar-section sidebar-section-highlight' if highlight else 'sidebar-section'
+    links = ''.join(_render_link(item_label, href, href == active_href) for item_label, href in items)
+    return (
+        f'\n      <div class="{css_class}">\n'
+        f'        <h3>{escape(label)}</h3>\n'
+        f'        <ul>\n{links}        </ul>\n'
+        f'      </div>\n'
+    )
+
+
+def render_sidebar(active_href, sections=None):
+    """Render the full <aside> for a page, marking active_href as the current item."""
+    if sections is None:
+        sections = load_sidebar()
+        active_href = active_item(active_href)
+    parts = [SIDEBAR_OPEN]
+    for section in sections:
+        in_section = any(href == active_href for _, href in section[2])
+        parts.append(render_section(section, active_href if in_section else None))
+    parts.append(SIDEBAR_CLOSE)
+    return ''.join(parts)
@@ -0,0 +1,351 @@
+"""
+Generate sitemap.xml from the docs tree, the sidebar and the blog routes.
+
+URLs come from three places: every docs page whose canonical URL is its
+own (so duplicated workflow pages that point elsewhere are left out), the
+blog index and one entry per post in client/src/data/blogPosts.ts, and the
+handful of app pages in STATIC_PAGES. Pages listed in docs/sidebar.json
+rank above other docs pages.
+
+Each URL's <lastmod> only moves when its normalized content changes: the
+text of a docs page's main content, title and description; the source of
+a blog post or app page with whitespace collapsed. The hash and date of
+every URL are kept in sitemap.state.json, which is committed next to
+sitemap.xml so lastmod values survive fresh CI checkouts. URLs seen for
+the first time keep the lastmod the existing sitemap gave them.
+
+The XML is streamed to disk. Past MAX_URLS entries it is split into
+sitemap-<n>.xml files referenced from a sitemap index at sitemap.xml.
+"""
+
+import json
+import re
+import subprocess
+from dataclasses import dataclass
+from datetime import date
+from html import escape, unescape
+from pathlib import Path
+
+from .engine import CANONICAL_DOCS_DIR, REPO_ROOT, atomic_write, content_hash, display_path
+from .regions import build_index
+from .sidebar import load_sidebar
+
+BASE_URL = 'https://kubegraf.io'
+SITEMAP_OUTPUTS = [REPO_ROOT / 'sitemap.xml', REPO_ROOT / 'client' / 'public' / 'sitemap.xml']
+SITEMAP_STATE = REPO_ROOT / 'sitemap.state.json'
+SITEMAP_FORMAT = 1
+APP_ROUTES = REPO_ROOT / 'client' / 'src' / 'App.tsx'
+APP_SOURCE_DIR = REPO_ROOT / 'client' / 'src'
+BLOG_POSTS = REPO_ROOT / 'client' / 'src' / 'data' / 'blogPosts.ts'
+# The protocol allows 50,000 URLs per file
+MAX_URLS = 50000
+
+# App routes worth indexing: (route, changefreq, priority)
+STATIC_PAGES = [
+    ('/', 'weekly', '1.0'),
+    ('/kubegraf/', 'weekly', '0.9'),
+    ('/compare', 'monthly', '0.8'),
+    ('/pricing', 'monthly', '0.8'),
+    ('/faq', 'monthly', '0.8'),
+    ('/roi', 'monthly', '0.8'),
+]
+BLOG_INDEX = ('/blog', 'weekly', '0.9')
+BLOG_POST = ('monthly', '0.8')
+DOCS_INDEX = ('weekly', '0.9')
+DOCS_SIDEBAR_PAGE = ('monthly', '0.8')
+DOCS_OTHER_PAGE = ('monthly', '0.7')
+
+CONTENT_SPECS = {'content': ('main', 'class', 'docs-content')}
+CANONICAL_PATTERN = re.compile(r'<link\s+rel="canonical"\s+href="([^"]+)"', re.IGNORECASE)
+TITLE_PATTERN = re.compile(r'<title>(.*?)</title>', re.DOTALL | re.IGNORECASE)
+DESCRIPTION_PATTERN = re.compile(r'<meta\s+name="description"\s+content="([^"]*)"', re.IGNORECASE)
+SKIP_PATTERN = re.compile(r'<(script|style|svg)\b.*?</\1\s*>', re.DOTALL | re.IGNORECASE)
+TAG_PATTERN = re.compile(r'<[^>]+>')
+SLUG_PATTERN = re.compile(r'slug:\s*"([^"]+)"')
+DATE_PATTERN = re.compile(r'date:\s*"(\d{4}-\d{2}-\d{2})"')
+LAZY_IMPORT_PATTERN = re.compile(r'const\s+(\w+)\s*=\s*lazy\(\(\)\s*=>\s*import\("@/([^"]+)"\)\)')
+ROUTE_PATTERN = re.compile(r'<Route\s+path="([^"]+)"\s+component=\{(\w+)\}')
+URL_PATTERN = re.compile(r'<url>\s*<loc>\s*([^<]+?)\s*</loc>\s*<lastmod>\s*([^<]+?)\s*</lastmod>')
+
+
+@dataclass(frozen=True)
+class Entry:
+    """One sitemap URL and the hash of the content it serves."""
+    loc: str
+    digest: str
+    changefreq: str
+    priority: str
+    first_seen: str = None   # lastmod to use if no earlier one is known
+    source: Path = None      # file whose last commit dates a URL seen for the first time
+
+
+@dataclass
+class SitemapReport:
+    """What a generation run found and wrote."""
+    urls: int = 0
+    changed: list = None     # URLs whose lastmod moved
+    added: list = None
+    removed: list = None
+    written: list = None     # sitemap files rewritten
+
+
+def _normalize(text):
+    return ' '.join(text.split())
+
+
+def _text(html):
+    return _normalize(unescape(TAG_PATTERN.sub(' ', SKIP_PATTERN.sub(' ', html))))
+
+
+def docs_page_digest(html):
+    """Hash of what a docs page says: its main text, title and description."""
+    regions = build_index(html, CONTENT_SPECS)['content']
+    body = regions[0].inner(html) if regions else html
+    title = TITLE_PATTERN.search(html)
+    description = DESCRIPTION_PATTERN.search(html)
+    parts = [
+        _text(title.group(1)) if title else '',
+        _normalize(unescape(description.group(1))) if description else '',
+        _text(body),
+    ]
+    return content_hash('\0'.join(parts).encode('utf-8'))
+
+
+def source_digest(text):
+    return content_hash(_normalize(text).encode('utf-8'))
+
+
+def docs_entries(docs_dir=CANONICAL_DOCS_DIR):
+    """Entries for every docs page that is its own canonical URL."""
+    sidebar = {href for _, _, items in load_sidebar(Path(docs_dir) / 'sidebar.json') for _, href in items}
+    for path in sorted(Path(docs_dir).rglob('*.html')):
+        route = '/docs/' + path.relative_to(docs_dir).as_posix()
+        if route.endswith('/index.html'):
+            route = route[:-len('index.html')]
+        html = path.read_text(encoding='utf-8')
+        canonical = CANONICAL_PATTERN.search(html)
+        if canonical and canonical.group(1) != BASE_URL + route:
+            continue
+        if route == '/docs/':
+            changefreq, priority = DOCS_INDEX
+        elif route in sidebar:
+            changefreq, priority = DOCS_SIDEBAR_PAGE
+        else:
+            changefreq, priority = DOCS_OTHER_PAGE
+        yield Entry(BASE_URL + route, docs_page_digest(html), changefreq, priority, source=path)
+
+
+def blog_posts(path=BLOG_POSTS):
+    """[(slug, date, source of the post's object literal)] in file order."""
+    source = Path(path).read_text(encoding='utf-8')
+    matches = list(SLUG_PATTERN.finditer(source))
+    posts = []
+    for match, following in zip(matches, matches[1:] + [None]):
+        block = source[match.start():following.start() if following else len(source)]
+        posted = DATE_PATTERN.search(block)
+        posts.append((match.group(1), posted.group(1) if posted else None, block))
+    return posts
+
+
+def blog_entries(path=BLOG_POSTS):
+    posts = blog_posts(path)
+    route, changefreq, priority = BLOG_INDEX
+    # The index changes when posts are added, removed or retitled
+    listing = '\n'.join(block.split('content:', 1)[0] for _, _, block in posts)
+    yield Entry(BASE_URL + route, source_digest(listing), changefreq, priority)
+    changefreq, priority = BLOG_POST
+    for slug, posted, block in posts:
+        yield Entry(f"{BASE_URL}/blog/{slug}", source_digest(block), changefreq, priority, posted)
+
+
+def app_page_sources(app=APP_ROUTES, source_dir=APP_SOURCE_DIR):
+    """{route: component source file} from the lazy imports and <Route>s in App.tsx."""
+    app_source = Path(app).read_text(encoding='utf-8')
+    modules = dict(LAZY_IMPORT_PATTERN.findall(app_source))
+    sources = {}
+    for route, component in ROUTE_PATTERN.findall(app_source):
+        if component in modules:
+            candidates = [Path(source_dir) / f"{modules[component]}{ext}" for ext in ('.tsx', '.ts', '.jsx')]
+            sources[route] = next((c for c in candidates if c.is_file()), None)
+    return sources
+
+
+def static_entries():
+    sources = app_page_sources()
+    for route, changefreq, priority in STATIC_PAGES:
+        source = sources.get(route.rstrip('/') or '/')
+        digest = source_digest(source.read_text(encoding='utf-8')) if source else content_hash(route.encode())
+        yield Entry(BASE_URL + route, digest, changefreq, priority, source=source)
+
+
+def collect_entries(docs_dir=CANONICAL_DOCS_DIR):
+    """Every sitemap entry: app pages, then the blog, then the docs."""
+    return list(static_entries()) + list(blog_entries()) + list(docs_entries(docs_dir))
+
+
+def existing_lastmods(paths=None):
+    """{loc: lastmod} from the sitemaps on disk, following a sitemap index."""
+    lastmods = {}
+    for path in paths or SITEMAP_OUTPUTS[:1]:
+        try:
+            text = Path(path).read_text(encoding='utf-8')
+        except OSError:
+            continue
+        lastmods.update(URL_PATTERN.findall(text))
+        for part in sorted(Path(path).parent.glob(f"{Path(path).stem}-*.xml")):
+            lastmods.update(URL_PATTERN.findall(part.read_text(encoding='utf-8')))
+    return lastmods
+
+
+def load_state(path=SITEMAP_STATE):
+    try:
+        data = json.loads(Path(path).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    return data.get('urls', {}) if data.get('format') == SITEMAP_FORMAT else {}
+
+
+def state_bytes(urls):
+    data = {'format': SITEMAP_FORMAT, 'urls': urls}
+    return (json.dumps(data, indent=1, sort_keys=True) + '\n').encode('utf-8')
+
+
+def last_commit_date(path):
+    """Date of the last commit touching path, or None outside a git checkout."""
+    try:
+        result = subprocess.run(['git', 'log', '-1', '--format=%cs', '--', str(path)],
+                                cwd=REPO_ROOT, capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def resolve_lastmods(entries, state, seeds, today):
+    """New state {loc: {'hash', 'lastmod'}} plus the locs added and changed.
+
+    A URL seen for the first time is dated from the existing sitemap, then
+    its own date (blog posts), then the last commit of its source file.
+    """
+    urls, added, changed = {}, [], []
+    for entry in entries:
+        known = state.get(entry.loc)
+        if known is None:
+            lastmod = (seeds.get(entry.loc) or entry.first_seen
+                       or (entry.source and last_commit_date(entry.source)) or today)
+            added.append(entry.loc)
+        elif known['hash'] != entry.digest:
+            lastmod = today
+            changed.append(entry.loc)
+        else:
+            lastmod = known['lastmod']
+        urls[entry.loc] = {'hash': entry.digest, 'lastmod': lastmod}
+    return urls, added, changed
+
+
+def _urlset(entries, urls):
+    yield b'<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield b'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+    for entry in entries:
+        yield (
+            f"  <url>\n"
+            f"    <loc>{escape(entry.loc)}</loc>\n"
+            f"    <lastmod>{urls[entry.loc]['lastmod']}</lastmod>\n"
+            f"    <changefreq>{entry.changefreq}</changefreq>\n"
+            f"    <priority>{entry.priority}</priority>\n"
+            f"  </url>\n"
+        ).encode('utf-8')
+    yield b'</urlset>\n'
+
+
+def _sitemap_index(parts):
+    yield b'<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield b'<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+    for name, lastmod in parts:
+        yield (
+            f"  <sitemap>\n"
+            f"    <loc>{escape(BASE_URL)}/{escape(name)}</loc>\n"
+            f"    <lastmod>{lastmod}</lastmod>\n"
+            f"  </sitemap>\n"
+        ).encode('utf-8')
+    yield b'</sitemapindex>\n'
+
+
+def render_files(entries, urls, name='sitemap.xml', max_urls=MAX_URLS):
+    """{file name: chunk iterator}: one urlset, or an index plus numbered urlsets."""
+    if len(entries) <= max_urls:
+        return {name: _urlset(entries, urls)}
+    stem = name.rsplit('.', 1)[0]
+    files, parts = {}, []
+    for number, start in enumerate(range(0, len(entries), max_urls), 1):
+        chunk = entries[start:start + max_urls]
+        part = f"{stem}-{number}.xml"
+        files[part] = _urlset(chunk, urls)
+        parts.append((part, max(urls[entry.loc]['lastmod'] for entry in chunk)))
+    files[name] = _sitemap_index(parts)
+    return files
+
+
+def _write_if_changed(path, chunks, check, written):
+    data = b''.join(chunks) if check else None
+    if check:
+        try:
+            if path.read_bytes() != data:
+                written.append(path)
+        except FileNotFoundError:
+            written.append(path)
+        return
+    # Stream to a temp file, then compare; keeps mtimes stable for unchanged sitemaps
+    tmp = path.with_name(f".{path.name}.new")
+    atomic_write(tmp, chunks)
+    try:
+        if path.exists() and path.read_bytes() == tmp.read_bytes():
+            return
+        tmp.replace(path)
+        written.append(path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+def generate_sitemap(outputs=None, state_path=SITEMAP_STATE, max_urls=MAX_URLS, today=None, check=False):
+    """Regenerate the sitemap(s); with check=True only report what would change."""
+    outputs = [Path(p) for p in (outputs or SITEMAP_OUTPUTS)]
+    today = today or date.today().isoformat()
+    entries = collect_entries()
+    state = load_state(state_path)
+    urls, added, changed = resolve_lastmods(entries, state, existing_lastmods(outputs[:1]), today)
+    report = SitemapReport(urls=len(entries), changed=changed, added=added,
+                           removed=sorted(set(state) - set(urls)), written=[])
+
+    for output in outputs:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        files = render_files(entries, urls, output.name, max_urls)
+        for name, chunks in files.items():
+            _write_if_changed(output.parent / name, chunks, check, report.written)
+        # Numbered parts left over from a larger sitemap
+        stem = output.name.rsplit('.', 1)[0]
+        for stale in output.parent.glob(f"{stem}-*.xml"):
+            if re.fullmatch(rf"{re.escape(stem)}-\d+\.xml", stale.name) and stale.name not in files:
+                report.written.append(stale)
+                if not check:
+                    stale.unlink()
+
+    _write_if_changed(Path(state_path), iter([state_bytes(urls)]), check, report.written)
+    return report
+
+
+def print_sitemap_report(report, check=False):
+    for loc in report.added:
+        print(f"  + {loc}")
+    for loc in report.changed:
+        print(f"  ~ {loc}")
+    for loc in report.removed:
+        print(f"  - {loc}")
+    verb = 'Would write' if check else 'Wrote'
+    for path in report.written:
+        print(f"{'⚠' if check else '✓'} {verb} {display_path(path)}")
+    print(f"\n{'='*60}")
+    print(f"URLs: {report.urls}")
+    print(f"Added: {len(report.added)}, changed: {len(report.changed)}, removed: {len(report.removed)}")
+    print(f"Files {'out of date' if check else 'written'}: {len(report.written)}")
+    print(f"{'='*60}")
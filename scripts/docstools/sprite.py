@@ -0,0 +1,257 @@
+"""
+Move inline SVG icons repeated across the docs into one cached sprite file.
+
+Every inline <svg> outside <script>, <style>, <pre> and <textarea> is keyed
+by its viewBox and whitespace-normalized body. Icons that occur at least
+MIN_REPEATS times across the docs pages and partials (or that the sprite
+already holds) become <symbol>s in docs/icons.<hash>.svg, and each
+occurrence is replaced with
+
+    <svg width=... stroke=...><use href="/docs/icons.<hash>.svg#i-<key>"></use></svg>
+
+The outer element keeps its own attributes, so size, colour and stroke
+still apply per use. The file name changes with the sprite's content, so
+it can be cached forever; references to an older sprite are rewritten and
+the old file is removed. Page scans are cached in .docs-cache/svg-sprite.json,
+so a re-run only reads pages that changed, and a run with nothing to do
+writes nothing.
+"""
+
+import hashlib
+import json
+import re
+import xml.etree.ElementTree as ET
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .cache import CACHE_DIR, cache_key
+from .engine import CANONICAL_DOCS_DIR, atomic_write, content_hash, display_path, iter_html_files
+from .partials import PARTIALS_DIR
+
+SPRITE_CACHE = CACHE_DIR / 'svg-sprite.json'
+SPRITE_FORMAT = 1
+SPRITE_URL = '/docs/'
+MIN_REPEATS = 2
+
+SVG_PATTERN = re.compile(r'<svg\b([^>]*)>(.*?)</svg\s*>', re.DOTALL | re.IGNORECASE)
+OPAQUE_PATTERN = re.compile(r'<(script|style|pre|textarea)\b.*?</\1\s*>', re.DOTALL | re.IGNORECASE)
+VIEWBOX_PATTERN = re.compile(r'\sviewBox\s*=\s*"([^"]*)"')
+XMLNS_PATTERN = re.compile(r'\s+xmlns(?::\w+)?\s*=\s*"[^"]*"')
+USE_PATTERN = re.compile(r'<use href="' + re.escape(SPRITE_URL) + r'(icons\.[0-9a-f]+\.svg)#(i-[0-9a-f]+)"')
+SYMBOL_PATTERN = re.compile(r'<symbol id="(i-[0-9a-f]+)" viewBox="([^"]*)">(.*?)</symbol>', re.DOTALL)
+# Icons with ids, text or nested documents are not safe to share
+UNSHAREABLE = re.compile(r'<(?:svg|use|title|desc|text|image|foreignObject|script|style)\b|\sid\s*=',
+                         re.IGNORECASE)
+
+
+@dataclass
+class Icon:
+    """One shareable icon: its symbol id, viewBox and normalized body."""
+    id: str
+    view_box: str
+    body: str
+
+
+@dataclass
+class SpriteReport:
+    sprite: Path = None
+    symbols: int = 0
+    scanned: int = 0
+    pages: list = field(default_factory=list)   # rewritten files
+    replaced: int = 0
+    saved_bytes: int = 0
+    removed: list = field(default_factory=list)  # stale sprite files
+    dangling: list = field(default_factory=list)
+
+
+def _icon(attrs, inner):
+    view_box = VIEWBOX_PATTERN.search(attrs)
+    if view_box is None or UNSHAREABLE.search(inner):
+        return None
+    body = re.sub(r'>\s+<', '><', ' '.join(inner.split()))
+    try:
+        # The sprite is a standalone XML document, so the body must parse as XML
+        ET.fromstring(f'<g xmlns="http://www.w3.org/2000/svg">{body}</g>')
+    except ET.ParseError:
+        return None
+    key = hashlib.sha256(f"{view_box.group(1)}|{body}".encode('utf-8')).hexdigest()[:10]
+    return Icon(f"i-{key}", view_box.group(1), body)
+
+
+def iter_icons(content):
+    """Yield (Icon, match) for every shareable inline SVG in content."""
+    opaque = [(m.start(), m.end()) for m in OPAQUE_PATTERN.finditer(content)]
+    for match in SVG_PATTERN.finditer(content):
+        if any(start <= match.start() < end for start, end in opaque):
+            continue
+        icon = _icon(match.group(1), match.group(2))
+        if icon is not None:
+            yield icon, match
+
+
+def scan(content):
+    """Cache entry body for a page: its inline icon ids and sprite references."""
+    return {
+        'icons': [icon.id for icon, _ in iter_icons(content)],
+        'refs': sorted({f"{name}#{symbol}" for name, symbol in USE_PATTERN.findall(content)}),
+    }
+
+
+def use_markup(icon, attrs, sprite_name):
+    attrs = XMLNS_PATTERN.sub('', attrs)
+    return f'<svg{attrs}><use href="{SPRITE_URL}{sprite_name}#{icon.id}"></use></svg>'
+
+
+def render_sprite(icons):
+    """Sprite document for the given icons, in id order so output is stable."""
+    symbols = ''.join(
+        f'<symbol id="{icon.id}" viewBox="{icon.view_box}">{icon.body}</symbol>\n'
+        for icon in sorted(icons, key=lambda icon: icon.id)
+    )
+    return f'<svg xmlns="http://www.w3.org/2000/svg">\n{symbols}</svg>\n'.encode('utf-8')
+
+
+def sprite_name(data):
+    return f"icons.{content_hash(data)[:10]}.svg"
+
+
+def read_sprites(docs_dir):
+    """{symbol id: Icon} from every sprite file currently in docs_dir."""
+    icons = {}
+    for path in sorted(Path(docs_dir).glob('icons.*.svg')):
+        for symbol, view_box, body in SYMBOL_PATTERN.findall(path.read_text(encoding='utf-8')):
+            icons[symbol] = Icon(symbol, view_box, body)
+    return icons
+
+
+def load_cache(path=SPRITE_CACHE):
+    try:
+        data = json.loads(Path(path).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    return data.get('pages', {}) if data.get('format') == SPRITE_FORMAT else {}
+
+
+def save_cache(pages, path=SPRITE_CACHE):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {'format': SPRITE_FORMAT, 'pages': pages}
+    atomic_write(path, json.dumps(data, indent=1, sort_keys=True).encode('utf-8'))
+
+
+def page_entry(path, entry=None):
+    """Cached scan for a file, or a fresh one; returns (entry, scanned)."""
+    stat = path.stat()
+    if entry and entry.get('size') == stat.st_size and entry.get('mtime_ns') == stat.st_mtime_ns:
+        return entry, False
+    data = path.read_bytes()
+    digest = content_hash(data)
+    if entry and entry.get('hash') == digest:
+        return dict(entry, size=stat.st_size, mtime_ns=stat.st_mtime_ns), False
+    return dict(scan(data.decode('utf-8')), hash=digest, size=stat.st_size, mtime_ns=stat.st_mtime_ns), True
+
+
+def sprite_sources(docs_dir=CANONICAL_DOCS_DIR):
+    """Docs pages plus the partials that get injected into them."""
+    return list(iter_html_files([docs_dir])) + sorted(PARTIALS_DIR.glob('*.html'))
+
+
+def build_sprite(docs_dir=CANONICAL_DOCS_DIR, min_repeats=MIN_REPEATS, use_cache=True,
+                 check=False, cache_path=SPRITE_CACHE):
+    """Bring the sprite and every icon reference up to date; returns a SpriteReport.
+
+    With check, nothing is written; the report lists what would change.
+    """
+    docs_dir = Path(docs_dir)
+    report = SpriteReport()
+    cached = load_cache(cache_path) if use_cache else {}
+    entries = {}
+    for path in sprite_sources(docs_dir):
+        entry, scanned = page_entry(path, cached.get(cache_key(path)))
+        entries[path] = entry
+        report.scanned += scanned
+
+    existing = read_sprites(docs_dir)
+    counts = Counter(icon for entry in entries.values() for icon in entry['icons'])
+    shared = {icon for icon, count in counts.items() if count >= min_repeats or icon in existing}
+    referenced = {ref.split('#')[1] for entry in entries.values() for ref in entry['refs']}
+    report.dangling = sorted(referenced - set(existing))
+
+    # Symbols still referenced keep their sprite markup; shared inline icons are added
+    icons = {symbol: existing[symbol] for symbol in referenced if symbol in existing}
+    pending = {}
+    for path, entry in entries.items():
+        if shared & set(entry['icons']):
+            pending[path] = path.read_text(encoding='utf-8')
+            for icon, _ in iter_icons(pending[path]):
+                if icon.id in shared:
+                    icons.setdefault(icon.id, icon)
+
+    data = render_sprite(icons.values()) if icons else None
+    name = sprite_name(data) if data else None
+    report.symbols = len(icons)
+    report.sprite = docs_dir / name if name else None
+    # Files that only reference an older sprite are read just to retarget them
+    for path, entry in entries.items():
+        if path not in pending and any(ref.split('#')[0] != name for ref in entry['refs']):
+            pending[path] = path.read_text(encoding='utf-8')
+
+    def rewrite(content):
+        def replace_svg(match):
+            icon = _icon(match.group(1), match.group(2))
+            if icon is None or icon.id not in icons:
+                return match.group(0)
+            report.replaced += 1
+            return use_markup(icon, match.group(1), name)
+
+        opaque = [(m.start(), m.end()) for m in OPAQUE_PATTERN.finditer(content)]
+        parts, last = [], 0
+        for match in SVG_PATTERN.finditer(content):
+            if any(start <= match.start() < end for start, end in opaque):
+                continue
+            parts += [content[last:match.start()], replace_svg(match)]
+            last = match.end()
+        content = ''.join(parts) + content[last:]
+        return USE_PATTERN.sub(lambda m: f'<use href="{SPRITE_URL}{name}#{m.group(2)}"', content)
+
+    for path, content in pending.items():
+        updated = rewrite(content)
+        if updated == content:
+            continue
+        new_data = updated.encode('utf-8')
+        report.saved_bytes += len(content.encode('utf-8')) - len(new_data)
+        report.pages.append(path)
+        if check:
+            continue
+        atomic_write(path, new_data)
+        stat = path.stat()
+        entries[path] = dict(scan(updated), hash=content_hash(new_data), size=stat.st_size,
+                             mtime_ns=stat.st_mtime_ns)
+
+    stale = [path for path in sorted(docs_dir.glob('icons.*.svg')) if path.name != name]
+    report.removed = stale
+    if not check:
+        if data is not None and not report.sprite.exists():
+            atomic_write(report.sprite, data)
+        for path in stale:
+            path.unlink()
+        save_cache({cache_key(path): entry for path, entry in entries.items()}, cache_path)
+    return report
+
+
+def print_sprite_report(report, check=False):
+    prefix = 'would rewrite' if check else 'Rewrote'
+    for path in report.pages:
+        print(f"{'✗' if check else '✓'} {prefix}: {display_path(path)}")
+    for path in report.removed:
+        print(f"{'✗ would remove' if check else '✓ Removed'} stale sprite: {display_path(path)}")
+    for symbol in report.dangling:
+        print(f"⚠ {symbol} is referenced but in no sprite file")
+    print(f"\n{'='*60}")
+    print(f"Sprite: {display_path(report.sprite) if report.sprite else '(none)'} ({report.symbols} symbols)")
+    print(f"Files scanned: {report.scanned} (others unchanged since the last run)")
+    print(f"Icons replaced: {report.replaced} in {len(report.pages)} file(s)")
+    if report.saved_bytes:
+        print(f"Inline bytes saved: {report.saved_bytes:,}")
+    print(f"{'='*60}")
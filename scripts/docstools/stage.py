@@ -0,0 +1,216 @@
+"""
+Assemble the deployable site (_site/) from a declarative manifest.
+
+scripts/site-manifest.json lists every input: source files, directories or
+globs (relative to the repository root), where each lands in the output,
+which entries may be absent, aliases such as 404.html, empty marker files,
+and generated siblings (precompressed .gz/.br) that survive pruning as
+long as their base file is staged unchanged. Later entries win when two
+map to the same output path.
+
+Staging first resolves the whole plan and refuses to touch the output if
+a required input is missing. Files are then hardlinked (or reflinked, or
+copied) into place using the same cheap-first comparison as the mirror
+sync, so a rerun only replaces files that changed, and files no entry
+produces any more are removed.
+"""
+
+import fnmatch
+import glob
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .engine import REPO_ROOT, display_path
+from .sync import SYNC_MODES, iter_tree, place_file, same_file
+
+SITE_MANIFEST = REPO_ROOT / 'scripts' / 'site-manifest.json'
+ENTRY_KEYS = {'src', 'dest', 'exclude', 'optional', 'note'}
+
+
+@dataclass
+class StagePlan:
+    """Output path -> source file, plus the required inputs that are missing."""
+    files: dict = field(default_factory=dict)
+    empty: list = field(default_factory=list)
+    missing: list = field(default_factory=list)
+
+
+@dataclass
+class StageReport:
+    """What staging did, with per-phase timings in seconds."""
+    output: Path
+    files: int = 0
+    added: list = field(default_factory=list)
+    updated: list = field(default_factory=list)
+    removed: list = field(default_factory=list)
+    unchanged: int = 0
+    linked_bytes: int = 0     # placed by sharing the source's data (hardlink)
+    copied_bytes: int = 0     # placed by writing (or cloning) a new copy
+    total_bytes: int = 0
+    missing: list = field(default_factory=list)
+    errors: list = field(default_factory=list)
+    timings: dict = field(default_factory=dict)
+
+
+def load_manifest(path=SITE_MANIFEST):
+    """Read and validate the staging manifest."""
+    manifest = json.loads(Path(path).read_text(encoding='utf-8'))
+    for entry in manifest.get('entries', []):
+        if 'src' not in entry:
+            raise ValueError(f"{path}: entry without 'src': {entry}")
+        unknown = set(entry) - ENTRY_KEYS
+        if unknown:
+            raise ValueError(f"{path}: unknown key(s) {', '.join(sorted(unknown))} in entry for {entry['src']}")
+    if manifest.get('mode', 'link') not in SYNC_MODES:
+        raise ValueError(f"{path}: unknown mode {manifest['mode']!r} (expected one of {', '.join(SYNC_MODES)})")
+    return manifest
+
+
+def _excluded(rel, patterns):
+    return any(fnmatch.fnmatch(rel, pattern) or rel.startswith(pattern.rstrip('/') + '/')
+               for pattern in patterns)
+
+
+def plan_site(manifest, root=REPO_ROOT):
+    """Resolve every manifest entry to concrete files; nothing is touched."""
+    plan = StagePlan()
+    root = Path(root)
+    for entry in manifest.get('entries', []):
+        matches = sorted(glob.glob(str(root / entry['src'])))
+        if not matches:
+            if not entry.get('optional'):
+                plan.missing.append(entry['src'])
+            continue
+        dest = entry.get('dest', '').strip('/')
+        for match in map(Path, matches):
+            if match.is_dir():
+                for rel in iter_tree(match):
+                    rel = rel.as_posix()
+                    if not _excluded(rel, entry.get('exclude', [])):
+                        plan.files[f"{dest}/{rel}" if dest else rel] = match / rel
+            else:
+                plan.files[f"{dest}/{match.name}" if dest else match.name] = match
+
+    for alias, target in manifest.get('copies', {}).items():
+        if target in plan.files:
+            plan.files[alias] = plan.files[target]
+        else:
+            plan.missing.append(f"{target} (for {alias})")
+    plan.empty = list(manifest.get('empty', []))
+    return plan
+
+
+def _preserved(rel, planned, replaced, patterns):
+    # Generated siblings (index.html.gz) stay as long as their base file is
+    # staged and was not replaced by this run, which would make them stale
+    base = rel.rsplit('.', 1)[0]
+    return (any(fnmatch.fnmatch(rel, pattern) for pattern in patterns)
+            and base in planned and base not in replaced)
+
+
+def stage_site(manifest, output=None, mode=None, prune=True, dry_run=False, root=REPO_ROOT):
+    """Bring output up to date with the manifest; returns a StageReport."""
+    output = Path(output or Path(root) / manifest.get('output', '_site'))
+    mode = mode or manifest.get('mode', 'link')
+    report = StageReport(output)
+
+    start = time.perf_counter()
+    plan = plan_site(manifest, root)
+    report.timings['plan'] = time.perf_counter() - start
+    report.missing = plan.missing
+    report.files = len(plan.files) + len(plan.empty)
+    if plan.missing:
+        return report
+
+    start = time.perf_counter()
+    for rel, src in sorted(plan.files.items()):
+        dst = output / rel
+        size = src.stat().st_size
+        report.total_bytes += size
+        if dst.exists() and not dst.is_symlink() and same_file(src, dst, mode):
+            report.unchanged += 1
+            continue
+        (report.updated if dst.exists() else report.added).append(rel)
+        if dry_run:
+            continue
+        try:
+            place_file(src, dst, mode)
+        except OSError as e:
+            report.errors.append((rel, str(e)))
+            continue
+        if os.path.samefile(src, dst):
+            report.linked_bytes += size
+        else:
+            report.copied_bytes += size
+    for rel in plan.empty:
+        dst = output / rel
+        if dst.exists():
+            report.unchanged += 1
+            continue
+        report.added.append(rel)
+        if not dry_run:
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            dst.touch()
+    report.timings['place'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    if prune and output.exists():
+        planned = set(plan.files) | set(plan.empty)
+        replaced = set(report.added) | set(report.updated)
+        for rel in iter_tree(output):
+            rel = rel.as_posix()
+            if rel in planned or _preserved(rel, planned, replaced, manifest.get('preserve', [])):
+                continue
+            report.removed.append(rel)
+            if not dry_run:
+                try:
+                    (output / rel).unlink()
+                except OSError as e:
+                    report.errors.append((rel, str(e)))
+        if not dry_run:
+            # Directories emptied by pruning, deepest first
+            for dirpath, dirnames, filenames in os.walk(output, topdown=False):
+                if dirpath != str(output) and not os.listdir(dirpath):
+                    os.rmdir(dirpath)
+    report.timings['prune'] = time.perf_counter() - start
+    return report
+
+
+def _size(size):
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024 or unit == 'MB':
+            return f"{size:,.0f} {unit}" if unit == 'B' else f"{size:,.1f} {unit}"
+        size /= 1024
+
+
+def print_stage_report(report, verbose=False, dry_run=False):
+    """Print what staging changed, byte counts and phase timings."""
+    for src in report.missing:
+        print(f"✗ Missing required input: {src}")
+    if report.missing:
+        print(f"\n✗ Nothing staged: {len(report.missing)} required input(s) missing")
+        return
+    prefix = 'would ' if dry_run else ''
+    if verbose:
+        for rel in report.added:
+            print(f"  ✓ {prefix}add: {rel}")
+        for rel in report.updated:
+            print(f"  ✓ {prefix}update: {rel}")
+        for rel in report.removed:
+            print(f"  ✓ {prefix}remove: {rel}")
+    for rel, error in report.errors:
+        print(f"  ✗ Error staging {rel}: {error}")
+
+    print(f"\n{'='*60}")
+    print(f"Staged {report.files} files into {display_path(report.output)}/ ({_size(report.total_bytes)})")
+    print(f"Added: {len(report.added)}, updated: {len(report.updated)}, "
+          f"removed: {len(report.removed)}, unchanged: {report.unchanged}")
+    if not dry_run:
+        print(f"Bytes linked: {_size(report.linked_bytes)}, copied: {_size(report.copied_bytes)}")
+    print('Time: ' + ', '.join(f"{phase} {seconds * 1000:.0f} ms" for phase, seconds in report.timings.items()))
+    if report.errors:
+        print(f"Errors: {len(report.errors)}")
+    print(f"{'='*60}")
@@ -0,0 +1,179 @@
+"""
+Lift the CSS shared by every docs page out of the inline <style> blocks
+into one fingerprinted stylesheet next to theme-styles.css.
+
+A rule is shared only when it appears in every page. Moving it out of the
+<style> block puts it ahead of the page's remaining inline rules, so a
+rule is only lifted when no rule it would swap places with can style the
+same element with the same property; that keeps the cascade identical on
+every page.
+"""
+
+import re
+from pathlib import Path
+
+from .css import normalize_rule, rule_targets, rules_conflict, split_rules
+from .engine import CANONICAL_DOCS_DIR, Transform, atomic_write, content_hash, iter_html_files, run
+
+STYLE_BLOCK_PATTERN = re.compile(r'(<style>)(.*?)(</style>)', re.DOTALL)
+SHARED_PREFIX = 'docs-common'
+SHARED_LINK_PATTERN = re.compile(
+    r'([ \t]*)<link rel="stylesheet" href="/docs/(' + SHARED_PREFIX + r'\.[0-9a-f]+\.css)">\n?'
+)
+SHARED_HEADER = '/* Shared docs styles, generated by scripts/extract-docs-css.py. Do not edit. */\n'
+
+
+def read_page_rules(content, docs_dir):
+    """Return (rules from the currently linked shared sheet, inline rules) for a page."""
+    shared = []
+    link = SHARED_LINK_PATTERN.search(content)
+    if link:
+        sheet = Path(docs_dir) / link.group(2)
+        if sheet.exists():
+            shared, _ = split_rules(sheet.read_text(encoding='utf-8').replace(SHARED_HEADER, '', 1))
+    style = STYLE_BLOCK_PATTERN.search(content)
+    inline = split_rules(style.group(2))[0] if style else []
+    return shared, inline
+
+
+def _plan_once(keyed, targets):
+    # Present exactly once in every page
+    shared = set(keyed[0])
+    for keys in keyed:
+        shared &= {key for key in set(keys) if keys.count(key) == 1}
+    order = [key for key in keyed[0] if key in shared]
+
+    changed = True
+    while changed:
+        changed = False
+        rank = {key: i for i, key in enumerate(order)}
+        for keys in keyed:
+            before = []  # rules that stay ahead of the current one after the move
+            for key in keys:
+                if key in shared:
+                    # Page-specific rules before it, and shared rules placed after it in
+                    # the sheet, would swap places with it in the cascade
+                    swapped = [other for other in before
+                               if other not in shared or rank[other] > rank[key]]
+                    if any(rules_conflict(targets[key], targets[other]) for other in swapped):
+                        shared.discard(key)
+                        changed = True
+                before.append(key)
+            if changed:
+                break
+        order = [key for key in order if key in shared]
+    return order
+
+
+def plan_shared_rules(pages):
+    """Pick the normalized rules that can move to the shared sheet, in sheet order.
+
+    pages is a list of rule lists (the full effective CSS of each page, in
+    cascade order). Planning repeats on the would-be result until the shared
+    set stops growing, so running the extraction again is a no-op.
+    """
+    if not pages:
+        return []
+    keyed = [[normalize_rule(rule) for rule in rules] for rules in pages]
+    targets = {}
+    for rules, keys in zip(pages, keyed):
+        for rule, key in zip(rules, keys):
+            if key not in targets:
+                targets[key] = rule_targets(rule)
+
+    order = []
+    while True:
+        new_order = _plan_once(keyed, targets)
+        if len(new_order) <= len(order):
+            return order
+        order = new_order
+        shared = set(order)
+        keyed = [order + [key for key in keys if key not in shared] for keys in keyed]
+
+
+def render_sheet(rules):
+    """Serialize shared rules (raw text, in order) into the stylesheet body."""
+    return SHARED_HEADER + '\n'.join(rule.strip('\n') for rule in rules) + '\n'
+
+
+def rewrite_page(content, shared_keys, href, docs_dir=None):
+    """Drop shared rules from the inline block and link the shared sheet."""
+    old_link = SHARED_LINK_PATTERN.search(content)
+    style = STYLE_BLOCK_PATTERN.search(content)
+    if not style:
+        return content
+
+    linked_rules = []
+    if old_link:
+        # Rules from the previous sheet that are no longer shared move back inline
+        linked_rules = [rule for rule in read_page_rules(content, docs_dir or CANONICAL_DOCS_DIR)[0]
+                        if normalize_rule(rule) not in shared_keys]
+
+    inline, tail = split_rules(style.group(2))
+    kept = [rule for rule in inline if normalize_rule(rule) not in shared_keys]
+    restored = ''.join('\n' + rule.strip('\n') for rule in linked_rules)
+    new_style = style.group(1) + restored + ''.join(kept) + tail + style.group(3)
+
+    start, end = style.span()
+    if old_link:
+        # Keep the existing link, just point it at the new fingerprint
+        link_start, link_end = old_link.span()
+        link = f'{old_link.group(1)}<link rel="stylesheet" href="{href}">\n'
+        if link_end <= start:
+            return content[:link_start] + link + content[link_end:start] + new_style + content[end:]
+        return content[:start] + new_style + content[end:link_start] + link + content[link_end:]
+
+    line_start = content.rfind('\n', 0, start) + 1
+    indent = content[line_start:start] if not content[line_start:start].strip() else ''
+    link = f'<link rel="stylesheet" href="{href}">\n{indent}'
+    return content[:start] + link + new_style + content[end:]
+
+
+def extract_shared_css(docs_dir=None, dry_run=False):
+    """Plan, write and link the shared stylesheet for one docs tree.
+
+    Returns (sheet path or None, shared rule count, per-page FileResults).
+    """
+    docs_dir = Path(docs_dir or CANONICAL_DOCS_DIR)
+    pages = [path for path in iter_html_files([docs_dir])
+             if STYLE_BLOCK_PATTERN.search(path.read_text(encoding='utf-8'))]
+    if not pages:
+        return None, 0, []
+
+    effective = []
+    for path in pages:
+        shared, inline = read_page_rules(path.read_text(encoding='utf-8'), docs_dir)
+        effective.append(shared + inline)
+
+    order = plan_shared_rules(effective)
+    if not order:
+        return None, 0, []
+
+    raw = {}
+    for rules in effective:
+        for rule in rules:
+            raw.setdefault(normalize_rule(rule), rule)
+    body = render_sheet([raw[key] for key in order])
+    name = f"{SHARED_PREFIX}.{content_hash(body.encode('utf-8'))[:10]}.css"
+    sheet = docs_dir / name
+    href = f"/docs/{name}"
+    shared_keys = set(order)
+
+    if dry_run:
+        return sheet, len(order), []
+
+    # Write the sheet before any page points at it
+    if not sheet.exists():
+        atomic_write(sheet, body.encode('utf-8'))
+
+    def link_shared(content, path):
+        return rewrite_page(content, shared_keys, href, docs_dir)
+
+    results = run([Transform('extract-css', link_shared, 0)], pages)
+
+    # Old fingerprints are unreachable once every page links the new one
+    if not any(result.status == 'error' for result in results):
+        for old in docs_dir.glob(f"{SHARED_PREFIX}.*.css"):
+            if old != sheet:
+                old.unlink()
+    return sheet, len(order), results
@@ -0,0 +1,156 @@
+"""
+Keep generated docs mirrors in sync with the canonical docs tree.
+
+docs/ is the canonical source (it is what gets deployed); client/public/docs/
+is a mirror for the Vite dev server and is regenerated from it by hardlink,
+reflink (copy-on-write) or an incremental copy of only the files that differ.
+"""
+
+import os
+import shutil
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .engine import CANONICAL_DOCS_DIR, MIRROR_DOCS_DIRS, REPO_ROOT, content_hash
+
+SYNC_MODES = ('copy', 'reflink', 'link')
+
+# Linux FICLONE ioctl: share extents between two files on CoW filesystems
+FICLONE = 0x40049409
+
+
+@dataclass
+class SyncReport:
+    """What a sync (or drift check) found for one mirror."""
+    source: Path
+    mirror: Path
+    missing: list = field(default_factory=list)   # in source, not in mirror
+    changed: list = field(default_factory=list)   # content differs
+    extra: list = field(default_factory=list)     # only in mirror
+    unchanged: int = 0
+    errors: list = field(default_factory=list)
+    pruned: bool = False
+
+    @property
+    def drift(self):
+        return bool(self.missing or self.changed or self.extra)
+
+
+def iter_tree(root):
+    """Yield paths of every file under root, relative to it."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            yield (Path(dirpath) / filename).relative_to(root)
+
+
+def same_file(src, dst, mode='copy'):
+    """Cheap-first comparison: inode, then size and mtime, then content hash."""
+    try:
+        src_stat, dst_stat = src.stat(), dst.stat()
+    except FileNotFoundError:
+        return False
+    if (src_stat.st_dev, src_stat.st_ino) == (dst_stat.st_dev, dst_stat.st_ino):
+        return True
+    if mode == 'link' or src_stat.st_size != dst_stat.st_size:
+        return False
+    if src_stat.st_mtime_ns == dst_stat.st_mtime_ns:
+        return True
+    return content_hash(src.read_bytes()) == content_hash(dst.read_bytes())
+
+
+def _reflink(src, dst):
+    import fcntl
+
+    with open(src, 'rb') as src_file, open(dst, 'wb') as dst_file:
+        fcntl.ioctl(dst_file.fileno(), FICLONE, src_file.fileno())
+    shutil.copystat(src, dst)
+
+
+def place_file(src, dst, mode='copy'):
+    """Materialize src at dst via a temp name so readers never see a partial file."""
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dst.with_name(f".{dst.name}.sync-tmp")
+    if tmp.exists():
+        tmp.unlink()
+    try:
+        if mode == 'link':
+            try:
+                os.link(src, tmp)
+            except OSError:
+                shutil.copy2(src, tmp)
+        elif mode == 'reflink':
+            try:
+                _reflink(src, tmp)
+            except (OSError, ImportError):
+                shutil.copy2(src, tmp)
+        else:
+            shutil.copy2(src, tmp)
+        os.replace(tmp, dst)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+def sync_tree(source, mirror, mode='copy', prune=False, check=False):
+    """Bring mirror up to date with source; with check=True only report drift."""
+    if mode not in SYNC_MODES:
+        raise ValueError(f"Unknown sync mode: {mode} (expected one of {', '.join(SYNC_MODES)})")
+    source, mirror = Path(source), Path(mirror)
+    report = SyncReport(source, mirror)
+
+    source_files = list(iter_tree(source))
+    mirror_files = set(iter_tree(mirror)) if mirror.exists() else set()
+
+    for rel in source_files:
+        src, dst = source / rel, mirror / rel
+        if rel not in mirror_files:
+            report.missing.append(rel)
+        elif same_file(src, dst, mode):
+            report.unchanged += 1
+            continue
+        else:
+            report.changed.append(rel)
+        if not check:
+            try:
+                place_file(src, dst, mode)
+            except OSError as e:
+                report.errors.append((rel, str(e)))
+
+    report.extra = sorted(mirror_files - set(source_files))
+    if prune and not check:
+        report.pruned = True
+        for rel in report.extra:
+            try:
+                (mirror / rel).unlink()
+            except OSError as e:
+                report.errors.append((rel, str(e)))
+    return report
+
+
+def sync_mirrors(mode='copy', prune=False, check=False, source=None, mirrors=None):
+    """Sync every mirror from the canonical docs tree; returns their SyncReports."""
+    source = source or CANONICAL_DOCS_DIR
+    return [
+        sync_tree(source, mirror, mode=mode, prune=prune, check=check)
+        for mirror in (mirrors or MIRROR_DOCS_DIRS)
+    ]
+
+
+def print_sync_report(report, check=False, verbose=False):
+    """Print a sync report in the same style as the transform summaries."""
+    try:
+        mirror = report.mirror.resolve().relative_to(REPO_ROOT)
+    except ValueError:
+        mirror = report.mirror
+    print(f"\n📁 Mirror: {mirror}/")
+    for rel in report.missing:
+        print(f"  {'✗ missing' if check else '✓ added'}: {rel}")
+    for rel in report.changed:
+        print(f"  {'✗ differs' if check else '✓ updated'}: {rel}")
+    for rel in report.extra:
+        print(f"  {'✓ removed' if report.pruned else '⚠ only in mirror'}: {rel}")
+    for rel, error in report.errors:
+        print(f"  ✗ Error syncing {rel}: {error}")
+    if verbose or not report.drift:
+        print(f"  {report.unchanged} file(s) already in sync")
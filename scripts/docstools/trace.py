@@ -0,0 +1,195 @@
+"""
+Instrumentation for transform runs: per-page traces and optional profiling.
+
+With tracing on, run() records for every page when it was processed, how
+long it took, its size before and after, and why it was skipped (stat or
+hash match against the manifest); and for every transform on it the
+time, bytes in and out, and how many edits it spliced in. Worker
+processes return these with their results, so tracing works with --jobs.
+
+write_trace() emits the records as JSON Lines (one object per page and per
+transform) or as a Chrome trace (load it in chrome://tracing or
+ui.perfetto.dev; each worker process is a track). A profiler can be
+switched on for a run as well: 'cprofile' for deterministic call counts,
+or 'sample' for a low-overhead stack sampler whose folded output feeds
+flamegraph tools.
+"""
+
+import cProfile
+import io
+import json
+import pstats
+import signal
+import sys
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+
+from .cache import CACHE_DIR
+from .engine import atomic_write, display_path
+
+TRACE_FORMATS = ('jsonl', 'chrome')
+PROFILERS = ('cprofile', 'sample')
+PROFILE_PATHS = {
+    'cprofile': CACHE_DIR / 'profile.prof',
+    'sample': CACHE_DIR / 'profile.folded',
+}
+SAMPLE_INTERVAL = 0.001
+
+
+def trace_records(results):
+    """Yield one flat record per traced page and per transform run on it."""
+    for result in results:
+        trace = result.trace
+        if trace is None:
+            continue
+        page = display_path(result.path).as_posix()
+        yield {
+            'type': 'page',
+            'page': page,
+            'status': result.status,
+            'reason': trace.get('reason'),
+            'pid': trace['pid'],
+            'start': trace['start'],
+            'seconds': trace['seconds'],
+            'bytes_in': trace.get('bytes_in'),
+            'bytes_out': trace.get('bytes_out'),
+        }
+        for span in trace.get('transforms', []):
+            yield dict(span, type='transform', page=page, pid=trace['pid'])
+
+
+def _chrome_events(records):
+    records = list(records)
+    origin = min((record['start'] for record in records), default=0)
+    for record in records:
+        name = record['page'] if record['type'] == 'page' else record['transform']
+        args = {key: value for key, value in record.items()
+                if key not in ('type', 'pid', 'start', 'seconds') and value is not None}
+        yield {
+            'name': name,
+            'cat': record['type'],
+            'ph': 'X',
+            'ts': round((record['start'] - origin) * 1e6, 1),
+            'dur': round(record['seconds'] * 1e6, 1),
+            'pid': 1,
+            'tid': record['pid'],
+            'args': args,
+        }
+
+
+def write_trace(results, path, fmt='jsonl'):
+    """Write the trace of a run to path as JSON Lines or a Chrome trace."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    records = trace_records(results)
+    if fmt == 'chrome':
+        data = {'traceEvents': list(_chrome_events(records)), 'displayTimeUnit': 'ms'}
+        atomic_write(path, json.dumps(data, separators=(',', ':')).encode('utf-8'))
+    else:
+        atomic_write(path, (json.dumps(record, separators=(',', ':')).encode('utf-8') + b'\n'
+                            for record in records))
+
+
+def print_trace_summary(results, top=5):
+    """Per-transform totals, skip reasons and the slowest pages of a traced run."""
+    totals = defaultdict(lambda: {'seconds': 0.0, 'pages': 0, 'changed': 0, 'matches': 0, 'delta': 0})
+    reasons = Counter()
+    pages = []
+    for record in trace_records(results):
+        if record['type'] == 'page':
+            pages.append(record)
+            if record['reason']:
+                reasons[record['reason']] += 1
+            continue
+        total = totals[record['transform']]
+        total['seconds'] += record['seconds']
+        total['pages'] += 1
+        total['changed'] += record['changed']
+        total['matches'] += record['matches']
+        total['delta'] += record['bytes_out'] - record['bytes_in']
+    if not pages:
+        return
+
+    print("\n⏱️  Trace")
+    for name, total in sorted(totals.items(), key=lambda item: -item[1]['seconds']):
+        print(f"  {name:<18} {total['seconds'] * 1000:8.1f} ms over {total['pages']} page(s), "
+              f"{total['changed']} changed, {total['matches']} edit(s), {total['delta']:+,} bytes")
+    if reasons:
+        print('  skipped: ' + ', '.join(f"{count} by {reason}" for reason, count in reasons.most_common()))
+    for record in sorted(pages, key=lambda record: -record['seconds'])[:top]:
+        print(f"  slowest: {record['page']} {record['seconds'] * 1000:.1f} ms ({record['status']})")
+
+
+class StackSampler:
+    """Record the Python stack every interval of CPU time (SIGPROF, Unix only)."""
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks = Counter()
+
+    def _sample(self, signum, frame):
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(f"{Path(code.co_filename).name}:{code.co_name}")
+            frame = frame.f_back
+        self.stacks[';'.join(reversed(stack))] += 1
+
+    def start(self):
+        signal.signal(signal.SIGPROF, self._sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+
+    def stop(self):
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        signal.signal(signal.SIGPROF, signal.SIG_DFL)
+
+    def folded(self):
+        """Stacks in the folded format flamegraph.pl and speedscope read."""
+        return ''.join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def print_top(self, limit=15):
+        leaves = Counter()
+        for stack, count in self.stacks.items():
+            leaves[stack.rsplit(';', 1)[-1]] += count
+        samples = sum(leaves.values()) or 1
+        for leaf, count in leaves.most_common(limit):
+            print(f"  {count / samples:6.1%}  {leaf}")
+
+
+@contextmanager
+def profiling(kind, path=None):
+    """Profile the block with 'cprofile' or 'sample' (None disables it) and save the result."""
+    if kind is None:
+        yield
+        return
+    if kind not in PROFILERS:
+        raise ValueError(f"Unknown profiler: {kind} (expected one of {', '.join(PROFILERS)})")
+    if kind == 'sample' and not hasattr(signal, 'setitimer'):
+        raise ValueError("The sampling profiler needs setitimer, which this platform lacks")
+    path = Path(path or PROFILE_PATHS[kind])
+    path.parent.mkdir(parents=True, exist_ok=True)
+    profiler = cProfile.Profile() if kind == 'cprofile' else StackSampler()
+    (profiler.enable if kind == 'cprofile' else profiler.start)()
+    try:
+        yield
+    finally:
+        (profiler.disable if kind == 'cprofile' else profiler.stop)()
+        print(f"\n🔬 Profile ({kind}) written to {display_path(path)}")
+        if kind == 'cprofile':
+            profiler.dump_stats(path)
+            out = io.StringIO()
+            pstats.Stats(profiler, stream=out).sort_stats('cumulative').print_stats(15)
+            sys.stdout.write(out.getvalue())
+        else:
+            atomic_write(path, profiler.folded().encode('utf-8'))
+            profiler.print_top()
+
+
+def profile_jobs(kind, jobs):
+    """Profilers only see the current process, so a profiled run is serial."""
+    if kind is not None and jobs != 1:
+        print(f"⚠ Profiling runs in one process (ignoring {jobs} jobs)", file=sys.stderr)
+        return 1
+    return jobs
+
@@ -0,0 +1,177 @@
+"""
+Built-in docs transforms, ported from the standalone scripts in scripts/.
+Shared markup (footer, header, theme toggle) comes from scripts/partials/.
+
+Each transform is a pure function of the page content; the engine decides
+when to read and write. Edits are located through the page's region index
+and spliced by offset, so a page is tokenized once (and again only after an
+edit) instead of regex-scanned once per pattern. Importing this module
+registers them all.
+"""
+
+import re
+
+from .engine import transform
+from .images import IMAGES_MANIFEST, picture_markup, resolve_src
+from .partials import partial_path, render_partial
+from .regions import build_index, index_regions, replace_regions, splice
+from .sidebar import SIDEBAR_JSON, page_href, render_sidebar
+
+# A <picture> this transform generated, or a bare <img>
+PICTURE_OR_IMG_PATTERN = re.compile(
+    r'<picture>\s*(?:<source\b[^>]*>\s*)*(<img\b[^>]*>)\s*</picture>|(<img\b[^>]*>)'
+)
+SRC_PATTERN = re.compile(r'\ssrc\s*=\s*(?:"([^"]*)"|\'([^\']*)\')')
+SEARCH_SCRIPT = '<script src="/docs/search.js" defer></script>'
+SITE_URL = 'https://kubegraf.io'
+RAW_TEXT_SPECS = {'script': ('script', None, None), 'style': ('style', None, None)}
+CANONICAL_PATTERN = re.compile(r'<link\s+rel="canonical"\s+href="([^"]+)"', re.IGNORECASE)
+# The share-image tags, with the image URL as group 2
+SHARE_IMAGE_PATTERN = re.compile(
+    r'(<meta\s+(?:property="og:image"|name="twitter:image")\s+content=")([^"]*)(")', re.IGNORECASE
+)
+
+# Light theme background used by the landing page
+LIGHT_BG_PATTERN = re.compile(
+    r'(:root\[data-theme="light"\]\s*\{[^}]*--bg:\s*)#ffffff;',
+    re.DOTALL
+)
+
+
+def _is_emoji_button(region, content, emoji):
+    return region.inner(content).strip() == emoji
+
+
+@transform('bg-color', order=10)
+def fix_bg_color(content, path):
+    """Use #faf6e9 instead of #ffffff for the light theme background."""
+    edits = []
+    for region in index_regions(content)['style']:
+        css = region.inner(content)
+        updated = LIGHT_BG_PATTERN.sub(r'\1#faf6e9;', css)
+        if updated != css:
+            edits.append((region.inner_start, region.inner_end, updated))
+    return splice(content, edits) if edits else content
+
+
+@transform('header', order=15, default=False, inputs=[partial_path('header')])
+def header(content, path):
+    """Replace the navbar with the header partial."""
+    return replace_regions(content, {'header': render_partial('header')})
+
+
+@transform('footer', order=20, default=False, inputs=[partial_path('footer')])
+def footer(content, path):
+    """Replace the footer with the footer partial."""
+    return replace_regions(content, {'footer': render_partial('footer')})
+
+
+@transform('footer-layout', order=20, default=False, version=2,
+           inputs=[partial_path('footer', 'layout')])
+def footer_layout(content, path):
+    """Replace the footer with the Footer.tsx grid layout."""
+    return replace_regions(content, {'footer': render_partial('footer', 'layout')})
+
+
+@transform('footer-columns', order=20, default=False, version=2,
+           inputs=[partial_path('footer', 'columns')])
+def footer_columns(content, path):
+    """Replace the footer with the inline-styled column layout."""
+    return replace_regions(content, {'footer': render_partial('footer', 'columns')})
+
+
+@transform('theme-toggle', order=30, inputs=[partial_path('theme-toggle', 'emoji')])
+def theme_toggle(content, path):
+    """Collapse the light/dark theme buttons into a single toggle."""
+    index = index_regions(content)
+    edits = []
+    for light in index['theme-light']:
+        dark = next((d for d in index['theme-dark'] if d.start >= light.end), None)
+        if (dark is not None
+                and not content[light.end:dark.start].strip()
+                and _is_emoji_button(light, content, '☀️')
+                and _is_emoji_button(dark, content, '🌙')):
+            edits.append((light.start, dark.end, render_partial('theme-toggle', 'emoji')))
+    return splice(content, edits) if edits else content
+
+
+@transform('theme-toggle-svg', order=40, inputs=[partial_path('theme-toggle')])
+def theme_toggle_svg(content, path):
+    """Use the SVG sun icon instead of the emoji in the theme toggle."""
+    button = render_partial('theme-toggle')
+    edits = [
+        (region.start, region.end, button)
+        for region in index_regions(content)['theme-toggle']
+        if _is_emoji_button(region, content, '☀️')
+    ]
+    return splice(content, edits) if edits else content
+
+
+@transform('sidebar', order=50, default=False, version=2, inputs=[SIDEBAR_JSON])
+def sidebar(content, path):
+    """Regenerate the sidebar navigation from docs/sidebar.json."""
+    if not index_regions(content)['sidebar']:
+        return content
+    rendered = render_sidebar(page_href(path))
+    # Sidebars that only differ in indentation or blank lines are left alone
+    return replace_regions(content, {'sidebar': lambda old: old if old.split() == rendered.split() else rendered})
+
+
+@transform('picture', order=60, default=False, inputs=[IMAGES_MANIFEST])
+def picture(content, path):
+    """Serve optimized WebP/AVIF screenshot variants through <picture> and srcset."""
+    def rewrite(match):
+        img = match.group(1) or match.group(2)
+        src = SRC_PATTERN.search(img)
+        src = src and (src.group(1) if src.group(1) is not None else src.group(2))
+        source = resolve_src(src, path) if src and src.lower().endswith('.png') else None
+        if source is None or not source.is_file():
+            return match.group(0)
+        line_start = content.rfind('\n', 0, match.start()) + 1
+        indent = content[line_start:match.start()]
+        indent = indent if not indent.strip() else ''
+        markup = picture_markup(img, src, source, indent)
+        # Without variants, unwrap a <picture> we generated earlier
+        return markup if markup is not None else img
+
+    return PICTURE_OR_IMG_PATTERN.sub(rewrite, content)
+
+
+@transform('search', order=70, default=False, version=2)
+def search(content, path):
+    """Load the docs search box (search.js) on every page."""
+    raw = build_index(content, RAW_TEXT_SPECS)
+    if any(region.text(content) == SEARCH_SCRIPT for region in raw['script']):
+        return content
+    # The last </body> that is markup, not text inside a script or style
+    # element (an unterminated <script> swallows the rest of the page)
+    body = content.rfind('</body>')
+    for region in sorted(raw['script'] + raw['style'], key=lambda region: region.start, reverse=True):
+        if region.inner_start <= body < region.inner_end:
+            body = content.rfind('</body>', 0, region.start)
+    if body == -1:
+        return content
+    line_start = content.rfind('\n', 0, body) + 1
+    if content[line_start:body].strip():
+        return f"{content[:body]}{SEARCH_SCRIPT}{content[body:]}"
+    return f"{content[:line_start]}    {SEARCH_SCRIPT}\n{content[line_start:]}"
+
+
+def og_card_url(route):
+    """URL of the card `script/generate-og-image.py --pages` renders for a docs route."""
+    rel = route[len('/docs/'):] or 'index.html'
+    if rel.endswith('/'):
+        rel += 'index.html'
+    return f"{SITE_URL}/og/docs/{rel.rsplit('.', 1)[0]}.jpg"
+
+
+@transform('og-image', order=80, default=False)
+def og_image(content, path):
+    """Point og:image and twitter:image at the page's own OpenGraph card."""
+    # Duplicate pages share the card of the URL they declare canonical
+    canonical = CANONICAL_PATTERN.search(content)
+    route = canonical.group(1) if canonical else SITE_URL + page_href(path)
+    if not route.startswith(SITE_URL + '/docs/'):
+        return content
+    card = og_card_url(route[len(SITE_URL):])
+    return SHARE_IMAGE_PATTERN.sub(lambda m: f"{m.group(1)}{card}{m.group(3)}", content)
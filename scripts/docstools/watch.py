@@ -0,0 +1,377 @@
+"""
+Watch the docs tree and re-apply transforms only where something changed.
+
+The transform pipeline, compiled patterns and rendered partials stay warm in
+one long-running process. Every page is transformed once at startup while
+recording which shared inputs (partials, sidebar.json, image variants)
+each transform read for it; that dependency graph decides what an edit
+touches:
+
+- an edited page is re-transformed on its own;
+- an edited shared input re-stamps the pipeline and re-transforms only
+  the pages that read it, or, for a transform's declared inputs, the pages
+  that transform read anything for;
+- other docs files (CSS, JS, JSON) are only copied to the mirrors.
+
+Changes are picked up with inotify on Linux (through ctypes, no extra
+dependency) and by polling mtimes elsewhere. The page manifest in
+.docs-cache/ is kept current, so a later docs-rewrite.py run skips pages
+the watcher already processed.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from .cache import Manifest, make_entry
+from .engine import (
+    CANONICAL_DOCS_DIR,
+    MIRROR_DOCS_DIRS,
+    atomic_write,
+    content_hash,
+    display_path,
+    get_pipeline,
+    track_inputs,
+)
+from .partials import PARTIALS_DIR
+from .sync import place_file
+
+# inotify(7) event masks
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_ISDIR = 0x40000000
+IN_IGNORED = 0x00008000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+EVENT_HEADER = struct.Struct('iIII')
+
+# Wait this long after an event for the rest of an editor's save to arrive
+DEBOUNCE = 0.05
+POLL_INTERVAL = 0.5
+
+
+class InotifyWatcher:
+    """Recursive directory watcher on the Linux inotify API."""
+
+    def __init__(self):
+        libc_name = ctypes.util.find_library('c')
+        if not libc_name:
+            raise OSError('libc not found')
+        self.libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self.libc, 'inotify_init1'):
+            raise OSError('inotify is not available on this platform')
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self.dirs = {}  # watch descriptor -> directory
+
+    def watch_tree(self, root):
+        for dirpath, dirnames, _ in os.walk(root):
+            dirnames[:] = [name for name in dirnames if not name.startswith('.')]
+            self._add(Path(dirpath))
+
+    def _add(self, directory):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            error = ctypes.get_errno()
+            if error != errno.ENOENT:
+                raise OSError(error, f"inotify_add_watch failed for {directory}")
+            return
+        self.dirs[wd] = directory
+
+    def read(self, timeout):
+        """Paths changed, created or deleted within timeout seconds (empty if none)."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+        changed = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+            directory = self.dirs.get(wd)
+            if mask & IN_IGNORED:
+                self.dirs.pop(wd, None)
+                continue
+            if directory is None or not name:
+                continue
+            path = directory / os.fsdecode(name)
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    # A new directory: watch it and treat everything already in it as new
+                    self.watch_tree(path)
+                    changed.update(p for p in path.rglob('*') if p.is_file())
+                continue
+            changed.add(path)
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollWatcher:
+    """Portable fallback that compares file mtimes every interval."""
+
+    def __init__(self, interval=POLL_INTERVAL):
+        self.interval = interval
+        self.roots = []
+        self.snapshot = {}
+
+    def _scan(self):
+        state = {}
+        for root in self.roots:
+            for dirpath, dirnames, filenames in os.walk(root):
+                dirnames[:] = [name for name in dirnames if not name.startswith('.')]
+                for filename in filenames:
+                    path = Path(dirpath) / filename
+                    try:
+                        stat = path.stat()
+                    except FileNotFoundError:
+                        continue
+                    state[path] = (stat.st_mtime_ns, stat.st_size)
+        return state
+
+    def watch_tree(self, root):
+        self.roots.append(Path(root))
+        self.snapshot = self._scan()
+
+    def read(self, timeout):
+        time.sleep(min(timeout, self.interval) if timeout is not None else self.interval)
+        state = self._scan()
+        changed = {path for path in state.keys() | self.snapshot.keys()
+                   if state.get(path) != self.snapshot.get(path)}
+        self.snapshot = state
+        return changed
+
+    def close(self):
+        pass
+
+
+def make_watcher(poll=False, interval=POLL_INTERVAL):
+    """An inotify watcher where supported, else a polling one."""
+    if not poll:
+        try:
+            return InotifyWatcher()
+        except (OSError, AttributeError):
+            pass
+    return PollWatcher(interval)
+
+
+class DependencyGraph:
+    """Which shared inputs each transform read for each page on its last run."""
+
+    def __init__(self):
+        self.reads = {}  # page -> {transform name: {input path}}
+
+    def update(self, page, reads):
+        self.reads[page] = reads
+
+    def forget(self, page):
+        self.reads.pop(page, None)
+
+    def inputs(self):
+        return {path for reads in self.reads.values() for paths in reads.values() for path in paths}
+
+    def dependents(self, changed, declared_by):
+        """Pages to re-run after an input changed.
+
+        declared_by names the transforms that list the input in inputs=[];
+        for those, any page the transform read something for depends on it.
+        """
+        pages = set()
+        for page, reads in self.reads.items():
+            for name, paths in reads.items():
+                if changed in paths or (name in declared_by and paths):
+                    pages.add(page)
+                    break
+        return pages
+
+
+class DocsWatcher:
+    """Warm transform pipeline plus dependency graph over one docs tree."""
+
+    def __init__(self, names=None, docs_dir=CANONICAL_DOCS_DIR, mirrors=None, use_cache=True):
+        self.names = names
+        self.docs_dir = Path(docs_dir).resolve()
+        self.mirrors = MIRROR_DOCS_DIRS if mirrors is None else mirrors
+        self.pipeline = get_pipeline(names)
+        self.manifest = Manifest() if use_cache else None
+        self.graph = DependencyGraph()
+        self.seen = {}  # page -> hash of the content last read or written
+
+    def declared_inputs(self):
+        """{input path: {transform names declaring it}} for the current pipeline."""
+        declared = defaultdict(set)
+        for t in self.pipeline:
+            for path in t.inputs:
+                declared[Path(path).resolve()].add(t.name)
+        return declared
+
+    def watch_roots(self):
+        roots = {self.docs_dir, PARTIALS_DIR.resolve()}
+        roots.update(path.parent for path in self.declared_inputs())
+        return sorted(root for root in roots if root.is_dir())
+
+    def transform_page(self, page):
+        """Run the pipeline over one page, recording what each transform read."""
+        start = time.perf_counter()
+        data = page.read_bytes()
+        digest = content_hash(data)
+        content = data.decode('utf-8')
+        reads, applied = {}, []
+        for t in self.pipeline:
+            with track_inputs() as inputs:
+                updated = t.func(content, page)
+            reads[t.name] = inputs
+            if updated != content:
+                applied.append(t.name)
+                content = updated
+        self.graph.update(page, reads)
+
+        new_data = content.encode('utf-8')
+        if new_data != data:
+            atomic_write(page, new_data)
+            digest = content_hash(new_data)
+            self.sync_file(page)
+        self.seen[page] = digest
+        if self.manifest is not None:
+            entry = self.manifest.get(page)
+            self.manifest.put(page, make_entry(entry, digest, page.stat(), self.pipeline,
+                                               changed=new_data != data))
+        return applied, len(new_data) - len(data), time.perf_counter() - start
+
+    def sync_file(self, path):
+        """Copy a docs file to the mirrors, or remove it there; True if any mirror changed."""
+        rel = path.relative_to(self.docs_dir)
+        synced = False
+        for mirror in self.mirrors:
+            target = Path(mirror) / rel
+            if path.exists():
+                place_file(path, target)
+                synced = True
+            elif target.exists():
+                target.unlink()
+                synced = True
+        return synced
+
+    def prime(self):
+        """Transform every page once to build the dependency graph; returns (pages, updated)."""
+        updated = 0
+        pages = sorted(self.docs_dir.rglob('*.html'))
+        for page in pages:
+            try:
+                applied, delta, elapsed = self.transform_page(page)
+            except Exception as e:
+                print(f"✗ Error transforming {display_path(page)}: {type(e).__name__}: {e}")
+                continue
+            if applied:
+                updated += 1
+                self._print_update(page, applied, delta, elapsed)
+        if self.manifest is not None:
+            self.manifest.save()
+        return len(pages), updated
+
+    def _print_update(self, page, applied, delta, elapsed):
+        print(f"✓ Updated: {display_path(page)} ({', '.join(applied)}, {delta:+,} bytes, {elapsed * 1000:.1f} ms)")
+
+    def handle(self, changed):
+        """React to a batch of changed paths."""
+        declared = self.declared_inputs()
+        tracked = self.graph.inputs() | set(declared)
+        pages, inputs, dependents = set(), set(), set()
+        for path in changed:
+            path = path.resolve() if path.exists() else path
+            if path in tracked:
+                inputs.add(path)
+                # An input that lives in the docs tree (sidebar.json) is served from the mirrors too
+                if path.is_relative_to(self.docs_dir) and self.sync_file(path):
+                    print(f"⇢ Synced: {display_path(path)}")
+            elif path.is_relative_to(self.docs_dir) and not path.name.startswith('.'):
+                if path.suffix == '.html':
+                    pages.add(path)
+                elif self.sync_file(path):
+                    print(f"⇢ Synced: {display_path(path)}")
+
+        if inputs:
+            # Input hashes feed the transform stamps
+            self.pipeline = get_pipeline(self.names)
+            declared = self.declared_inputs()
+            for path in sorted(inputs):
+                affected = self.graph.dependents(path, declared.get(path, set()))
+                print(f"⇢ {display_path(path)} changed: {len(affected)} dependent page(s)")
+                dependents.update(affected)
+
+        for page in sorted(pages | dependents):
+            if not page.exists():
+                self.graph.forget(page)
+                self.seen.pop(page, None)
+                if self.manifest is not None:
+                    self.manifest.forget(page)
+                self.sync_file(page)
+                print(f"✓ Removed: {display_path(page)}")
+                continue
+            if page not in dependents and content_hash(page.read_bytes()) == self.seen.get(page):
+                continue  # our own write, or a save without changes
+            try:
+                applied, delta, elapsed = self.transform_page(page)
+            except Exception as e:
+                print(f"✗ Error transforming {display_path(page)}: {type(e).__name__}: {e}")
+                continue
+            if applied:
+                self._print_update(page, applied, delta, elapsed)
+            else:
+                print(f"  Checked: {display_path(page)} ({elapsed * 1000:.1f} ms)")
+        if self.manifest is not None:
+            self.manifest.save()
+
+
+def watch(names=None, poll=False, interval=POLL_INTERVAL, sync=True, use_cache=True):
+    """Prime the pipeline, then re-apply it to changes until interrupted."""
+    docs = DocsWatcher(names, mirrors=None if sync else [], use_cache=use_cache)
+    print(f"Pipeline: {' → '.join(t.name for t in docs.pipeline) or '(empty)'}")
+    start = time.perf_counter()
+    pages, updated = docs.prime()
+    print(f"Primed {pages} page(s) in {(time.perf_counter() - start) * 1000:.0f} ms "
+          f"({updated} updated, {len(docs.graph.inputs())} shared input(s) tracked)")
+
+    watcher = make_watcher(poll, interval)
+    for root in docs.watch_roots():
+        watcher.watch_tree(root)
+    kind = 'inotify' if isinstance(watcher, InotifyWatcher) else 'polling'
+    print(f"👀 Watching {', '.join(str(display_path(root)) for root in docs.watch_roots())} ({kind}); Ctrl-C to stop")
+    try:
+        while True:
+            changed = watcher.read(None)
+            if not changed:
+                continue
+            # Let the rest of a multi-file save arrive
+            while True:
+                more = watcher.read(DEBOUNCE)
+                if not more:
+                    break
+                changed |= more
+            docs.handle(changed)
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+    finally:
+        watcher.close()
+        if docs.manifest is not None:
+            docs.manifest.save()
+    return 0
@@ -0,0 +1,314 @@
+"""
+Measure what every docs page weighs and check it against budgets and a baseline.
+
+Each page is split into the bytes a visitor downloads for it:
+
+  text    markup and copy (the page minus the three inline kinds below)
+  css     <style> blocks and style="" attributes
+  svg     inline <svg> elements
+  js      inline <script> bodies
+  assets  local stylesheets, scripts, images and sprites it references
+
+each both raw and gzip-compressed (level 9, as precompress-site.py writes
+them). html is the page file itself and total adds the assets.
+
+scripts/page-budgets.json sets per-page limits on any metric (raw, or with
+a _gz suffix compressed) for fnmatch patterns over the page path, plus the
+growth allowed relative to scripts/page-weight-baseline.json, the committed
+measurements of the last accepted state. A page over budget, or grown by
+more than the allowed share since the baseline, fails the check.
+"""
+
+import fnmatch
+import gzip
+import json
+import posixpath
+import re
+import subprocess
+from dataclasses import dataclass, field
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+from .engine import ALL_DOCS_DIRS, REPO_ROOT, atomic_write, display_path, iter_html_files
+from .regions import build_index, parse_attrs
+
+PUBLIC_DIR = REPO_ROOT / 'client' / 'public'
+BUDGETS_PATH = REPO_ROOT / 'scripts' / 'page-budgets.json'
+BASELINE_PATH = REPO_ROOT / 'scripts' / 'page-weight-baseline.json'
+BASELINE_FORMAT = 1
+PARTS = ('text', 'css', 'svg', 'js', 'assets')
+METRICS = ('html',) + PARTS + ('total',)
+
+# Found with the region scanner, which skips over script and style text, so a
+# tag inside a script (or one left unterminated) is never taken for markup
+PART_SPECS = {'style': ('style', None, None), 'script': ('script', None, None), 'svg': ('svg', None, None)}
+STYLE_ATTR_PATTERN = re.compile(r'\sstyle\s*=\s*(?:"([^"]*)"|\'([^\']*)\')', re.IGNORECASE)
+ASSET_TAG_PATTERN = re.compile(r'<(link|script|img|use)\b([^>]*)>', re.IGNORECASE)
+
+
+@dataclass
+class PageWeight:
+    """Raw and gzip sizes of one page's parts, keyed by metric name."""
+    path: Path
+    raw: dict = field(default_factory=dict)
+    gz: dict = field(default_factory=dict)
+    assets: list = field(default_factory=list)  # local files the page pulls in
+
+    @property
+    def key(self):
+        return display_path(self.path).as_posix()
+
+    def metrics(self):
+        """{metric: bytes} with compressed sizes under '<metric>_gz'."""
+        flat = dict(self.raw)
+        flat.update({f"{name}_gz": size for name, size in self.gz.items()})
+        return flat
+
+
+@dataclass
+class WeightReport:
+    pages: list = field(default_factory=list)
+    over_budget: list = field(default_factory=list)   # (page key, metric, size, budget)
+    grown: list = field(default_factory=list)         # (page key, metric, before, after)
+    new_pages: list = field(default_factory=list)
+    baseline_commit: str = None
+
+
+def _gzip_size(data):
+    return len(gzip.compress(data, compresslevel=9, mtime=0)) if data else 0
+
+
+def asset_urls(html):
+    """Local URLs of the stylesheets, scripts, images and sprites a page loads."""
+    urls = []
+    for tag, attrs in ASSET_TAG_PATTERN.findall(html):
+        attrs = parse_attrs(attrs)
+        tag = tag.lower()
+        if tag == 'link':
+            rel = attrs.get('rel', '').lower().split()
+            url = attrs.get('href') if {'stylesheet', 'preload', 'modulepreload'} & set(rel) else None
+        elif tag == 'use':
+            url = attrs.get('href') or attrs.get('xlink:href')
+        else:
+            url = attrs.get('src')
+        if url and not urlsplit(url).scheme and not url.startswith('//'):
+            urls.append(url)
+    return urls
+
+
+def resolve_asset(url, page, docs_dir):
+    """File serving url for a page in docs_dir, or None if it is not local."""
+    path = unquote(urlsplit(url).path)
+    if not path:
+        return None
+    if not path.startswith('/'):
+        page_url = '/docs/' + page.relative_to(docs_dir).as_posix()
+        path = posixpath.normpath(posixpath.join(posixpath.dirname(page_url), path))
+    if path.startswith('/docs/'):
+        candidate = Path(docs_dir) / path[len('/docs/'):]
+    else:
+        candidate = PUBLIC_DIR / path.lstrip('/')
+        if not candidate.is_file():
+            candidate = REPO_ROOT / path.lstrip('/')
+    return candidate if candidate.is_file() else None
+
+
+def _cut(html, ranges):
+    # html without the (start, end) ranges, which may overlap or nest
+    pieces, pos = [], 0
+    for start, end in sorted(ranges):
+        if start > pos:
+            pieces.append(html[pos:start])
+        pos = max(pos, end)
+    pieces.append(html[pos:])
+    return ''.join(pieces)
+
+
+def measure_page(path, docs_dir, asset_sizes=None):
+    """Break one page down into its parts; asset_sizes caches (raw, gz) per file."""
+    asset_sizes = {} if asset_sizes is None else asset_sizes
+    data = path.read_bytes()
+    html = data.decode('utf-8')
+    weight = PageWeight(path)
+
+    regions = build_index(html, PART_SPECS)
+    # Outermost <svg> elements only; nested ones are part of their parent
+    svgs = []
+    for region in regions['svg']:
+        if not svgs or region.start >= svgs[-1].end:
+            svgs.append(region)
+    # Tags and attributes are only read from markup, never from script or style text
+    markup = _cut(html, [(r.inner_start, r.inner_end) for r in regions['style'] + regions['script']])
+
+    styles = [region.inner(html) for region in regions['style']]
+    styles += [m.group(1) if m.group(1) is not None else m.group(2) for m in STYLE_ATTR_PATTERN.finditer(markup)]
+    scripts = [region.inner(html) for region in regions['script']
+               if 'src' not in parse_attrs(html[region.start:region.inner_start])]
+    parts = {
+        'css': ''.join(styles).encode('utf-8'),
+        'svg': ''.join(region.text(html) for region in svgs).encode('utf-8'),
+        'js': ''.join(scripts).encode('utf-8'),
+    }
+    # Text is what remains once the inline CSS, SVG and JS are taken out
+    text = _cut(html, [(r.start, r.end) for r in regions['style'] + regions['script'] + svgs])
+    parts['text'] = STYLE_ATTR_PATTERN.sub('', text).encode('utf-8')
+
+    weight.raw['html'] = len(data)
+    weight.gz['html'] = _gzip_size(data)
+    for name, part in parts.items():
+        weight.raw[name] = len(part)
+        weight.gz[name] = _gzip_size(part)
+
+    weight.raw['assets'] = weight.gz['assets'] = 0
+    seen = set()
+    for url in asset_urls(markup):
+        asset = resolve_asset(url, path, docs_dir)
+        if asset is None or asset in seen:
+            continue
+        seen.add(asset)
+        if asset not in asset_sizes:
+            asset_data = asset.read_bytes()
+            asset_sizes[asset] = (len(asset_data), _gzip_size(asset_data))
+        raw, gz = asset_sizes[asset]
+        weight.raw['assets'] += raw
+        weight.gz['assets'] += gz
+        weight.assets.append(asset)
+    weight.raw['total'] = weight.raw['html'] + weight.raw['assets']
+    weight.gz['total'] = weight.gz['html'] + weight.gz['assets']
+    return weight
+
+
+def measure_pages(docs_dirs=None):
+    """PageWeights for every page in the docs trees, in path order."""
+    asset_sizes = {}
+    weights = []
+    for docs_dir in docs_dirs or ALL_DOCS_DIRS:
+        for path in iter_html_files([docs_dir]):
+            weights.append(measure_page(path, docs_dir, asset_sizes))
+    return weights
+
+
+def load_budgets(path=BUDGETS_PATH):
+    """Budget config; metric names are validated so a typo cannot disable a limit."""
+    config = json.loads(Path(path).read_text(encoding='utf-8'))
+    known = set(METRICS) | {f"{name}_gz" for name in METRICS}
+    for rule in config.get('budgets', []):
+        unknown = set(rule) - known - {'pages'}
+        if 'pages' not in rule or unknown:
+            raise ValueError(f"{path}: budget rule needs 'pages' and known metrics, got {sorted(rule)}")
+    for metric in config.get('growth_metrics', []):
+        if metric not in known:
+            raise ValueError(f"{path}: unknown growth metric {metric!r}")
+    return config
+
+
+def page_budget(key, config):
+    """{metric: limit} for a page; later matching rules override earlier ones."""
+    limits = {}
+    for rule in config.get('budgets', []):
+        patterns = rule['pages'] if isinstance(rule['pages'], list) else [rule['pages']]
+        if any(fnmatch.fnmatch(key, pattern) for pattern in patterns):
+            limits.update({metric: limit for metric, limit in rule.items() if metric != 'pages'})
+    return limits
+
+
+def load_baseline(path=BASELINE_PATH):
+    try:
+        data = json.loads(Path(path).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+    return data if data.get('format') == BASELINE_FORMAT else None
+
+
+def head_commit():
+    """Abbreviated HEAD commit, or None outside a git checkout."""
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                                capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def save_baseline(weights, path=BASELINE_PATH):
+    data = {
+        'format': BASELINE_FORMAT,
+        'commit': head_commit(),
+        'pages': {weight.key: weight.metrics() for weight in weights},
+    }
+    atomic_write(Path(path), (json.dumps(data, indent=1, sort_keys=True) + '\n').encode('utf-8'))
+
+
+def check_weights(weights, config, baseline=None, max_growth=None):
+    """Compare measurements with the budgets and the baseline; returns a WeightReport."""
+    report = WeightReport(pages=weights)
+    growth = config.get('max_growth_percent', 10) if max_growth is None else max_growth
+    min_bytes = config.get('min_growth_bytes', 0)
+    growth_metrics = config.get('growth_metrics', ['html', 'total_gz'])
+    previous = (baseline or {}).get('pages', {})
+    report.baseline_commit = (baseline or {}).get('commit')
+
+    for weight in weights:
+        metrics = weight.metrics()
+        for metric, limit in sorted(page_budget(weight.key, config).items()):
+            if metrics[metric] > limit:
+                report.over_budget.append((weight.key, metric, metrics[metric], limit))
+        if baseline is None:
+            continue
+        before = previous.get(weight.key)
+        if before is None:
+            report.new_pages.append(weight.key)
+            continue
+        for metric in growth_metrics:
+            old, new = before.get(metric), metrics[metric]
+            if old and new - old > min_bytes and (new - old) * 100 > old * growth:
+                report.grown.append((weight.key, metric, old, new))
+    return report
+
+
+def _kb(size):
+    return f"{size / 1024:,.1f}"
+
+
+def print_weight_report(report, baseline=None, verbose=False):
+    """Table of page weights plus the budget and growth failures."""
+    previous = (baseline or {}).get('pages', {})
+    failing = {key for key, *_ in report.over_budget} | {key for key, *_ in report.grown}
+    print(f"  {'page':<59} {'html':>7} {'text':>6} {'css':>6} {'svg':>6} {'js':>6} "
+          f"{'assets':>7} {'total':>7} {'gz':>6} {'Δ gz':>7}")
+    for weight in sorted(report.pages, key=lambda w: -w.gz['total']):
+        if not verbose and weight.key not in failing and weight.key in previous:
+            delta = weight.gz['total'] - previous[weight.key].get('total_gz', weight.gz['total'])
+            if not delta:
+                continue
+        before = previous.get(weight.key, {}).get('total_gz')
+        delta = '   new' if before is None else f"{(weight.gz['total'] - before) / 1024:+.1f}"
+        print(f"{'✗' if weight.key in failing else ' '} {weight.key:<59} {_kb(weight.raw['html']):>7} "
+              + ' '.join(f"{_kb(weight.raw[part]):>6}" for part in PARTS[:-1])
+              + f" {_kb(weight.raw['assets']):>7} {_kb(weight.raw['total']):>7} "
+              f"{_kb(weight.gz['total']):>6} {delta:>7}")
+    print("(sizes in KB; gz and Δ gz are the compressed total against the baseline)")
+
+    for key, metric, size, limit in report.over_budget:
+        print(f"✗ {key}: {metric} is {size:,} bytes, over its {limit:,} byte budget")
+    for key, metric, old, new in report.grown:
+        print(f"✗ {key}: {metric} grew {old:,} → {new:,} bytes (+{(new - old) / old:.1%})")
+
+    pages = len(report.pages)
+    raw = sum(w.raw['html'] for w in report.pages)
+    gz = sum(w.gz['html'] for w in report.pages)
+    print(f"\n{'='*60}")
+    print(f"Pages measured: {pages}")
+    if pages:
+        print(f"HTML: {raw:,} bytes raw, {gz:,} gzipped (average {gz // pages:,} per page)")
+        for part in PARTS[1:-1]:
+            share = sum(w.raw[part] for w in report.pages) / raw if raw else 0
+            print(f"  inline {part}: {share:.1%} of the HTML")
+    if baseline is None:
+        print("Baseline: none (run with --update-baseline to record one)")
+    else:
+        print(f"Baseline: {report.baseline_commit or 'unknown commit'}"
+              + (f", {len(report.new_pages)} page(s) not in it" if report.new_pages else ''))
+    print(f"Over budget: {len(report.over_budget)}")
+    print(f"Grown past the limit: {len(report.grown)}")
+    print(f"{'='*60}")
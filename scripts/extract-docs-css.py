@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Move the CSS shared by every docs page into a fingerprinted stylesheet.
+
+Rules present in every page's inline <style> block (and safe to reorder) are
+written to docs/docs-common.<hash>.css, removed from the pages, and replaced by
+a <link> to the sheet. Re-running re-plans from the linked sheet plus the
+remaining inline CSS, so it is idempotent and only rewrites pages when the
+shared set changes. The client/public/docs mirror is synced afterwards.
+
+Examples:
+    python3 scripts/extract-docs-css.py --dry-run
+    python3 scripts/extract-docs-css.py
+"""
+
+import argparse
+import sys
+
+from docstools import CANONICAL_DOCS_DIR
+from docstools.engine import report
+from docstools.stylesheet import extract_shared_css
+from docstools.sync import print_sync_report, sync_mirrors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--dry-run', action='store_true',
+                        help='only report what would be shared')
+    parser.add_argument('--no-sync', action='store_true',
+                        help='do not refresh client/public/docs/ from docs/ afterwards')
+    args = parser.parse_args()
+
+    sheet, shared_count, results = extract_shared_css(CANONICAL_DOCS_DIR, dry_run=args.dry_run)
+    if sheet is None:
+        print("⏭️  No CSS rules are shared by every page; nothing to extract")
+        return 0
+
+    print(f"📄 Shared stylesheet: {sheet.relative_to(CANONICAL_DOCS_DIR.parent)} ({shared_count} rules)")
+    if args.dry_run:
+        return 0
+
+    counts = report(results)
+    if not args.no_sync:
+        for sync_report in sync_mirrors():
+            print_sync_report(sync_report)
+    return 1 if counts['error'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
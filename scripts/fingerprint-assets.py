@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Copy static assets to content-hashed names and rewrite their references.
+
+Run after scripts/minify-site.py and before scripts/precompress-site.py.
+The files matched by the "fingerprint" globs in scripts/site-manifest.json
+(the docs JS and CSS and the binary-matrix logos) get a name.<hash>.ext
+copy next to the original, every HTML, CSS, JS and JSON file of the site
+is pointed at the new names, and the mapping is written to
+asset-manifest.json, so the fingerprinted copies can be served with
+immutable cache headers.
+
+Examples:
+    python3 scripts/fingerprint-assets.py
+    python3 scripts/fingerprint-assets.py --dry-run --verbose
+    python3 scripts/fingerprint-assets.py /tmp/site --manifest /tmp/site-manifest.json
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from docstools.fingerprint import SITE_DIR, fingerprint_site, print_fingerprint_report
+from docstools.stage import SITE_MANIFEST, load_manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('root', nargs='?', type=Path, default=SITE_DIR,
+                        help='staged site directory (default: _site/)')
+    parser.add_argument('--manifest', type=Path, default=SITE_MANIFEST,
+                        help='manifest with the fingerprint globs (default: scripts/site-manifest.json)')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='report what would be copied and rewritten without touching the site')
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help='list every file whose references were rewritten')
+    args = parser.parse_args()
+
+    if not args.root.is_dir():
+        parser.error(f'{args.root} is not a directory')
+    try:
+        patterns = load_manifest(args.manifest).get('fingerprint', [])
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    try:
+        report = fingerprint_site(args.root, patterns, dry_run=args.dry_run)
+    except ValueError as e:
+        print(f"✗ {e}")
+        return 1
+    print_fingerprint_report(report, verbose=args.verbose, dry_run=args.dry_run)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+"""
+Regenerate the sidebar navigation of every docs page from docs/sidebar.json.
+
+Runs the 'sidebar' transform over docs/ and syncs the client/public/docs
+mirror. Pages are only rewritten when sidebar.json changed since the last run
+or their rendered sidebar differs; use docs-rewrite.py -t sidebar to combine
+it with other transforms in one pass.
+
+Examples:
+    python3 scripts/generate-docs-sidebar.py
+    python3 scripts/generate-docs-sidebar.py --dry-run
+    python3 scripts/generate-docs-sidebar.py --check --jobs 4
+"""
+
+import sys
+
+from docstools import transform_main
+
+if __name__ == '__main__':
+    sys.exit(transform_main(['sidebar'], __doc__))
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Regenerate sitemap.xml from the docs tree, sidebar and blog routes.
+
+Docs pages that are their own canonical URL, the blog index and posts, and
+the main app pages are listed. Each <lastmod> only moves when that page's
+normalized content changes, tracked by the hashes in sitemap.state.json
+(commit it together with sitemap.xml). Large sitemaps are split into
+numbered files behind a sitemap index. --check exits 1 when the sitemap is
+out of date without writing anything.
+
+Examples:
+    python3 scripts/generate-sitemap.py
+    python3 scripts/generate-sitemap.py --check
+    python3 scripts/generate-sitemap.py --max-urls 1000
+"""
+
+import argparse
+import sys
+
+from docstools.sitemap import MAX_URLS, generate_sitemap, print_sitemap_report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--check', action='store_true',
+                        help='report whether the sitemap is up to date without writing (exit 1 if not)')
+    parser.add_argument('--max-urls', type=int, default=MAX_URLS, metavar='N',
+                        help=f'split into a sitemap index past N URLs per file (default: {MAX_URLS})')
+    args = parser.parse_args()
+
+    if args.max_urls < 1:
+        parser.error('--max-urls must be at least 1')
+
+    report = generate_sitemap(max_urls=args.max_urls, check=args.check)
+    print_sitemap_report(report, check=args.check)
+    if args.check and report.written:
+        print("\n✗ sitemap.xml is out of date; re-run without --check to update it")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
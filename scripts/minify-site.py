@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Minify the HTML, CSS and JS of the staged docs in place.
+
+Run after scripts/stage-site.py and before scripts/precompress-site.py. Page
+comments and indentation are removed, whitespace collapses (never inside
+<pre>, <textarea> or <code>), and inline and external CSS/JS are minified
+conservatively. Files are replaced, not written through, so hardlinks
+back into docs/ are never modified. Results are cached by input hash in
+.docs-cache/minify/.
+
+Examples:
+    python3 scripts/minify-site.py
+    python3 scripts/minify-site.py _site --jobs 4
+    python3 scripts/minify-site.py /tmp/site/docs --no-cache --verbose
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from docstools.engine import default_jobs
+from docstools.minify import SITE_DOCS_DIR, minify_tree, report_minify
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('root', nargs='?', type=Path, default=SITE_DOCS_DIR,
+                        help='directory to minify in place (default: _site/docs/)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='ignore .docs-cache/minify/ and minify every file again')
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help='also list files that were already minimal')
+    parser.add_argument('-j', '--jobs', type=int, default=None, metavar='N',
+                        help='worker processes (default: CPU count, 1 = serial)')
+    args = parser.parse_args()
+
+    if args.jobs is not None and args.jobs < 1:
+        parser.error('--jobs must be at least 1')
+    if not args.root.is_dir():
+        parser.error(f'{args.root} is not a directory')
+
+    results = minify_tree(args.root, jobs=args.jobs or default_jobs(), use_cache=not args.no_cache)
+    counts = report_minify(results, args.root, verbose=args.verbose)
+    return 1 if counts['error'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Losslessly recompress the site PNGs and build WebP/AVIF screenshot variants.
+
+Every PNG under docs/ and client/public/ is re-encoded and replaced only
+when the result is smaller and pixel-identical. Screenshots also get
+responsive WebP and AVIF variants (<name>-<width>w.webp/.avif), and the
+'picture' transform then rewrites the docs' <img> tags to <picture> with
+srcset. Unchanged images are skipped using .docs-cache/images.json.
+Requires Pillow (AVIF needs Pillow 11.2+ or the pillow-avif-plugin).
+
+Examples:
+    python3 scripts/optimize-images.py
+    python3 scripts/optimize-images.py --jobs 4 --no-rewrite
+    python3 scripts/optimize-images.py docs/assets/screenshots/web-dashboard.png
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from docstools import run_transforms
+from docstools.engine import default_jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('paths', nargs='*', type=Path,
+                        help='PNGs to process (default: every PNG under docs/ and client/public/)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='ignore .docs-cache/images.json and reprocess every image')
+    parser.add_argument('--no-rewrite', action='store_true',
+                        help='do not run the picture transform over the docs afterwards')
+    parser.add_argument('-j', '--jobs', type=int, default=None, metavar='N',
+                        help='worker processes (default: CPU count, 1 = serial)')
+    args = parser.parse_args()
+
+    if args.jobs is not None and args.jobs < 1:
+        parser.error('--jobs must be at least 1')
+
+    try:
+        from docstools.images import available_formats, optimize_images, report_images
+        formats = available_formats()
+    except ImportError:
+        parser.error('Pillow is required: pip install Pillow')
+    if not formats:
+        print("⚠ This Pillow build cannot encode WebP or AVIF; only recompressing PNGs")
+    elif 'avif' not in formats:
+        print("⚠ This Pillow build cannot encode AVIF; building WebP variants only")
+
+    results = optimize_images(args.paths or None, jobs=args.jobs or default_jobs(),
+                              use_cache=not args.no_cache, formats=formats)
+    counts = report_images(results)
+
+    status = 1 if counts['error'] else 0
+    if not args.no_rewrite:
+        print()
+        status = run_transforms(['picture']) or status
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Report what each docs page weighs and fail on budget or growth regressions.
+
+Every page in docs/ and client/public/docs/ is broken down into text,
+inline CSS, inline SVG, inline JS and the local assets it loads, raw and
+gzipped. Pages are checked against the limits in scripts/page-budgets.json
+and against scripts/page-weight-baseline.json: the run exits 1 when a
+page is over budget or has grown by more than the allowed percentage.
+After an intended change, record the new state with --update-baseline.
+
+Examples:
+    python3 scripts/page-weight.py
+    python3 scripts/page-weight.py --verbose --max-growth 5
+    python3 scripts/page-weight.py --canonical-only
+    python3 scripts/page-weight.py --update-baseline
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from docstools.engine import CANONICAL_DOCS_DIR
+from docstools.weight import (
+    BASELINE_PATH,
+    BUDGETS_PATH,
+    check_weights,
+    load_baseline,
+    load_budgets,
+    measure_pages,
+    print_weight_report,
+    save_baseline,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--budgets', type=Path, default=BUDGETS_PATH, metavar='PATH',
+                        help='budget config (default: scripts/page-budgets.json)')
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH, metavar='PATH',
+                        help='baseline measurements (default: scripts/page-weight-baseline.json)')
+    parser.add_argument('--max-growth', type=float, default=None, metavar='PERCENT',
+                        help='allowed growth over the baseline (default: from the budget config)')
+    parser.add_argument('--canonical-only', action='store_true',
+                        help='only measure docs/, not the client/public/docs/ mirror')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='record the current measurements as the new baseline')
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help='list every page, not only new, changed or failing ones')
+    args = parser.parse_args()
+
+    if args.max_growth is not None and args.max_growth < 0:
+        parser.error('--max-growth must not be negative')
+    try:
+        config = load_budgets(args.budgets)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    weights = measure_pages([CANONICAL_DOCS_DIR] if args.canonical_only else None)
+    baseline = load_baseline(args.baseline)
+    report = check_weights(weights, config, baseline, args.max_growth)
+    print_weight_report(report, baseline, verbose=args.verbose)
+
+    if args.update_baseline:
+        if report.over_budget:
+            print("\n✗ Not updating the baseline while pages are over budget")
+            return 1
+        save_baseline(weights, args.baseline)
+        print(f"\n✓ Baseline written to {args.baseline}")
+        return 0
+    if report.over_budget or report.grown:
+        print("\n✗ Page weight regressions found")
+        return 1
+    print("\n✅ All pages within budget")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Write .gz and .br siblings for every text asset of the built site.
+
+Run after the site is staged (by default into _site/). HTML, CSS, JS,
+JSON, SVG and other text files get <name>.gz at gzip level 9 and
+<name>.br at brotli quality 11, written atomically; files below 256 bytes
+are left uncompressed. Files whose content hash is unchanged since the
+last run (.docs-cache/precompress.json) are skipped. The .br siblings
+need the brotli module (pip install brotli) and are skipped without it,
+unless --require-brotli makes that an error (as in CI).
+
+Examples:
+    python3 scripts/precompress-site.py
+    python3 scripts/precompress-site.py dist --jobs 4
+    python3 scripts/precompress-site.py _site --no-cache --verbose
+    python3 scripts/precompress-site.py _site --require-brotli
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from docstools.compress import SITE_DIR, brotli, precompress, report_compression
+from docstools.engine import default_jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('root', nargs='?', type=Path, default=SITE_DIR,
+                        help='built site directory (default: _site/)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='ignore .docs-cache/precompress.json and recompress every file')
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help='also list the ratios of files that were skipped')
+    parser.add_argument('-j', '--jobs', type=int, default=None, metavar='N',
+                        help='worker processes (default: CPU count, 1 = serial)')
+    parser.add_argument('--require-brotli', action='store_true',
+                        help='fail instead of writing .gz siblings only when brotli is not installed')
+    args = parser.parse_args()
+
+    if args.jobs is not None and args.jobs < 1:
+        parser.error('--jobs must be at least 1')
+    if not args.root.is_dir():
+        parser.error(f'{args.root} is not a directory')
+
+    if brotli is None and args.require_brotli:
+        print("❌ The brotli module is not installed (pip install brotli); no .br siblings would be written")
+        return 1
+    if brotli is None:
+        print("⚠ The brotli module is not installed; writing .gz siblings only")
+
+    results = precompress(args.root, jobs=args.jobs or default_jobs(), use_cache=not args.no_cache)
+    counts = report_compression(results, args.root, verbose=args.verbose)
+    return 1 if counts['error'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
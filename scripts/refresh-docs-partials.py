@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Refresh the shared partials (header, footer, theme toggle) in every docs page.
+
+Replaces fix-docs-footer-layout.py, update-docs-footer.py and
+update-deployment-docs-footer.py: the markup now lives in scripts/partials/,
+is rendered once per variant, and is injected in a single pass over docs/
+before the client/public/docs mirror is synced. Pages whose partials are
+already current are skipped.
+
+Examples:
+    python3 scripts/refresh-docs-partials.py
+    python3 scripts/refresh-docs-partials.py --footer layout
+    python3 scripts/refresh-docs-partials.py --check
+    python3 scripts/refresh-docs-partials.py --list
+"""
+
+import argparse
+import sys
+
+from docstools import run_transforms
+from docstools.partials import list_partials
+
+# Footer variant -> transform that injects it
+FOOTER_TRANSFORMS = {
+    'default': 'footer',
+    'layout': 'footer-layout',
+    'columns': 'footer-columns',
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--footer', choices=sorted(FOOTER_TRANSFORMS), default='default',
+                        help='footer variant to inject (default: partials/footer.html)')
+    parser.add_argument('--no-header', action='store_true', help='leave the navbar alone')
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--dry-run', action='store_const', const='dry-run', dest='mode',
+                      help='print a unified diff and byte deltas without writing anything')
+    mode.add_argument('--check', action='store_const', const='check', dest='mode',
+                      help='exit 1 if any page (or the mirror) is out of date; writes nothing')
+    parser.add_argument('-j', '--jobs', type=int, default=None, metavar='N',
+                        help='worker processes (default: CPU count, 1 = serial)')
+    parser.add_argument('--list', action='store_true', help='list available partials and exit')
+    args = parser.parse_args()
+
+    if args.list:
+        for name, variant in list_partials():
+            print(f"  {name}{f' ({variant})' if variant else ''}")
+        return 0
+
+    names = [FOOTER_TRANSFORMS[args.footer], 'theme-toggle', 'theme-toggle-svg']
+    if not args.no_header:
+        names.insert(0, 'header')
+    return run_transforms(names, jobs=args.jobs, mode=args.mode or 'write')
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Assemble the deployable site in _site/ from scripts/site-manifest.json.
+
+Replaces the cp chain in the deploy workflow. Every input the manifest
+lists is required unless marked optional, and nothing is staged when one
+is missing. Files are hardlinked by default (--mode reflink clones them
+copy-on-write, --mode copy copies), only files that changed since the last
+staging are replaced, and stale files are removed. Run `npm run build`
+first so dist/ exists.
+
+Examples:
+    python3 scripts/stage-site.py
+    python3 scripts/stage-site.py --dry-run --verbose
+    python3 scripts/stage-site.py --mode copy --out /tmp/site
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from docstools.stage import SITE_MANIFEST, load_manifest, print_stage_report, stage_site
+from docstools.sync import SYNC_MODES
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--manifest', type=Path, default=SITE_MANIFEST,
+                        help='staging manifest (default: scripts/site-manifest.json)')
+    parser.add_argument('--out', type=Path, default=None,
+                        help="output directory (default: the manifest's output, _site/)")
+    parser.add_argument('--mode', choices=SYNC_MODES, default=None,
+                        help="how files are materialized (default: the manifest's mode, link)")
+    parser.add_argument('--no-prune', action='store_true',
+                        help='keep files in the output that no manifest entry produces')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='report what would change without touching the output')
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help='list every file added, updated or removed')
+    args = parser.parse_args()
+
+    try:
+        manifest = load_manifest(args.manifest)
+    except (OSError, ValueError) as e:
+        parser.error(f'cannot load manifest: {e}')
+
+    report = stage_site(manifest, output=args.out, mode=args.mode,
+                        prune=not args.no_prune, dry_run=args.dry_run)
+    print_stage_report(report, verbose=args.verbose, dry_run=args.dry_run)
+    return 1 if report.missing or report.errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
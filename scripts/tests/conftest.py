@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The scripts import docstools as a top-level package, the way they run from scripts/
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
@@ -0,0 +1,24 @@
+from docstools.css import property_family, rule_targets, rules_conflict
+from docstools.stylesheet import plan_shared_rules
+
+
+def test_shorthand_and_longhands_share_a_family():
+    assert property_family('margin') == property_family('margin-top')
+    assert property_family('background') == property_family('background-color')
+    assert property_family('border') == property_family('border-left-color')
+    assert property_family('font') == property_family('line-height')
+    assert property_family('inset') == property_family('top')
+    assert property_family('--accent') != property_family('--accent-dark')
+
+
+def test_shorthand_conflicts_with_longhand():
+    assert rules_conflict(rule_targets('.card{margin:0}'), rule_targets('.card{margin-top:5px}'))
+    assert not rules_conflict(rule_targets('.card{margin:0}'), rule_targets('.card{color:red}'))
+
+
+def test_shorthand_is_not_lifted_past_an_earlier_longhand():
+    pages = [
+        ['.card{margin-top:5px}', '.card{margin:0}', '.x{color:red}'],
+        ['.card{margin:0}', '.x{color:red}'],
+    ]
+    assert plan_shared_rules(pages) == ['.x{color:red}']
@@ -0,0 +1,27 @@
+from docstools.engine import TRANSFORMS, Transform, record_input
+from docstools.watch import DocsWatcher
+
+
+def test_changed_input_in_docs_tree_is_synced_to_mirrors(tmp_path, monkeypatch):
+    docs, mirror = tmp_path / 'docs', tmp_path / 'mirror'
+    docs.mkdir()
+    mirror.mkdir()
+    nav = docs / 'nav.json'
+    nav.write_text('["/docs/"]', encoding='utf-8')
+    (docs / 'index.html').write_text('<html><body></body></html>\n', encoding='utf-8')
+
+    def stamp_nav(content, path):
+        # Stands in for the sidebar transform and docs/sidebar.json
+        record_input(nav)
+        return content.split('<!--')[0] + f"<!--{nav.read_text(encoding='utf-8')}-->"
+
+    monkeypatch.setitem(TRANSFORMS, 'stamp-nav', Transform('stamp-nav', stamp_nav, 1, inputs=(nav,)))
+    watcher = DocsWatcher(['stamp-nav'], docs_dir=docs, mirrors=[mirror], use_cache=False)
+    watcher.prime()
+
+    nav.write_text('["/docs/", "/docs/quickstart.html"]', encoding='utf-8')
+    watcher.handle([nav])
+
+    assert 'quickstart' in (docs / 'index.html').read_text(encoding='utf-8')
+    assert (mirror / 'index.html').read_bytes() == (docs / 'index.html').read_bytes()
+    assert (mirror / 'nav.json').read_bytes() == nav.read_bytes()